@@ -1,4 +1,84 @@
+import os
+from pathlib import Path
+
 class Settings:
     PROJECT_NAME: str = "mg_event_hub"
     VERSION: str = "1.0.0"
+    # Caminhos resolvidos a partir do próprio pacote: independem do WorkingDirectory do processo
+    BASE_DIR: Path = Path(__file__).resolve().parents[2]
+    DB_PATH: Path = Path(os.getenv("MG_DB_PATH", str(BASE_DIR / "data" / "mg_events.db")))
+    DATA_DIR: Path = DB_PATH.parent
+    STATIC_DIR: Path = BASE_DIR / "app" / "static"
+    TEMPLATE_DIR: Path = BASE_DIR / "app" / "templates"
+    # SSE: mensagens pendentes por cliente antes de derrubá-lo por lentidão
+    SSE_BUFFER_CLIENTE: int = int(os.getenv("SSE_BUFFER_CLIENTE", "100"))
+    SSE_HEARTBEAT_SEGUNDOS: float = float(os.getenv("SSE_HEARTBEAT_SEGUNDOS", "15"))
+    # Export: linhas lidas do cursor SQLite por lote (memória constante)
+    EXPORT_LOTE: int = int(os.getenv("EXPORT_LOTE", "500"))
+    # Snapshot pré-comprimido do dashboard, publicado ao fim de cada ciclo de ingestão
+    SNAPSHOT_AUTOMATICO: bool = os.getenv("SNAPSHOT_AUTOMATICO", "1") == "1"
+    SNAPSHOTS_MANTIDOS: int = int(os.getenv("SNAPSHOTS_MANTIDOS", "3"))
+    # Profiling por amostragem dos ciclos de ingestão (saída em data/debug/profiles/)
+    PROFILE: bool = os.getenv("MG_PROFILE", "0") == "1"
+    PROFILE_INTERVALO_MS: float = float(os.getenv("MG_PROFILE_INTERVALO_MS", "5"))
+    # Logging: sinks com fila em thread própria, JSON opcional, amostragem de mensagens repetitivas
+    LOG_ASSINCRONO: bool = os.getenv("LOG_ASSINCRONO", "1") == "1"
+    LOG_FORMATO: str = os.getenv("LOG_FORMATO", "texto")  # "texto" ou "json" (uma linha JSON por registro)
+    LOG_AMOSTRA_POR_S: int = int(os.getenv("LOG_AMOSTRA_POR_S", "20"))  # por chave; 0 desliga o limite
+    LOG_COMPRESSAO: str = os.getenv("LOG_COMPRESSAO", "externa")  # "externa" (gzip em subprocesso), "zip" ou "nenhuma"
+    # Enriquecimento: página de detalhe de eventos novos/alterados (data, preço, local e imagem reais)
+    ENRIQUECIMENTO: bool = os.getenv("ENRIQUECIMENTO", "1") == "1"
+    ENRIQUECIMENTO_POR_HOST: int = int(os.getenv("ENRIQUECIMENTO_POR_HOST", "4"))
+    ENRIQUECIMENTO_MAX_POR_CICLO: int = int(os.getenv("ENRIQUECIMENTO_MAX_POR_CICLO", "300"))  # o resto fica para o próximo
+    ENRIQUECIMENTO_TENTATIVAS: int = int(os.getenv("ENRIQUECIMENTO_TENTATIVAS", "3"))
+    # Descoberta por sitemap: só URLs de evento novas ou com lastmod novo seguem para extração
+    DESCOBERTA_SITEMAP: bool = os.getenv("DESCOBERTA_SITEMAP", "1") == "1"
+    DESCOBERTA_MAX_POR_CICLO: int = int(os.getenv("DESCOBERTA_MAX_POR_CICLO", "200"))  # por fonte
+    # Arquivo bruto (estilo WARC) de toda resposta GET dos extratores, para reextração offline
+    ARQUIVO: bool = os.getenv("ARQUIVO", "1") == "1"
+    ARQUIVO_DIR: Path = Path(os.getenv("ARQUIVO_DIR", str(DATA_DIR / "arquivo")))
+    ARQUIVO_COMPRESSAO: str = os.getenv("ARQUIVO_COMPRESSAO", "zstd")  # "zstd" (cai para gzip sem o pacote) ou "gzip"
+    ARQUIVO_NIVEL: int = int(os.getenv("ARQUIVO_NIVEL", "10"))
+    ARQUIVO_SEGMENTO_MB: int = int(os.getenv("ARQUIVO_SEGMENTO_MB", "64"))
+    # Réplica só-leitura da API: snapshot (backup online) publicado após cada ciclo com mudança
+    LEITURA_REPLICA: bool = os.getenv("LEITURA_REPLICA", "0") == "1"
+    LEITURA_MANTIDAS: int = int(os.getenv("LEITURA_MANTIDAS", "2"))
+    LEITURA_MMAP_MB: int = int(os.getenv("LEITURA_MMAP_MB", "256"))
+    LEITURA_CHECAGEM_S: float = float(os.getenv("LEITURA_CHECAGEM_S", "1"))  # intervalo de checagem do ponteiro
+    # Arquivo de eventos passados: partições mensais fora da tabela quente (data/historico/)
+    HISTORICO: bool = os.getenv("HISTORICO", "1") == "1"
+    HISTORICO_HORIZONTE_DIAS: int = int(os.getenv("HISTORICO_HORIZONTE_DIAS", "30"))
+    HISTORICO_HORIZONTE_ESTIMADA_DIAS: int = int(os.getenv("HISTORICO_HORIZONTE_ESTIMADA_DIAS", "180"))
+    HISTORICO_INTERVALO_H: float = float(os.getenv("HISTORICO_INTERVALO_H", "24"))
+    HISTORICO_VACUUM_PAGINAS: int = int(os.getenv("HISTORICO_VACUUM_PAGINAS", "0"))  # 0 = todas as livres
+    # Busca por proximidade (/eventos/proximos): raio inicial e teto da busca dos N mais próximos
+    GEO_RAIO_INICIAL_KM: float = float(os.getenv("GEO_RAIO_INICIAL_KM", "25"))
+    GEO_RAIO_MAXIMO_KM: float = float(os.getenv("GEO_RAIO_MAXIMO_KM", "1200"))  # cobre MG inteiro
+    # Autocompletar (/eventos/sugestoes): índice de prefixos em memória
+    SUGESTOES_CHECAGEM_S: float = float(os.getenv("SUGESTOES_CHECAGEM_S", "2"))  # intervalo de checagem do CDC
+    SUGESTOES_PESO_RECENCIA: float = float(os.getenv("SUGESTOES_PESO_RECENCIA", "2"))
+    SUGESTOES_MAX_VARREDURA: int = int(os.getenv("SUGESTOES_MAX_VARREDURA", "2000"))  # acima disso, top pré-calculado
+    SUGESTOES_MAX_DELTA: int = int(os.getenv("SUGESTOES_MAX_DELTA", "10000"))  # termos novos antes de remontar
+    # Agregados analíticos (/analiticos/*): rollups mantidos pelo CDC ao fim de cada ciclo.
+    # Gastos e artistas vêm só do DiarioOficialExtractor (acrescentar em FONTES_ATIVAS para preenchê-los)
+    ANALITICOS: bool = os.getenv("ANALITICOS", "1") == "1"
+    # Export colunar (Parquet em data/colunar/, stream Arrow em /eventos/arrow); precisa do pyarrow
+    COLUNAR: bool = os.getenv("COLUNAR", "1") == "1"
+    COLUNAR_LOTE: int = int(os.getenv("COLUNAR_LOTE", "65536"))  # linhas por record batch do stream
+    # Extratores ligados (nomes do registro em app/services/extractors/registro.py), na ordem do ciclo
+    FONTES_ATIVAS: list = [
+        n.strip() for n in os.getenv(
+            "FONTES_ATIVAS", "PortalBHExtractor,SymplaExtractor,PalacioArtesExtractor,DiarioAMMExtractor"
+        ).split(",") if n.strip()
+    ]
+    # Agenda adaptativa: um job por fonte, intervalo entre piso e teto conforme a taxa de mudança
+    AGENDA_ADAPTATIVA: bool = os.getenv("AGENDA_ADAPTATIVA", "1") == "1"
+    AGENDA_PISO_MIN: float = float(os.getenv("AGENDA_PISO_MIN", "60"))
+    # Teto acima de um dia: fonte parada cede execuções para as que mudam
+    AGENDA_TETO_MIN: float = float(os.getenv("AGENDA_TETO_MIN", "4320"))
+    AGENDA_INICIAL_MIN: float = float(os.getenv("AGENDA_INICIAL_MIN", "1440"))  # o ciclo diário de antes
+    AGENDA_JITTER_S: int = int(os.getenv("AGENDA_JITTER_S", "300"))
+    # Teto de execuções por dia somando todas as fontes. Padrão = custo do ciclo diário (uma por fonte):
+    # a agenda só remaneja execuções das fontes paradas para as que mudam, nunca acrescenta
+    AGENDA_ORCAMENTO_DIA: float = float(os.getenv("AGENDA_ORCAMENTO_DIA", str(len(FONTES_ATIVAS))))
 settings = Settings()
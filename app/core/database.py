@@ -1,22 +1,29 @@
 """
 Justificativa: Garantia de Singleton do Engine e criação de tabelas síncronas com o Modelo.
+Leitura: com LEITURA_REPLICA=1 as rotas da API usam get_session_leitura, que abre a réplica
+só-leitura publicada após cada ciclo (app/services/replica.py) em vez do banco primário.
 """
-from pathlib import Path
-from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
+import time
+from sqlalchemy import event, text
+from sqlalchemy.ext.asyncio import create_async_engine, AsyncEngine, AsyncSession, async_sessionmaker
+from app.core.config import settings
 from app.core.logger import log
-from app.models import Base, EventoModel # ✅ Import obrigatório
+from app.models import Base, EventoModel, TRIGGERS_CDC # ✅ Import obrigatório
 
-DB_DIR = Path("data")
-DB_DIR.mkdir(exist_ok=True)
-DATABASE_URL = f"sqlite+aiosqlite:///./{DB_DIR}/mg_events.db"
+DB_DIR = settings.DATA_DIR
+DB_DIR.mkdir(parents=True, exist_ok=True)
+DATABASE_URL = f"sqlite+aiosqlite:///{settings.DB_PATH}"
 
-engine = create_async_engine(DATABASE_URL, connect_args={"check_same_thread": False})
+# timeout: jobs de fontes diferentes podem gravar ao mesmo tempo; espera o lock em vez de falhar
+engine = create_async_engine(DATABASE_URL, connect_args={"check_same_thread": False, "timeout": 30})
 AsyncSessionLocal = async_sessionmaker(bind=engine, class_=AsyncSession, expire_on_commit=False)
 
 async def init_db():
     try:
         async with engine.begin() as conn:
             await conn.run_sync(Base.metadata.create_all)
+            for ddl in TRIGGERS_CDC:  # sem eles o /eventos/changes e os consumidores do CDC ficam vazios
+                await conn.execute(text(ddl))
         log.info("🚀 Database v9.0: Tabelas mapeadas e prontas.")
     except Exception as e:
         log.error(f"❌ Erro crítico no banco: {e}")
@@ -26,4 +33,51 @@ async def get_session():
         try:
             yield session
         finally:
-            await session.close()
\ No newline at end of file
+            await session.close()
+
+# Engine da réplica em uso: trocado quando o ponteiro muda (publicação neste ou em outro processo)
+_leitura = {"caminho": None, "engine": None, "sessoes": None, "checado_em": 0.0}
+
+def _criar_engine_leitura(caminho) -> AsyncEngine:
+    # immutable=1: o SQLite não trava nem confere mudanças; o arquivo nunca é alterado depois de publicado
+    url = f"sqlite+aiosqlite:///file:{caminho}?mode=ro&immutable=1&uri=true"
+    engine_leitura = create_async_engine(url, connect_args={"check_same_thread": False})
+
+    @event.listens_for(engine_leitura.sync_engine, "connect")
+    def _pragmas(conn, _registro):
+        cursor = conn.cursor()
+        cursor.execute(f"PRAGMA mmap_size={settings.LEITURA_MMAP_MB * 1024 * 1024}")
+        cursor.execute("PRAGMA query_only=1")
+        cursor.close()
+
+    return engine_leitura
+
+async def sessoes_leitura() -> async_sessionmaker:
+    """Fábrica de sessões da réplica atual; sem réplica (ou com a opção desligada), a do primário."""
+    if not settings.LEITURA_REPLICA:
+        return AsyncSessionLocal
+    agora = time.monotonic()
+    if agora - _leitura["checado_em"] >= settings.LEITURA_CHECAGEM_S:
+        from app.services.replica import caminho_atual
+        _leitura["checado_em"] = agora
+        caminho = caminho_atual()
+        if caminho is not None and caminho != _leitura["caminho"]:
+            antigo = _leitura["engine"]
+            novo = _criar_engine_leitura(caminho)
+            # Troca atômica (uma atribuição no event loop); sessões em andamento terminam no engine antigo
+            _leitura.update(caminho=caminho, engine=novo,
+                            sessoes=async_sessionmaker(bind=novo, class_=AsyncSession, expire_on_commit=False))
+            if antigo is not None:
+                await antigo.dispose()
+            log.info(f"📚 API lendo da réplica {caminho.name}")
+    return _leitura["sessoes"] or AsyncSessionLocal
+
+async def get_session_leitura():
+    fabrica = await sessoes_leitura()
+    async with fabrica() as session:
+        try:
+            yield session
+        finally:
+            await session.close()
+
+get_db = get_session
\ No newline at end of file
@@ -1,22 +1,84 @@
 """
 Padrão de Qualidade: Logging Estruturado.
 Motivo: Corrigir exportação do objeto log para uso global.
+Os sinks gravam por uma fila em thread própria (LOG_ASSINCRONO): o event loop só enfileira,
+nunca espera disco. LOG_FORMATO=json emite uma linha JSON por registro. Mensagens por evento
+(erro de linha no banco, por exemplo) passam por `amostrar`, que limita cada chave a
+LOG_AMOSTRA_POR_S por segundo. Arquivos rotacionados são comprimidos por um `gzip` em
+subprocesso, fora do processo que serve a API.
 """
+import shutil
+import subprocess
 import sys
+import time
 from loguru import logger
 from pathlib import Path
+from app.core.config import settings
 
 LOG_DIR = Path("logs")
 LOG_DIR.mkdir(exist_ok=True)
 
+FORMATO_CONSOLE = "<green>{time:YYYY-MM-DD HH:mm:ss}</green> | <level>{level: <8}</level> | <cyan>{name}</cyan>:<cyan>{function}</cyan>:<cyan>{line}</cyan> - <level>{message}</level>"
+FORMATO_ARQUIVO = "{time:YYYY-MM-DD HH:mm:ss} | {level} | {name}:{function}:{line} - {message}"
+
+# gzip das rotações anteriores: rodando ou já terminados, à espera de serem colhidos
+_compressoes: list[subprocess.Popen] = []
+
+def comprimir_fora_do_processo(caminho: str):
+    """Compressão da rotação: dispara `gzip` e não espera (sem gzip no PATH, o arquivo fica como está).
+    Cada rotação colhe (poll) os gzip que já terminaram: nenhum fica como processo zumbi."""
+    _compressoes[:] = [proc for proc in _compressoes if proc.poll() is None]
+    gzip = shutil.which("gzip")
+    if gzip:
+        _compressoes.append(subprocess.Popen([gzip, "-f", caminho], stdout=subprocess.DEVNULL,
+                                             stderr=subprocess.DEVNULL, start_new_session=True))
+
+def _compressao():
+    if settings.LOG_COMPRESSAO == "externa":
+        return comprimir_fora_do_processo
+    if settings.LOG_COMPRESSAO == "zip":
+        return "zip"
+    return None
+
+# chave -> [início da janela, emitidas na janela, suprimidas desde o último resumo]
+_janelas: dict[str, list] = {}
+
+def amostrar(chave: str) -> bool:
+    """
+    True se a mensagem da `chave` ainda cabe na janela de 1s (LOG_AMOSTRA_POR_S por chave).
+    Chamar ANTES de montar a mensagem: quando estoura, nem a f-string é formatada.
+    """
+    limite = settings.LOG_AMOSTRA_POR_S
+    if limite <= 0:
+        return True
+    agora = time.monotonic()
+    janela = _janelas.get(chave)
+    if janela is None or agora - janela[0] >= 1.0:
+        suprimidas = janela[2] if janela else 0
+        janela = _janelas[chave] = [agora, 0, suprimidas]
+    if janela[1] < limite:
+        janela[1] += 1
+        return True
+    janela[2] += 1
+    return False
+
+def suprimidas(chave: str) -> int:
+    """Quantas mensagens da `chave` o limite descartou desde a última consulta (zera o contador)."""
+    janela = _janelas.pop(chave, None)
+    return janela[2] if janela else 0
+
 def setup_logger():
     logger.remove()
-    
+    json = settings.LOG_FORMATO == "json"
+    fila = settings.LOG_ASSINCRONO
+
     # Console
     logger.add(
         sys.stdout,
-        format="<green>{time:YYYY-MM-DD HH:mm:ss}</green> | <level>{level: <8}</level> | <cyan>{name}</cyan>:<cyan>{function}</cyan>:<cyan>{line}</cyan> - <level>{message}</level>",
-        level="INFO"
+        format=FORMATO_CONSOLE,
+        level="INFO",
+        serialize=json,
+        enqueue=fila,
     )
 
     # Arquivo
@@ -24,9 +86,11 @@ def setup_logger():
         LOG_DIR / "app.log",
         rotation="10 MB",
         retention="7 days",
-        compression="zip",
+        compression=_compressao(),
         level="DEBUG",
-        format="{time:YYYY-MM-DD HH:mm:ss} | {level} | {name}:{function}:{line} - {message}"
+        format=FORMATO_ARQUIVO,
+        serialize=json,
+        enqueue=fila,
     )
     return logger
 
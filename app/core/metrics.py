@@ -0,0 +1,142 @@
+"""
+Padrão de Qualidade: Observabilidade (formato de exposição do Prometheus).
+Motivo: Saber qual fonte ou etapa regrediu (rede, parse, banco, API) sem garimpar logs.
+Implementação mínima e sem dependências: contadores e histogramas com labels, renderizados em /metrics.
+"""
+import time
+from contextlib import contextmanager
+from threading import Lock
+from app.core import profiling
+
+BUCKETS_SEGUNDOS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+def _escapar(valor: str) -> str:
+    return str(valor).replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")
+
+def _labels(nomes: tuple, valores: tuple, extra: str = "") -> str:
+    pares = [f'{n}="{_escapar(v)}"' for n, v in zip(nomes, valores)]
+    if extra:
+        pares.append(extra)
+    return "{" + ",".join(pares) + "}" if pares else ""
+
+class Contador:
+    tipo = "counter"
+
+    def __init__(self, nome: str, ajuda: str, labels: tuple = ()):
+        self.nome, self.ajuda, self.labels = nome, ajuda, labels
+        self._valores: dict[tuple, float] = {}
+        self._lock = Lock()
+
+    def inc(self, valor: float = 1.0, **labels):
+        chave = tuple(str(labels.get(n, "")) for n in self.labels)
+        with self._lock:
+            self._valores[chave] = self._valores.get(chave, 0.0) + valor
+
+    def amostras(self):
+        with self._lock:
+            itens = list(self._valores.items())
+        for chave, valor in itens:
+            yield f"{self.nome}{_labels(self.labels, chave)} {valor:g}"
+
+class Histograma:
+    tipo = "histogram"
+
+    def __init__(self, nome: str, ajuda: str, labels: tuple = (), buckets: tuple = BUCKETS_SEGUNDOS):
+        self.nome, self.ajuda, self.labels = nome, ajuda, labels
+        self.buckets = tuple(sorted(buckets))
+        self._series: dict[tuple, list] = {}  # chave -> [contagens por bucket..., soma, total]
+        self._lock = Lock()
+
+    def observar(self, valor: float, **labels):
+        chave = tuple(str(labels.get(n, "")) for n in self.labels)
+        with self._lock:
+            serie = self._series.get(chave)
+            if serie is None:
+                serie = self._series[chave] = [0] * len(self.buckets) + [0.0, 0]
+            for i, limite in enumerate(self.buckets):
+                if valor <= limite:
+                    serie[i] += 1
+            serie[-2] += valor
+            serie[-1] += 1
+
+    @contextmanager
+    def cronometrar(self, **labels):
+        inicio = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observar(time.perf_counter() - inicio, **labels)
+
+    def amostras(self):
+        with self._lock:
+            itens = [(k, list(v)) for k, v in self._series.items()]
+        for chave, serie in itens:
+            for limite, contagem in zip(self.buckets, serie):
+                le = 'le="%g"' % limite
+                yield f"{self.nome}_bucket{_labels(self.labels, chave, le)} {contagem}"
+            le_inf = 'le="+Inf"'
+            yield f"{self.nome}_bucket{_labels(self.labels, chave, le_inf)} {serie[-1]}"
+            yield f"{self.nome}_sum{_labels(self.labels, chave)} {serie[-2]:g}"
+            yield f"{self.nome}_count{_labels(self.labels, chave)} {serie[-1]}"
+
+class Registro:
+    def __init__(self):
+        self._metricas = []
+
+    def registrar(self, metrica):
+        self._metricas.append(metrica)
+        return metrica
+
+    def renderizar(self) -> str:
+        linhas = []
+        for m in self._metricas:
+            linhas.append(f"# HELP {m.nome} {m.ajuda}")
+            linhas.append(f"# TYPE {m.nome} {m.tipo}")
+            linhas.extend(m.amostras())
+        return "\n".join(linhas) + "\n"
+
+registro = Registro()
+
+# ── Rede (por host) ─────────────────────────────────────────────────────────
+fetch_duracao = registro.registrar(Histograma(
+    "mg_fetch_duracao_segundos", "Latência das requisições dos extratores até o corpo completo.", ("host", "status")))
+fetch_bytes = registro.registrar(Contador(
+    "mg_fetch_bytes_total", "Bytes baixados pelos extratores (no fio, antes da descompressão).", ("host",)))
+fetch_erros = registro.registrar(Contador(
+    "mg_fetch_erros_total", "Requisições dos extratores que falharam na rede.", ("host",)))
+
+# ── Pipeline de ingestão (por fonte) ────────────────────────────────────────
+etapa_duracao = registro.registrar(Histograma(
+    "mg_etapa_duracao_segundos", "Duração de cada etapa do pipeline (fetch, parse, extract, persist).", ("fonte", "etapa")))
+eventos_capturados = registro.registrar(Contador(
+    "mg_eventos_capturados_total", "Eventos devolvidos pelos extratores.", ("fonte",)))
+eventos_persistidos = registro.registrar(Contador(
+    "mg_eventos_persistidos_total", "Eventos gravados no banco, por tipo de escrita.", ("fonte", "tipo")))
+eventos_falhas = registro.registrar(Contador(
+    "mg_eventos_falhas_total", "Eventos que falharam ao gravar no banco.", ("fonte",)))
+listagem_eventos = registro.registrar(Contador(
+    "mg_listagem_eventos_total", "Eventos novos por listagem (ex: cidade do Sympla) de uma fonte.", ("fonte", "listagem")))
+listagem_paginas = registro.registrar(Contador(
+    "mg_listagem_paginas_total", "Páginas baixadas por listagem de uma fonte.", ("fonte", "listagem")))
+listagem_duracao = registro.registrar(Histograma(
+    "mg_listagem_duracao_segundos", "Tempo de parede para varrer uma listagem inteira (todas as páginas).", ("fonte", "listagem")))
+enriquecimento = registro.registrar(Contador(
+    "mg_enriquecimento_total", "Eventos passados pelo enriquecimento, por desfecho (cache, 304, 200, erro...).", ("fonte", "resultado")))
+db_lote_duracao = registro.registrar(Histograma(
+    "mg_db_lote_duracao_segundos", "Tempo de escrita + commit do lote de cada fonte.", ("fonte",)))
+
+# ── API ─────────────────────────────────────────────────────────────────────
+http_duracao = registro.registrar(Histograma(
+    "mg_http_requisicao_duracao_segundos", "Latência das requisições da API por rota.", ("rota", "metodo", "status")))
+
+@contextmanager
+def _etapa_perfilada(fonte: str, etapa: str):
+    with profiling.rotular(fonte, etapa), etapa_duracao.cronometrar(fonte=fonte, etapa=etapa):
+        yield
+
+def medir_etapa(fonte: str, etapa: str):
+    """Context manager usado por extratores e pelo manager para cronometrar uma etapa.
+    Com o profiling ligado, também rotula as amostras da pilha com `fonte;etapa`."""
+    if profiling.amostrador_ativo is None:
+        return etapa_duracao.cronometrar(fonte=fonte, etapa=etapa)
+    return _etapa_perfilada(fonte, etapa)
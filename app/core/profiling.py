@@ -0,0 +1,168 @@
+"""
+Padrão de Qualidade: Profiling por Amostragem (opt-in).
+Motivo: Quando um ciclo fica lento, descobrir a função quente de cada etapa (fetch, parse,
+persist) de cada extrator sem print manual. Saída em "collapsed stacks" (flamegraph.pl,
+speedscope, inferno) + resumo texto com as funções mais quentes.
+
+Ativação: MG_PROFILE=1 ou `python inaugurar_sistema.py --profile`.
+Custo zero quando desligado: nenhuma thread é criada e `medir_etapa` só consulta `amostrador_ativo`.
+O rótulo fonte;etapa é por task (ContextVar): jobs de fontes diferentes no mesmo loop não se misturam.
+"""
+import asyncio
+import contextvars
+import sys
+import threading
+import time
+from collections import Counter
+from datetime import datetime
+from pathlib import Path
+from typing import Optional
+
+from app.core.config import settings
+from app.core.logger import log
+
+PROFILE_DIR = settings.BASE_DIR / "data" / "debug" / "profiles"
+ROTULO_PADRAO = "ciclo;fora_de_etapa"
+
+# Rótulo fonte;etapa da task (ou thread) corrente, mantido por `rotular()`
+rotulo_atual = contextvars.ContextVar("rotulo_perfil", default=ROTULO_PADRAO)
+
+def _chave_execucao():
+    """Task asyncio corrente ou, fora de uma, o ident da thread."""
+    try:
+        tarefa = asyncio.current_task()
+    except RuntimeError:  # thread sem event loop
+        tarefa = None
+    return tarefa if tarefa is not None else threading.get_ident()
+
+class AmostradorPilhas:
+    """Thread que fotografa a pilha da thread alvo (o event loop) a cada `intervalo` segundos."""
+
+    def __init__(self, nome: str, intervalo: float):
+        self.nome = nome
+        self.intervalo = intervalo
+        # task/thread -> fonte;etapa: a thread de amostragem não enxerga as ContextVars do loop,
+        # então `rotular()` publica aqui o rótulo de quem está dentro de uma etapa
+        self.rotulos: dict = {}
+        self.pilhas: Counter = Counter()
+        self.amostras = 0
+        self._alvo = threading.get_ident()
+        try:
+            self._loop_alvo = asyncio.get_running_loop()
+        except RuntimeError:
+            self._loop_alvo = None
+        self._parar = threading.Event()
+        self._thread = threading.Thread(target=self._loop, name="mg-profiler", daemon=True)
+        self._inicio = time.perf_counter()
+
+    def iniciar(self):
+        self._thread.start()
+
+    def parar(self):
+        self._parar.set()
+        self._thread.join()
+
+    def _loop(self):
+        while not self._parar.wait(self.intervalo):
+            frame = sys._current_frames().get(self._alvo)
+            if frame is None:
+                continue
+            quadros = []
+            while frame is not None:
+                codigo = frame.f_code
+                quadros.append(f"{codigo.co_name} ({Path(codigo.co_filename).name}:{codigo.co_firstlineno})")
+                frame = frame.f_back
+            quadros.reverse()
+            tarefa = asyncio.current_task(self._loop_alvo) if self._loop_alvo else None  # a que o loop está rodando agora
+            rotulo = self.rotulos.get(tarefa if tarefa is not None else self._alvo, ROTULO_PADRAO)
+            self.pilhas[rotulo + ";" + ";".join(quadros)] += 1
+            self.amostras += 1
+
+    def gravar(self) -> Path:
+        PROFILE_DIR.mkdir(parents=True, exist_ok=True)
+        base = PROFILE_DIR / f"{datetime.now():%Y%m%d_%H%M%S}_{self.nome}"
+        collapsed = base.with_suffix(".collapsed")
+        with open(collapsed, "w", encoding="utf-8") as f:
+            for pilha, contagem in self.pilhas.most_common():
+                f.write(f"{pilha} {contagem}\n")
+
+        resumo = base.with_name(base.name + "_resumo.txt")
+        with open(resumo, "w", encoding="utf-8") as f:
+            f.write(self._resumo())
+        return collapsed
+
+    def _resumo(self, top: int = 25) -> str:
+        proprio, inclusivo, por_etapa = Counter(), Counter(), Counter()
+        for pilha, contagem in self.pilhas.items():
+            partes = pilha.split(";")
+            rotulo, quadros = ";".join(partes[:2]), partes[2:]
+            por_etapa[rotulo] += contagem
+            if quadros:
+                proprio[quadros[-1]] += contagem
+            for quadro in set(quadros):
+                inclusivo[quadro] += contagem
+
+        total = max(self.amostras, 1)
+        duracao = time.perf_counter() - self._inicio
+        linhas = [
+            f"Perfil '{self.nome}': {self.amostras} amostras em {duracao:.1f}s (intervalo {self.intervalo * 1000:.1f} ms)",
+            "",
+            "== Amostras por fonte;etapa ==",
+        ]
+        linhas += [f"{c:>8} {c / total:6.1%}  {r}" for r, c in por_etapa.most_common()]
+        linhas += ["", f"== Top {top} funções (tempo próprio) =="]
+        linhas += [f"{c:>8} {c / total:6.1%}  {q}" for q, c in proprio.most_common(top)]
+        linhas += ["", f"== Top {top} funções (tempo inclusivo) =="]
+        linhas += [f"{c:>8} {c / total:6.1%}  {q}" for q, c in inclusivo.most_common(top)]
+        return "\n".join(linhas) + "\n"
+
+amostrador_ativo: Optional[AmostradorPilhas] = None
+
+def iniciar(nome: str) -> bool:
+    """Liga o amostrador se o modo profiling estiver habilitado. Retorna True se ligou."""
+    global amostrador_ativo
+    if not settings.PROFILE or amostrador_ativo is not None:
+        return False
+    amostrador_ativo = AmostradorPilhas(nome, settings.PROFILE_INTERVALO_MS / 1000)
+    amostrador_ativo.iniciar()
+    log.info(f"🔬 Profiling ativo ({settings.PROFILE_INTERVALO_MS} ms por amostra)")
+    return True
+
+def finalizar():
+    """Para o amostrador e grava o .collapsed + resumo em data/debug/profiles/."""
+    global amostrador_ativo
+    if amostrador_ativo is None:
+        return
+    amostrador, amostrador_ativo = amostrador_ativo, None
+    amostrador.parar()
+    try:
+        caminho = amostrador.gravar()
+        log.info(f"🔬 Perfil gravado: {caminho} ({amostrador.amostras} amostras)")
+    except Exception as e:
+        log.error(f"❌ Falha ao gravar perfil: {e}")
+
+class rotular:
+    """Marca as amostras coletadas dentro do bloco com `fonte;etapa` (restaura o rótulo anterior na saída).
+    Vale só para a task/thread que entrou no bloco."""
+    __slots__ = ("rotulo", "token", "chave")
+
+    def __init__(self, fonte: str, etapa: str):
+        self.rotulo = f"{fonte};{etapa}"
+
+    def __enter__(self):
+        self.token = rotulo_atual.set(self.rotulo)
+        self.chave = _chave_execucao()
+        amostrador = amostrador_ativo
+        if amostrador:
+            amostrador.rotulos[self.chave] = self.rotulo
+
+    def __exit__(self, *exc):
+        rotulo_atual.reset(self.token)
+        amostrador = amostrador_ativo
+        if amostrador:
+            anterior = rotulo_atual.get()
+            if anterior == ROTULO_PADRAO:
+                amostrador.rotulos.pop(self.chave, None)
+            else:
+                amostrador.rotulos[self.chave] = anterior
+        return False
@@ -1,15 +1,35 @@
 """
 Padrão de Qualidade: Automação Inteligente.
-Motivo: Garantir que a coleta de dados ocorra em horários de baixo tráfego (madrugada).
+Motivo: Cada fonte tem seu próprio ritmo: o Sympla muda de hora em hora, a agenda do Palácio
+quase nunca. Um job por extrator, com intervalo que se adapta à taxa de mudança observada
+(entre piso e teto), jitter, coalescência de disparos perdidos e no máximo uma execução por vez.
+O orçamento diário de execuções (somando as fontes; por padrão o custo do ciclo diário, uma por
+fonte) garante que frescor não custe mais requisições: a agenda só remaneja, nunca acrescenta.
+Com AGENDA_ADAPTATIVA=0 volta o ciclo completo diário às 03:00.
 """
+import random
+from datetime import datetime, timedelta
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from apscheduler.triggers.cron import CronTrigger
+from apscheduler.triggers.interval import IntervalTrigger
 from app.services.manager import EventManager as DataManager
+from app.services.extractors import registro
+from app.services.estado import ler_estados, gravar_estado
 from app.core.database import AsyncSessionLocal
+from app.core.config import settings
 from app.core.logger import log
 
 scheduler = AsyncIOScheduler()
 
+PREFIXO_ESTADO = "agenda:"
+FATOR_ACELERA = 0.5     # rodada com novidade: encurta o intervalo pela metade
+FATOR_DESACELERA = 1.5  # rodada sem novidade: alonga 50%
+PESO_TAXA = 0.3         # EWMA da fração de rodadas com mudança (só observabilidade/log)
+SEGUNDOS_DIA = 86400
+
+# fonte -> estado da agenda (espelho em memória do que está na tabela `estado`)
+agenda: dict[str, dict] = {}
+
 async def executar_ciclo_extração():
     """Tarefa que abre uma sessão de banco e chama o Manager."""
     log.info("--- [JOB] Iniciando tarefa agendada de extração ---")
@@ -21,8 +41,134 @@ async def executar_ciclo_extração():
         except Exception as e:
             log.error(f"--- [JOB] Falha na tarefa agendada: {e} ---")
 
+def limites_fonte(nome: str) -> tuple[float, float, float]:
+    """Piso, teto e intervalo inicial em segundos: dicas do registro da fonte ou os padrões do settings."""
+    fonte = registro.fontes_registradas().get(nome, {})
+    piso = fonte.get("piso_min", settings.AGENDA_PISO_MIN) * 60
+    teto = max(piso, fonte.get("teto_min", settings.AGENDA_TETO_MIN) * 60)
+    inicial = fonte.get("inicial_min", settings.AGENDA_INICIAL_MIN) * 60
+    return piso, teto, inicial
+
+def proximo_intervalo(atual: float, mudou: bool, piso: float, teto: float, outras_por_dia: float) -> float:
+    """
+    Multiplicativo (acelera com novidade, desacelera sem) e preso entre piso e teto.
+    Orçamento: esta fonte só pode usar as execuções/dia que as outras deixaram livres;
+    o orçamento prevalece sobre o teto, então acelerar aqui exige que outra fonte tenha desacelerado.
+    """
+    novo = min(max(atual * (FATOR_ACELERA if mudou else FATOR_DESACELERA), piso), teto)
+    livres = settings.AGENDA_ORCAMENTO_DIA - outras_por_dia
+    minimo_orcamento = SEGUNDOS_DIA / livres if livres > 0 else max(teto, atual)
+    return max(novo, minimo_orcamento)
+
+def _execucoes_por_dia(excluir: str) -> float:
+    return sum(SEGUNDOS_DIA / e["intervalo_s"] for nome, e in agenda.items() if nome != excluir)
+
+def _caber_no_orcamento():
+    """Estado salvo com outro orçamento (ou fontes novas) pode somar mais execuções/dia que o permitido:
+    alonga todos os intervalos na mesma proporção até caber."""
+    total = sum(SEGUNDOS_DIA / e["intervalo_s"] for e in agenda.values())
+    if total <= settings.AGENDA_ORCAMENTO_DIA:
+        return
+    fator = total / settings.AGENDA_ORCAMENTO_DIA
+    for estado in agenda.values():
+        estado["intervalo_s"] *= fator
+    log.info(f"🗓️ Agenda somava {total:.1f} execuções/dia; intervalos alongados {fator:.2f}x para o orçamento")
+
+def _trigger(intervalo_s: float) -> IntervalTrigger:
+    # Jitter nunca maior que 10% do intervalo, para não desfigurar intervalos curtos
+    jitter = int(min(settings.AGENDA_JITTER_S, intervalo_s * 0.1))
+    return IntervalTrigger(seconds=int(intervalo_s), jitter=jitter or None)
+
+async def executar_fonte_agendada(nome: str):
+    """Job de uma fonte: roda, aprende com o resultado e reprograma o próprio intervalo."""
+    estado = agenda[nome]
+    async with AsyncSessionLocal() as session:
+        try:
+            relatorio = await DataManager(session).run_fonte(nome)
+        except Exception as e:
+            log.error(f"--- [JOB {nome}] Falha: {e} ---")
+            return
+        if relatorio.get("pulado"):
+            return
+
+        mudou = bool(relatorio.get("persistidos") or relatorio.get("atualizados"))
+        anterior = estado["intervalo_s"]
+        if not relatorio.get("falhou"):  # falha de rede não é evidência de que a fonte parou de mudar
+            estado["intervalo_s"] = proximo_intervalo(
+                anterior, mudou, estado["piso_s"], estado["teto_s"], _execucoes_por_dia(excluir=nome)
+            )
+            estado["taxa_mudanca"] = round((1 - PESO_TAXA) * estado["taxa_mudanca"] + PESO_TAXA * mudou, 4)
+        estado["execucoes"] += 1
+        estado["execucoes_com_mudanca"] += int(mudou)
+        estado["ultima_execucao"] = datetime.now().isoformat(timespec="seconds")
+        try:
+            await gravar_estado(session, PREFIXO_ESTADO + nome, estado)
+        except Exception as e:
+            log.error(f"❌ Falha ao gravar estado da agenda de {nome}: {e}")
+
+    if estado["intervalo_s"] != anterior:
+        scheduler.reschedule_job(f"fonte_{nome}", trigger=_trigger(estado["intervalo_s"]))
+    log.info(
+        f"🗓️ {nome}: {'com' if mudou else 'sem'} novidade | intervalo {anterior / 60:.0f} -> "
+        f"{estado['intervalo_s'] / 60:.0f} min | taxa de mudança {estado['taxa_mudanca']:.0%}"
+    )
+
+async def _carregar_agenda(nomes: list[str]) -> dict[str, dict]:
+    try:
+        async with AsyncSessionLocal() as session:
+            salvos = await ler_estados(session, PREFIXO_ESTADO)
+    except Exception as e:
+        log.warning(f"⚠️ Estado da agenda indisponível, começando do zero: {e}")
+        salvos = {}
+
+    for nome in nomes:
+        piso, teto, inicial = limites_fonte(nome)
+        salvo = salvos.get(PREFIXO_ESTADO + nome, {})
+        agenda[nome] = {
+            "intervalo_s": min(max(salvo.get("intervalo_s", inicial), piso), teto),
+            "piso_s": piso,
+            "teto_s": teto,
+            "taxa_mudanca": salvo.get("taxa_mudanca", 0.5),
+            "execucoes": salvo.get("execucoes", 0),
+            "execucoes_com_mudanca": salvo.get("execucoes_com_mudanca", 0),
+            "ultima_execucao": salvo.get("ultima_execucao"),
+        }
+    _caber_no_orcamento()
+    return agenda
+
+async def agendar_fontes():
+    """Um job por extrator. Retoma de onde parou: a próxima execução respeita a última registrada.
+    Só usa os nomes do registro: nenhum extrator é importado até o job dele rodar."""
+    await _carregar_agenda(registro.nomes_ativos())
+    agora = datetime.now()
+    for nome, estado in agenda.items():
+        # Na subida, espalha as fontes que já estão vencidas para não dispararem todas juntas
+        proxima = agora + timedelta(seconds=random.uniform(30, 30 + settings.AGENDA_JITTER_S))
+        if estado["ultima_execucao"]:
+            devida = datetime.fromisoformat(estado["ultima_execucao"]) + timedelta(seconds=estado["intervalo_s"])
+            proxima = max(proxima, devida)
+        scheduler.add_job(
+            executar_fonte_agendada,
+            _trigger(estado["intervalo_s"]),
+            args=[nome],
+            id=f"fonte_{nome}",
+            next_run_time=proxima,
+            coalesce=True,               # disparos perdidos (máquina dormindo, loop ocupado) viram um só
+            max_instances=1,             # nunca duas execuções do mesmo job
+            misfire_grace_time=int(estado["intervalo_s"]),
+            replace_existing=True,
+        )
+        log.info(f"🗓️ {nome}: a cada {estado['intervalo_s'] / 60:.0f} min | próxima {proxima:%d/%m %H:%M}")
+
 def start_scheduler():
-    """Inicia o agendador e define os horários."""
+    """Inicia o agendador: jobs adaptativos por fonte ou o ciclo completo diário (AGENDA_ADAPTATIVA=0)."""
+    if settings.AGENDA_ADAPTATIVA:
+        # O job de montagem roda no próprio loop do scheduler (precisa do banco para ler o estado)
+        scheduler.add_job(agendar_fontes, id="agendar_fontes", replace_existing=True)
+        scheduler.start()
+        log.info("Agendador de tarefas iniciado (agenda adaptativa por fonte).")
+        return
+
     # Configurado para rodar todo dia às 03:00 AM
     scheduler.add_job(
         executar_ciclo_extração,
@@ -30,6 +176,6 @@ def start_scheduler():
         id="extração_diaria",
         replace_existing=True
     )
-    
+
     scheduler.start()
     log.info("Agendador de tarefas iniciado (03:00 AM diário).")
@@ -2,23 +2,32 @@
 Padrão de Qualidade: Solid & Clean Architecture (v19.0.2).
 Motivo: Uso de caminhos absolutos para resolver erro 404 causado por WorkingDirectory variável.
 """
+import asyncio
 import os
+import time
 from pathlib import Path
 from fastapi import FastAPI, Request, Depends, Query
 from fastapi.templating import Jinja2Templates
 from fastapi.staticfiles import StaticFiles
+from fastapi.responses import PlainTextResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 
-from app.core.database import get_session, init_db
+from app.core.database import AsyncSessionLocal, get_session_leitura, init_db
+from app.services import analiticos, geo, sugestoes
 from app.models import EventoModel
 from app.core.scheduler import start_scheduler
 from app.core.logger import log
+from app.core.config import settings
+from app.core import metrics
+from app.routers import eventos as eventos_router
+from app.routers import snapshots as snapshots_router
+from app.routers import analiticos as analiticos_router
 
-# CONFIGURAÇÃO DE CAMINHOS ABSOLUTOS
-BASE_DIR = Path("/home/felicruel/apps/mg_event_hub")
-STATIC_DIR = BASE_DIR / "app/static"
-TEMPLATE_DIR = BASE_DIR / "app/templates"
+# CONFIGURAÇÃO DE CAMINHOS ABSOLUTOS (resolvidos a partir do pacote, ver app/core/config.py)
+BASE_DIR = settings.BASE_DIR
+STATIC_DIR = settings.STATIC_DIR
+TEMPLATE_DIR = settings.TEMPLATE_DIR
 
 # Garante que as pastas existam
 STATIC_DIR.mkdir(parents=True, exist_ok=True)
@@ -30,10 +39,42 @@ app = FastAPI(title="MG Event Hub Pro", version="19.0.2")
 app.mount("/static", StaticFiles(directory=str(STATIC_DIR)), name="static")
 
 templates = Jinja2Templates(directory=str(TEMPLATE_DIR))
+app.include_router(eventos_router.router)
+app.include_router(snapshots_router.router)
+app.include_router(analiticos_router.router)
+
+@app.middleware("http")
+async def medir_requisicoes(request: Request, call_next):
+    """Latência por rota (template da rota, não a URL crua, para não explodir a cardinalidade)."""
+    inicio = time.perf_counter()
+    response = await call_next(request)
+    rota = getattr(request.scope.get("route"), "path", "nao_mapeada")
+    metrics.http_duracao.observar(
+        time.perf_counter() - inicio, rota=rota, metodo=request.method, status=response.status_code
+    )
+    return response
 
 @app.on_event("startup")
 async def startup_event():
     await init_db()
+    try:
+        async with AsyncSessionLocal() as session:
+            await geo.semear(session)  # /eventos/proximos responde antes do primeiro ciclo
+    except Exception as e:
+        log.error(f"❌ Falha ao carregar o gazetteer de municípios: {e}")
+    if settings.ANALITICOS:
+        try:
+            await asyncio.to_thread(analiticos.atualizar)  # carga inicial antes da primeira réplica
+        except Exception as e:
+            log.error(f"❌ Falha ao montar os agregados analíticos: {e}")
+    if settings.LEITURA_REPLICA:
+        from app.services.replica import caminho_atual, publicar_replica
+        if caminho_atual() is None:
+            try:
+                await asyncio.to_thread(publicar_replica)
+            except Exception as e:
+                log.error(f"❌ Falha ao publicar a primeira réplica de leitura: {e}")
+    asyncio.create_task(sugestoes.aquecer())  # autocompletar pronto sem travar o startup
     try:
         start_scheduler()
         log.info("✅ Sistema e Scheduler Online.")
@@ -45,12 +86,16 @@ async def read_root(request: Request):
     return templates.TemplateResponse("index.html", {"request": request})
 
 @app.get("/eventos")
-async def get_eventos(session: AsyncSession = Depends(get_session)):
+async def get_eventos(session: AsyncSession = Depends(get_session_leitura)):
     query = select(EventoModel).order_by(EventoModel.data_evento.asc())
     result = await session.execute(query)
     eventos_db = result.scalars().all()
     return [{"titulo": e.titulo, "fonte": e.fonte} for e in eventos_db]
 
+@app.get("/metrics")
+async def get_metrics():
+    return PlainTextResponse(metrics.registro.renderizar(), media_type="text/plain; version=0.0.4; charset=utf-8")
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(app, host="0.0.0.0", port=8000)
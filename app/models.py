@@ -1,5 +1,5 @@
 from sqlalchemy.orm import Mapped, mapped_column, DeclarativeBase
-from sqlalchemy import String, Float, DateTime, func, Text
+from sqlalchemy import String, Float, DateTime, Integer, Boolean, func, Text, text
 from datetime import datetime
 
 class Base(DeclarativeBase):
@@ -19,3 +19,67 @@ class EventoModel(Base):
     imagem_url: Mapped[str] = mapped_column(String(500), nullable=True)
     fonte: Mapped[str] = mapped_column(String(100), nullable=False)
     detectado_em: Mapped[datetime] = mapped_column(DateTime, server_default=func.now())
+    hash_conteudo: Mapped[str] = mapped_column(String(40), nullable=True)
+    # Fonte não informou a data: data_evento é o "agora" da primeira captura (horizonte de arquivo maior)
+    data_estimada: Mapped[bool] = mapped_column(Boolean, default=False, server_default=text("0"))
+    # Município de MG reconhecido em `cidade` (app/services/geo.py); NULL = texto sem município
+    codigo_ibge: Mapped[int] = mapped_column(Integer, nullable=True, index=True)
+
+class MunicipioModel(Base):
+    """Gazetteer dos municípios de MG (app/data/municipios_mg.csv); o ponto de cada um vai para a R*Tree `municipios_geo`."""
+    __tablename__ = "municipios"
+    codigo_ibge: Mapped[int] = mapped_column(Integer, primary_key=True)
+    nome: Mapped[str] = mapped_column(String(100), nullable=False)
+    latitude: Mapped[float] = mapped_column(Float, nullable=False)
+    longitude: Mapped[float] = mapped_column(Float, nullable=False)
+
+class EventoCDCModel(Base):
+    """Log de mudanças (CDC) da tabela eventos, alimentado por triggers no SQLite."""
+    __tablename__ = "eventos_cdc"
+    __table_args__ = {"sqlite_autoincrement": True}  # seq nunca é reutilizado
+    seq: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    id_unico: Mapped[str] = mapped_column(String(64), nullable=False, index=True)
+    operacao: Mapped[str] = mapped_column(String(1), nullable=False)  # I, U, D ou A (arquivado, ver historico.py)
+    registrado_em: Mapped[datetime] = mapped_column(DateTime, server_default=func.now())
+
+# Triggers que alimentam eventos_cdc: toda escrita em eventos gera uma linha sequencial.
+# Criados pelo init_db (banco novo) e pelas migrations do manager (banco antigo).
+TRIGGERS_CDC = [
+    """CREATE TRIGGER IF NOT EXISTS trg_eventos_cdc_insert AFTER INSERT ON eventos
+       BEGIN INSERT INTO eventos_cdc (id_unico, operacao) VALUES (NEW.id_unico, 'I'); END""",
+    """CREATE TRIGGER IF NOT EXISTS trg_eventos_cdc_update AFTER UPDATE ON eventos
+       WHEN OLD.hash_conteudo IS NOT NEW.hash_conteudo
+       BEGIN INSERT INTO eventos_cdc (id_unico, operacao) VALUES (NEW.id_unico, 'U'); END""",
+    """CREATE TRIGGER IF NOT EXISTS trg_eventos_cdc_delete AFTER DELETE ON eventos
+       BEGIN INSERT INTO eventos_cdc (id_unico, operacao) VALUES (OLD.id_unico, 'D'); END""",
+]
+
+class EnriquecimentoModel(Base):
+    """Cache da página de detalhe de cada evento: validadores HTTP + campos já extraídos (JSON)."""
+    __tablename__ = "enriquecimento"
+    url: Mapped[str] = mapped_column(String(500), primary_key=True)
+    hash_listagem: Mapped[str] = mapped_column(String(40), nullable=True)  # conteúdo da listagem quando foi buscado
+    etag: Mapped[str] = mapped_column(String(200), nullable=True)
+    last_modified: Mapped[str] = mapped_column(String(100), nullable=True)
+    dados: Mapped[str] = mapped_column(Text, nullable=True)
+    status: Mapped[str] = mapped_column(String(10), nullable=False)  # ok, vazio ou erro
+    tentativas: Mapped[int] = mapped_column(Integer, default=0)
+    atualizado_em: Mapped[datetime] = mapped_column(DateTime, server_default=func.now(), onupdate=func.now())
+
+class SitemapUrlModel(Base):
+    """Índice de descoberta: cada URL vista nos sitemaps de uma fonte, com o lastmod publicado e o já extraído."""
+    __tablename__ = "sitemap_urls"
+    url: Mapped[str] = mapped_column(String(500), primary_key=True)
+    fonte: Mapped[str] = mapped_column(String(100), nullable=False, index=True)
+    tipo: Mapped[str] = mapped_column(String(10), nullable=False)  # evento ou sitemap (filho de um índice)
+    lastmod: Mapped[str] = mapped_column(String(40), nullable=True)
+    extraido_lastmod: Mapped[str] = mapped_column(String(40), nullable=True)  # NULL = nunca extraído
+    sitemap: Mapped[str] = mapped_column(String(500), nullable=True)  # sitemap que lista a URL (NULL = antes do registro)
+    visto_em: Mapped[datetime] = mapped_column(DateTime, server_default=func.now(), onupdate=func.now())
+
+class EstadoModel(Base):
+    """Estado operacional chave -> JSON (agenda adaptativa, cursores de fontes...). Sobrevive a restarts."""
+    __tablename__ = "estado"
+    chave: Mapped[str] = mapped_column(String(200), primary_key=True)
+    valor: Mapped[str] = mapped_column(Text, nullable=False)
+    atualizado_em: Mapped[datetime] = mapped_column(DateTime, server_default=func.now(), onupdate=func.now())
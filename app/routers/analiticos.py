@@ -0,0 +1,96 @@
+"""
+Padrão de Qualidade: API Analítica sobre Agregados Materializados.
+Motivo: Dashboards leem só as tabelas agg_* (app/services/analiticos.py), mantidas a cada ciclo:
+nenhuma rota agrega linhas cruas de `eventos` por requisição.
+/gastos e /artistas contam só contratos do minerador do diário (DiarioOficialExtractor, fonte
+"AMM-MG ..."), que não está no FONTES_ATIVAS padrão: sem ele ligado as duas rotas voltam vazias.
+/precos usa todas as fontes.
+"""
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.database import get_session_leitura
+from app.core.logger import log
+from app.services.analiticos import resumir_precos
+
+router = APIRouter(prefix="/analiticos", tags=["Analíticos"])
+
+SQL_CURSOR = text("SELECT seq, atualizado_em FROM agg_cursor WHERE id = 1")
+ORDENS_ARTISTAS = {"contratos": "contratos DESC, valor_total DESC", "valor": "valor_total DESC, contratos DESC"}
+
+async def _atualizado_em(db: AsyncSession) -> Optional[str]:
+    linha = (await db.execute(SQL_CURSOR)).first()
+    return linha.atualizado_em if linha else None
+
+@router.get("/gastos")
+async def gastos_por_cidade(
+    cidade: Optional[str] = Query(None, description="Município (nome exato, como no evento)"),
+    de: Optional[str] = Query(None, pattern=r"^\d{4}-\d{2}$", description="Primeiro mês (AAAA-MM)"),
+    ate: Optional[str] = Query(None, pattern=r"^\d{4}-\d{2}$", description="Último mês, inclusive (AAAA-MM)"),
+    db: AsyncSession = Depends(get_session_leitura)
+):
+    """Gasto com contratos de shows do diário por cidade e mês (requer DiarioOficialExtractor em FONTES_ATIVAS)."""
+    condicoes, params = [], {}
+    if cidade:
+        condicoes.append("cidade = :cidade")
+        params["cidade"] = cidade
+    if de:
+        condicoes.append("mes >= :de")
+        params["de"] = de
+    if ate:
+        condicoes.append("mes <= :ate")
+        params["ate"] = ate
+    where = f"WHERE {' AND '.join(condicoes)}" if condicoes else ""
+    try:
+        res = await db.execute(text(f"SELECT cidade, mes, contratos, valor_total FROM agg_gasto_cidade_mes {where} "
+                                    f"ORDER BY mes, valor_total DESC"), params)
+        linhas = [dict(r._mapping) for r in res]
+        return {
+            "total": len(linhas),
+            "valor_total": round(sum(l["valor_total"] for l in linhas), 2),
+            "atualizado_em": await _atualizado_em(db),
+            "data": linhas,
+        }
+    except Exception as e:
+        log.error(f"Erro ao ler gastos por cidade: {e}")
+        raise HTTPException(status_code=500, detail="Falha ao recuperar agregados")
+
+@router.get("/artistas")
+async def top_artistas(
+    ordem: str = Query("contratos", pattern="^(contratos|valor)$", description="Ordenar por nº de contratos ou valor"),
+    n: int = Query(20, ge=1, le=500, description="Quantidade de artistas"),
+    db: AsyncSession = Depends(get_session_leitura)
+):
+    """Artistas mais contratados pelas prefeituras (top-k pelo índice da tabela de agregado).
+    Requer DiarioOficialExtractor em FONTES_ATIVAS, como /gastos."""
+    try:
+        res = await db.execute(text(f"SELECT artista, contratos, valor_total FROM agg_artistas "
+                                    f"ORDER BY {ORDENS_ARTISTAS[ordem]} LIMIT :n"), {"n": n})
+        return {"ordem": ordem, "atualizado_em": await _atualizado_em(db), "data": [dict(r._mapping) for r in res]}
+    except Exception as e:
+        log.error(f"Erro ao ler ranking de artistas: {e}")
+        raise HTTPException(status_code=500, detail="Falha ao recuperar agregados")
+
+@router.get("/precos")
+async def distribuicao_precos(
+    categoria: Optional[str] = Query(None, description="Só esta categoria"),
+    db: AsyncSession = Depends(get_session_leitura)
+):
+    """Distribuição de preço por categoria: histograma por faixa, média e quantis estimados."""
+    try:
+        if categoria:
+            res = await db.execute(text("SELECT categoria, faixa, eventos, soma FROM agg_precos_categoria "
+                                        "WHERE categoria = :categoria"), {"categoria": categoria})
+        else:
+            res = await db.execute(text("SELECT categoria, faixa, eventos, soma FROM agg_precos_categoria"))
+        por_categoria = {}
+        for r in res:
+            por_categoria.setdefault(r.categoria, []).append(dict(r._mapping))
+        return {
+            "atualizado_em": await _atualizado_em(db),
+            "data": {cat: resumir_precos(linhas) for cat, linhas in sorted(por_categoria.items())},
+        }
+    except Exception as e:
+        log.error(f"Erro ao ler distribuição de preços: {e}")
+        raise HTTPException(status_code=500, detail="Falha ao recuperar agregados")
@@ -2,13 +2,23 @@
 Padrão de Qualidade: Query Filtering & Performance.
 Motivo: Permitir busca segmentada por cidade e categoria.
 """
-from fastapi import APIRouter, Depends, Query
+import asyncio
+import json
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
-from app.core.database import get_db
+from app.core.database import get_session_leitura
 from app.models import EventoModel
 from app.core.logger import log
-from typing import Optional
+from app.services.cdc import listar_mudancas
+from app.services.broadcaster import broadcaster
+from app.services.exportacao import gerar_export, FORMATOS, ORDENS
+from app.services.replica import caminho_atual
+from app.services.historico import consultar_historico
+from app.services import colunar, geo, sugestoes
+from app.core.config import settings
+from typing import List, Optional
 
 router = APIRouter(prefix="/eventos", tags=["Eventos"])
 
@@ -16,9 +26,10 @@ router = APIRouter(prefix="/eventos", tags=["Eventos"])
 async def listar_eventos(
     cidade: Optional[str] = Query(None, description="Filtrar por nome da cidade"),
     vibe: Optional[str] = Query(None, description="Filtrar por categoria (show, pousada)"),
-    db: AsyncSession = Depends(get_db)
+    incluir_arquivo: bool = Query(False, description="Incluir eventos passados já arquivados (mais lento)"),
+    db: AsyncSession = Depends(get_session_leitura)
 ):
-    """Retorna eventos com filtros opcionais."""
+    """Retorna eventos com filtros opcionais. Por padrão só a tabela quente (eventos recentes/futuros)."""
     try:
         query = select(EventoModel)
         
@@ -27,19 +38,147 @@ async def listar_eventos(
             query = query.where(EventoModel.cidade.ilike(f"%{cidade}%"))
         
         if vibe:
-            query = query.where(EventoModel.vibe == vibe)
+            query = query.where(EventoModel.categoria == vibe)
             
         # Ordenar pelos eventos mais próximos
         query = query.order_by(EventoModel.data_evento.asc())
         
         result = await db.execute(query)
         eventos = result.scalars().all()
+
+        if incluir_arquivo:
+            arquivados = await asyncio.to_thread(consultar_historico, cidade, vibe)
+            eventos = arquivados + list(eventos)  # partições são mais antigas que a tabela quente
         
         return {
             "total": len(eventos),
-            "filtros": {"cidade": cidade, "vibe": vibe},
+            "filtros": {"cidade": cidade, "vibe": vibe, "incluir_arquivo": incluir_arquivo},
             "data": eventos
         }
     except Exception as e:
         log.error(f"Erro ao listar eventos com filtros: {e}")
-        return {"error": "Falha ao recuperar eventos"}, 500
+        raise HTTPException(status_code=500, detail="Falha ao recuperar eventos")
+
+@router.get("/proximos")
+async def eventos_proximos(
+    lat: Optional[float] = Query(None, ge=-90, le=90, description="Latitude do ponto de referência"),
+    lon: Optional[float] = Query(None, ge=-180, le=180, description="Longitude do ponto de referência"),
+    cidade: Optional[str] = Query(None, description="Ou um município de MG como referência (ex.: Itabirito)"),
+    raio_km: Optional[float] = Query(None, gt=0, le=2000, description="Eventos a até X km; sem raio, os N mais próximos"),
+    n: int = Query(20, ge=1, le=500, description="Quantidade (N mais próximos, ou teto da lista no modo raio)"),
+    db: AsyncSession = Depends(get_session_leitura)
+):
+    """Busca por proximidade: range na R*Tree dos municípios + eventos pelo índice de código IBGE."""
+    if cidade:
+        codigo = geo.codigo_da_cidade(cidade)
+        if codigo is None:
+            raise HTTPException(status_code=404, detail=f"Município de MG não reconhecido: {cidade}")
+        municipio = geo.municipios()[codigo]
+        lat, lon = municipio["latitude"], municipio["longitude"]
+    elif lat is None or lon is None:
+        raise HTTPException(status_code=422, detail="Informe lat e lon, ou cidade.")
+    try:
+        if raio_km:
+            eventos = await geo.eventos_no_raio(db, lat, lon, raio_km, limite=n)
+        else:
+            eventos = await geo.eventos_mais_proximos(db, lat, lon, n)
+    except Exception as e:
+        log.error(f"Erro na busca por proximidade ({lat}, {lon}): {e}")
+        raise HTTPException(status_code=500, detail="Falha na busca por proximidade")
+    return {
+        "total": len(eventos),
+        "referencia": {"lat": lat, "lon": lon, "cidade": cidade, "raio_km": raio_km},
+        "data": eventos,
+    }
+
+@router.get("/sugestoes")
+async def sugerir(
+    q: str = Query(..., min_length=1, max_length=100, description="Texto digitado até agora (prefixo)"),
+    k: int = Query(10, ge=1, le=50, description="Quantidade de sugestões"),
+    tipo: Optional[str] = Query(None, pattern="^(evento|artista|local|cidade)$", description="Restringe o tipo do termo"),
+    db: AsyncSession = Depends(get_session_leitura)
+):
+    """Autocompletar de títulos, artistas, locais e cidades, por popularidade e recência."""
+    try:
+        termos = await sugestoes.sugerir(db, q, k, tipo)
+    except Exception as e:
+        log.error(f"Erro nas sugestões para '{q}': {e}")
+        raise HTTPException(status_code=500, detail="Falha ao gerar sugestões")
+    return {"q": q, "total": len(termos), "data": termos}
+
+@router.get("/changes")
+async def feed_mudancas(
+    since: int = Query(0, ge=0, description="Último seq já sincronizado pelo cliente"),
+    limite: int = Query(1000, ge=1, le=10000, description="Máximo de mudanças por página"),
+    db: AsyncSession = Depends(get_session_leitura)
+):
+    """Feed incremental (CDC): devolve só o que mudou em `eventos` depois de `since`.
+    `operacao`: "upsert", "delete" ou "archive" (movido para o arquivo; não apagar do lado do cliente)."""
+    try:
+        return await listar_mudancas(db, desde=since, limite=limite)
+    except Exception as e:
+        log.error(f"Erro ao listar mudanças desde {since}: {e}")
+        raise HTTPException(status_code=500, detail="Falha ao recuperar mudanças")
+
+@router.get("/stream")
+async def stream_eventos(
+    request: Request,
+    cidade: Optional[str] = Query(None, description="Receber só eventos desta cidade"),
+    categoria: Optional[str] = Query(None, description="Receber só eventos desta categoria"),
+):
+    """Server-Sent Events: empurra cada evento novo/alterado assim que o ciclo de ingestão faz commit."""
+    assinante = broadcaster.assinar(cidade=cidade, categoria=categoria)
+
+    async def gerar():
+        try:
+            yield "retry: 5000\n\n"
+            while True:
+                try:
+                    item = await asyncio.wait_for(assinante.fila.get(), timeout=settings.SSE_HEARTBEAT_SEGUNDOS)
+                except asyncio.TimeoutError:
+                    if await request.is_disconnected():
+                        break
+                    yield ": ping\n\n"
+                    continue
+                if item is None:  # derrubado por lentidão
+                    break
+                tipo, evento = item
+                payload = json.dumps(evento, ensure_ascii=False)
+                yield f"id: {evento['id_unico']}\nevent: {tipo}\ndata: {payload}\n\n"
+        finally:
+            broadcaster.cancelar(assinante)
+
+    return StreamingResponse(
+        gerar(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+@router.get("/export")
+async def exportar_eventos(
+    formato: str = Query("ndjson", pattern="^(json|ndjson)$", description="ndjson (uma linha por evento) ou json"),
+    gzip: bool = Query(False, description="Comprimir a resposta com gzip"),
+    ordem: str = Query("data", pattern="^(data|fonte)$", description="Ordenação: data ou fonte"),
+):
+    """Export completo em streaming: o cursor é lido em lotes, a memória não cresce com a tabela."""
+    headers = {"Content-Disposition": f'inline; filename="eventos.{formato}"'}
+    if gzip:
+        headers["Content-Encoding"] = "gzip"
+    # Gerador síncrono: o Starlette o consome em threadpool, sem bloquear o event loop
+    db_path = caminho_atual() if settings.LEITURA_REPLICA else None  # None: banco primário
+    return StreamingResponse(gerar_export(formato, gzip=gzip, ordem=ordem, db_path=db_path),
+                             media_type=FORMATOS[formato], headers=headers)
+
+@router.get("/arrow")
+async def exportar_arrow(
+    de: Optional[str] = Query(None, pattern=r"^\d{4}-\d{2}$", description="Primeiro mês (AAAA-MM)"),
+    ate: Optional[str] = Query(None, pattern=r"^\d{4}-\d{2}$", description="Último mês, inclusive (AAAA-MM)"),
+    fonte: Optional[List[str]] = Query(None, description="Só estas fontes (pode repetir)"),
+):
+    """Stream Arrow IPC do dataset Parquet (colunar): pyarrow.ipc.open_stream / pandas sem parsing de JSON."""
+    if not colunar.disponivel():
+        raise HTTPException(status_code=503, detail="Export colunar indisponível (pyarrow não instalado)")
+    if not colunar.EVENTOS_DIR.exists():
+        raise HTTPException(status_code=404, detail="Export colunar ainda não gerado")
+    headers = {"Content-Disposition": 'inline; filename="eventos.arrows"'}
+    return StreamingResponse(colunar.iterar_arrow(de, ate, fonte), media_type=colunar.MIDIA_ARROW, headers=headers)
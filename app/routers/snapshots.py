@@ -0,0 +1,56 @@
+"""
+Padrão de Qualidade: Entrega de Estáticos Pré-comprimidos.
+Motivo: Servir a variante br/gzip gerada na ingestão conforme o Accept-Encoding, sem comprimir
+por requisição, com cache imutável nos arquivos versionados por hash.
+"""
+import re
+from fastapi import APIRouter, Request, HTTPException
+from fastapi.responses import FileResponse
+from app.services.snapshot import SNAPSHOT_DIR, MANIFEST
+
+router = APIRouter(prefix="/snapshots", tags=["Snapshots"])
+
+RE_SNAPSHOT = re.compile(r"^eventos\.[0-9a-f]{12}\.json$")
+CACHE_IMUTAVEL = "public, max-age=31536000, immutable"
+
+def _codificacoes_aceitas(accept_encoding: str) -> set[str]:
+    """Codificações com q > 0 no header Accept-Encoding."""
+    aceitas = set()
+    for parte in accept_encoding.split(","):
+        nome, _, params = parte.strip().partition(";")
+        q = 1.0
+        m = re.search(r"q=([0-9.]+)", params)
+        if m:
+            try:
+                q = float(m.group(1))
+            except ValueError:
+                q = 0.0
+        if nome and q > 0:
+            aceitas.add(nome.strip().lower())
+    return aceitas
+
+@router.get("/manifest.json")
+async def manifest():
+    """Ponteiro para o snapshot atual: pequeno e sempre revalidado."""
+    if not MANIFEST.exists():
+        raise HTTPException(status_code=404, detail="Nenhum snapshot publicado ainda")
+    return FileResponse(MANIFEST, media_type="application/json", headers={"Cache-Control": "no-cache"})
+
+@router.get("/{nome}")
+async def snapshot(nome: str, request: Request):
+    if not RE_SNAPSHOT.match(nome):
+        raise HTTPException(status_code=404, detail="Snapshot inválido")
+
+    arquivo = SNAPSHOT_DIR / nome
+    if not arquivo.exists():
+        raise HTTPException(status_code=404, detail="Snapshot não encontrado")
+
+    headers = {"Cache-Control": CACHE_IMUTAVEL, "Vary": "Accept-Encoding"}
+    aceitas = _codificacoes_aceitas(request.headers.get("accept-encoding", ""))
+    for codificacao, sufixo in (("br", ".br"), ("gzip", ".gz")):
+        variante = arquivo.with_name(arquivo.name + sufixo)
+        if codificacao in aceitas and variante.exists():
+            headers["Content-Encoding"] = codificacao
+            return FileResponse(variante, media_type="application/json", headers=headers)
+
+    return FileResponse(arquivo, media_type="application/json", headers=headers)
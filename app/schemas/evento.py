@@ -1,7 +1,20 @@
-from pydantic import BaseModel
+import hashlib
+from pydantic import BaseModel, Field
 from datetime import datetime
 from typing import Optional
 
+# Campos que definem o "conteúdo" de um evento para detecção de mudanças
+CAMPOS_CONTEUDO = ("titulo", "data_evento", "cidade", "local", "descricao", "categoria", "preco_base", "url_evento", "imagem_url")
+
+def _normalizar(valor) -> str:
+    if valor is None:
+        return ""
+    if isinstance(valor, datetime):
+        return valor.replace(second=0, microsecond=0).isoformat()
+    if isinstance(valor, float):
+        return f"{valor:.2f}"
+    return " ".join(str(valor).split())
+
 class EventoSchema(BaseModel):
     id_unico: str
     titulo: str
@@ -14,3 +27,14 @@ class EventoSchema(BaseModel):
     url_evento: str
     imagem_url: Optional[str] = ""
     fonte: str
+    # True quando a fonte não publica a data e o extrator usou um valor provisório (ex: now())
+    data_estimada: bool = Field(default=False, exclude=True)
+
+    def hash_conteudo(self) -> str:
+        """SHA-1 dos campos normalizados. Datas estimadas ficam de fora para não gerar falsas mudanças."""
+        partes = [
+            _normalizar(getattr(self, campo))
+            for campo in CAMPOS_CONTEUDO
+            if not (campo == "data_evento" and self.data_estimada)
+        ]
+        return hashlib.sha1("\x1f".join(partes).encode("utf-8")).hexdigest()
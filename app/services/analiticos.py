@@ -0,0 +1,224 @@
+"""
+Padrão de Qualidade: Agregados Materializados (Rollups) Mantidos pelo CDC.
+Motivo: O minerador do diário (AMM-MG) extrai artista, cidade, valor do contrato e data de cada
+publicação, mas o único agregado era o `hashes_vistos` dentro do loop, e os totais se perdiam.
+Agora três tabelas de agregado ficam prontas para os dashboards (/analiticos/*), que só leem:
+    - agg_gasto_cidade_mes: contratos e valor total por cidade e mês
+    - agg_artistas: contratos e valor total por artista (índices para o top-k por cada um)
+    - agg_precos_categoria: histograma de preço (faixas fixas) com contagem e soma por categoria
+Manutenção incremental: ao fim do ciclo, as mudanças do `eventos_cdc` desde o cursor viram um
+lote de deltas (-1 do que o evento contribuía antes, guardado em `agg_contribuicoes`; +1 do estado
+atual), aplicado em SQL por conjunto (GROUP BY + UPSERT) numa única transação.
+Eventos que o arquivo (app/services/historico.py) move para as partições mensais continuam
+contando: a contribuição é marcada `arquivado` e o DELETE do arquivo não a desconta.
+"""
+import sqlite3
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Optional
+
+from app.core.config import settings
+from app.core.logger import log
+
+# Limites superiores das faixas de preço (R$): ingresso e contrato de show na mesma escala
+FAIXAS_PRECO = (0, 20, 50, 100, 200, 500, 1_000, 5_000, 20_000, 50_000, 100_000, 500_000)
+FAIXA_PRECO_SQL = "CASE " + " ".join(
+    f"WHEN COALESCE(e.preco_base, 0) <= {limite} THEN {i}" for i, limite in enumerate(FAIXAS_PRECO)
+) + f" ELSE {len(FAIXAS_PRECO)} END"
+
+# Contrato do diário: fonte AMM-MG com valor; o artista é o nome do título "Tipo: Nome"
+# (app/services/extractors/diario_oficial_service.py). Também usados pelo export colunar.
+# Esse extrator não está no FONTES_ATIVAS padrão: sem ele, gasto por cidade e artistas ficam vazios.
+CONTRATO_SQL = "(e.fonte LIKE 'AMM-MG%' AND COALESCE(e.preco_base, 0) > 0)"
+ARTISTA_SQL = ("CASE WHEN e.fonte LIKE 'AMM-MG%' AND instr(e.titulo, ': ') > 0 "
+               "THEN trim(substr(e.titulo, instr(e.titulo, ': ') + 2)) END")
+CONTRIBUICAO_SQL = f"""
+    SELECT e.id_unico,
+           strftime('%Y-%m', e.data_evento) AS mes,
+           e.cidade,
+           e.categoria,
+           COALESCE(e.preco_base, 0) AS valor,
+           {FAIXA_PRECO_SQL} AS faixa,
+           {CONTRATO_SQL} AS contrato,
+           {ARTISTA_SQL} AS artista
+"""
+
+SQL_CRIAR = """
+    CREATE TABLE IF NOT EXISTS agg_contribuicoes (
+        id_unico TEXT PRIMARY KEY, mes TEXT, cidade TEXT, categoria TEXT, valor REAL, faixa INTEGER,
+        contrato INTEGER, artista TEXT, arquivado INTEGER NOT NULL DEFAULT 0
+    );
+    CREATE TABLE IF NOT EXISTS agg_gasto_cidade_mes (
+        cidade TEXT NOT NULL, mes TEXT NOT NULL, contratos INTEGER NOT NULL, valor_total REAL NOT NULL,
+        PRIMARY KEY (cidade, mes)
+    );
+    CREATE INDEX IF NOT EXISTS idx_agg_gasto_mes ON agg_gasto_cidade_mes(mes);
+    CREATE TABLE IF NOT EXISTS agg_artistas (
+        artista TEXT PRIMARY KEY, contratos INTEGER NOT NULL, valor_total REAL NOT NULL
+    );
+    CREATE INDEX IF NOT EXISTS idx_agg_artistas_contratos ON agg_artistas(contratos DESC);
+    CREATE INDEX IF NOT EXISTS idx_agg_artistas_valor ON agg_artistas(valor_total DESC);
+    CREATE TABLE IF NOT EXISTS agg_precos_categoria (
+        categoria TEXT NOT NULL, faixa INTEGER NOT NULL, eventos INTEGER NOT NULL, soma REAL NOT NULL,
+        PRIMARY KEY (categoria, faixa)
+    );
+    CREATE TABLE IF NOT EXISTS agg_cursor (
+        id INTEGER PRIMARY KEY CHECK (id = 1), seq INTEGER NOT NULL, atualizado_em TEXT
+    );
+"""
+
+# Deltas do lote: sinal -1 (contribuição anterior) e +1 (estado atual no banco)
+SQL_DELTA_CRIAR = """
+    CREATE TEMP TABLE IF NOT EXISTS agg_mudados (id_unico TEXT PRIMARY KEY);
+    CREATE TEMP TABLE IF NOT EXISTS agg_delta (
+        sinal INTEGER, id_unico TEXT, mes TEXT, cidade TEXT, categoria TEXT, valor REAL, faixa INTEGER,
+        contrato INTEGER, artista TEXT
+    );
+    DELETE FROM temp.agg_mudados;
+    DELETE FROM temp.agg_delta;
+"""
+# Contribuição arquivada cujo evento não está mais na tabela quente: o DELETE foi do arquivo, mantém
+FILTRO_DESCONTAR = "(c.arquivado = 0 OR EXISTS (SELECT 1 FROM main.eventos q WHERE q.id_unico = c.id_unico))"
+
+SQL_APLICAR = """
+    INSERT INTO agg_gasto_cidade_mes (cidade, mes, contratos, valor_total)
+    SELECT cidade, mes, SUM(sinal), SUM(sinal * valor) FROM temp.agg_delta
+    WHERE contrato AND cidade IS NOT NULL AND mes IS NOT NULL GROUP BY cidade, mes
+    ON CONFLICT (cidade, mes) DO UPDATE SET
+        contratos = contratos + excluded.contratos, valor_total = valor_total + excluded.valor_total;
+
+    INSERT INTO agg_artistas (artista, contratos, valor_total)
+    SELECT artista, SUM(sinal), SUM(sinal * valor) FROM temp.agg_delta
+    WHERE contrato AND artista IS NOT NULL GROUP BY artista
+    ON CONFLICT (artista) DO UPDATE SET
+        contratos = contratos + excluded.contratos, valor_total = valor_total + excluded.valor_total;
+
+    INSERT INTO agg_precos_categoria (categoria, faixa, eventos, soma)
+    SELECT COALESCE(categoria, ''), faixa, SUM(sinal), SUM(sinal * valor) FROM temp.agg_delta
+    WHERE true GROUP BY COALESCE(categoria, ''), faixa
+    ON CONFLICT (categoria, faixa) DO UPDATE SET
+        eventos = eventos + excluded.eventos, soma = soma + excluded.soma;
+
+    DELETE FROM agg_gasto_cidade_mes WHERE contratos <= 0;
+    DELETE FROM agg_artistas WHERE contratos <= 0;
+    DELETE FROM agg_precos_categoria WHERE eventos <= 0;
+"""
+
+def _executar(conn: sqlite3.Connection, script: str):
+    """Instrução por instrução: executescript() faria COMMIT da transação do chamador."""
+    for instrucao in script.split(";"):
+        if instrucao.strip():
+            conn.execute(instrucao)
+
+def _reconstruir(conn: sqlite3.Connection) -> int:
+    """Carga inicial: contribuições de todos os eventos, quentes e das partições do arquivo."""
+    from app.services.historico import particoes
+
+    for tabela in ("agg_contribuicoes", "agg_gasto_cidade_mes", "agg_artistas", "agg_precos_categoria"):
+        conn.execute(f"DELETE FROM {tabela}")
+    conn.execute(f"INSERT INTO agg_contribuicoes {CONTRIBUICAO_SQL}, 0 FROM main.eventos e")
+    for particao in particoes():
+        # Conexão própria (ATTACH não roda dentro de transação); a tabela quente ganha de uma cópia antiga
+        origem = sqlite3.connect(f"file:{particao}?mode=ro", uri=True)
+        try:
+            # Partição recém-anexada pelo arquivo: a tabela ainda não foi commitada (e está vazia)
+            if not origem.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'eventos'").fetchone():
+                continue
+            conn.executemany("INSERT OR IGNORE INTO agg_contribuicoes VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                             origem.execute(f"{CONTRIBUICAO_SQL}, 1 FROM eventos e"))
+        finally:
+            origem.close()
+    _executar(conn, SQL_DELTA_CRIAR)
+    conn.execute("INSERT INTO temp.agg_delta SELECT 1, id_unico, mes, cidade, categoria, valor, faixa, contrato, artista "
+                 "FROM agg_contribuicoes")
+    _executar(conn, SQL_APLICAR)
+    return conn.execute("SELECT COUNT(*) FROM agg_contribuicoes").fetchone()[0]
+
+def aplicar_pendentes(conn: sqlite3.Connection) -> int:
+    """Aplica as mudanças do CDC desde o cursor. Roda DENTRO de uma transação do chamador
+    (o arquivo chama antes de mover eventos). Devolve quantos eventos mudaram."""
+    _executar(conn, SQL_CRIAR)
+    ate = conn.execute("SELECT COALESCE(MAX(seq), 0) FROM eventos_cdc").fetchone()[0]
+    cursor = conn.execute("SELECT seq FROM agg_cursor WHERE id = 1").fetchone()
+    if cursor is None:
+        total = _reconstruir(conn)
+    elif ate > cursor[0]:
+        _executar(conn, SQL_DELTA_CRIAR)
+        conn.execute("INSERT OR IGNORE INTO temp.agg_mudados SELECT id_unico FROM eventos_cdc WHERE seq > ? AND seq <= ?",
+                     (cursor[0], ate))
+        conn.execute(f"""
+            INSERT INTO temp.agg_delta
+            SELECT -1, c.id_unico, c.mes, c.cidade, c.categoria, c.valor, c.faixa, c.contrato, c.artista
+            FROM agg_contribuicoes c JOIN temp.agg_mudados m ON m.id_unico = c.id_unico
+            WHERE {FILTRO_DESCONTAR}
+        """)
+        conn.execute(f"DELETE FROM agg_contribuicoes AS c WHERE c.id_unico IN (SELECT id_unico FROM temp.agg_mudados) "
+                     f"AND {FILTRO_DESCONTAR}")
+        conn.execute(f"INSERT OR REPLACE INTO agg_contribuicoes {CONTRIBUICAO_SQL}, 0 "
+                     f"FROM main.eventos e JOIN temp.agg_mudados m ON m.id_unico = e.id_unico")
+        conn.execute("INSERT INTO temp.agg_delta SELECT 1, c.id_unico, c.mes, c.cidade, c.categoria, c.valor, c.faixa, "
+                     "c.contrato, c.artista FROM agg_contribuicoes c JOIN temp.agg_mudados m ON m.id_unico = c.id_unico "
+                     "WHERE c.arquivado = 0")
+        _executar(conn, SQL_APLICAR)
+        total = conn.execute("SELECT COUNT(*) FROM temp.agg_mudados").fetchone()[0]
+    else:
+        return 0
+    conn.execute("INSERT OR REPLACE INTO agg_cursor (id, seq, atualizado_em) VALUES (1, ?, ?)",
+                 (ate, datetime.now().isoformat(sep=" ", timespec="seconds")))
+    return total
+
+def atualizar(db_path: Optional[Path] = None) -> int:
+    """Traz os agregados até o último `seq` do CDC (uma transação). Devolve quantos eventos mudaram."""
+    db_path = db_path or settings.DB_PATH
+    inicio = time.perf_counter()
+    conn = sqlite3.connect(db_path, timeout=30, isolation_level=None)  # transação explícita abaixo
+    try:
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            total = aplicar_pendentes(conn)
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+    finally:
+        conn.close()
+    if total:
+        log.info(f"📊 Agregados analíticos: {total} eventos aplicados em {time.perf_counter() - inicio:.2f}s")
+    return total
+
+def marcar_arquivados(conn: sqlite3.Connection, filtro: str, params: dict):
+    """Chamado pelo arquivo, na transação da mudança de partição, antes do DELETE da tabela quente."""
+    aplicar_pendentes(conn)
+    conn.execute(f"UPDATE agg_contribuicoes SET arquivado = 1 "
+                 f"WHERE id_unico IN (SELECT id_unico FROM main.eventos WHERE {filtro})", params)
+
+def rotulo_faixa(faixa: int) -> str:
+    if faixa == 0:
+        return "gratuito"
+    if faixa >= len(FAIXAS_PRECO):
+        return f"acima de {FAIXAS_PRECO[-1]}"
+    return f"{FAIXAS_PRECO[faixa - 1]}-{FAIXAS_PRECO[faixa]}"
+
+def resumir_precos(linhas: list[dict]) -> dict:
+    """Histograma de uma categoria (linhas de agg_precos_categoria) -> contagem, média e quantis.
+    Quantil estimado pelo limite superior da faixa onde a contagem acumulada o atinge."""
+    linhas = sorted(linhas, key=lambda l: l["faixa"])
+    eventos = sum(l["eventos"] for l in linhas)
+    soma = sum(l["soma"] for l in linhas)
+
+    def quantil(q: float) -> Optional[float]:
+        acumulado = 0
+        for l in linhas:
+            acumulado += l["eventos"]
+            if acumulado >= q * eventos:
+                return FAIXAS_PRECO[l["faixa"]] if l["faixa"] < len(FAIXAS_PRECO) else None
+        return None
+
+    return {
+        "eventos": eventos,
+        "media": round(soma / eventos, 2) if eventos else None,
+        "mediana_ate": quantil(0.5),
+        "p90_ate": quantil(0.9),
+        "faixas": [{"faixa": rotulo_faixa(l["faixa"]), "eventos": l["eventos"]} for l in linhas],
+    }
@@ -0,0 +1,274 @@
+"""
+Padrão de Qualidade: Arquivo Bruto das Requisições (estilo WARC) com Reextração Offline.
+Motivo: Corrigir um parser só melhorava os ciclos futuros; o histórico exigia raspar de novo
+(e o site já não tem mais aquelas páginas). Agora toda resposta GET dos extratores é arquivada:
+    - segmentos `data/arquivo/*.warc.zst` (gzip sem o zstandard), um frame comprimido por
+      registro: lê-se um registro pelo offset sem descomprimir o segmento
+    - índice SQLite próprio (`indice.db`) por URL, horário, execução e digest do corpo
+    - corpo idêntico (mesmo digest) é gravado uma única vez; a captura aponta para ele
+    - corpo guardado já decodificado (sem gzip/br do servidor): compressão e dedup melhores
+A reextração (`python reextrair.py --de ... --ate ...`) repete cada execução arquivada pelos
+extratores ATUAIS com um transporte que responde do arquivo, sem rede.
+"""
+import base64
+import contextvars
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import uuid
+import zlib
+from datetime import datetime, timezone
+from pathlib import Path
+
+from app.core.config import settings
+from app.core.logger import log
+
+# Execução corrente ("Fonte@timestamp"), definida pelo manager: agrupa as capturas de um ciclo da fonte
+execucao_atual = contextvars.ContextVar("execucao_atual", default=None)
+# Durante a reextração: horário-limite das respostas servidas do arquivo (None = rede de verdade)
+replay_atual = contextvars.ContextVar("replay_atual", default=None)
+
+SCHEMA = """
+    CREATE TABLE IF NOT EXISTS corpos (
+        digest TEXT PRIMARY KEY, segmento TEXT NOT NULL, offset INTEGER NOT NULL,
+        tamanho INTEGER NOT NULL, bytes INTEGER NOT NULL
+    );
+    CREATE TABLE IF NOT EXISTS capturas (
+        id INTEGER PRIMARY KEY, url TEXT NOT NULL, fonte TEXT, execucao TEXT,
+        capturado_em TEXT NOT NULL, status INTEGER NOT NULL, headers TEXT NOT NULL,
+        digest TEXT, truncado INTEGER NOT NULL DEFAULT 0
+    );
+    CREATE INDEX IF NOT EXISTS idx_capturas_url ON capturas(url, capturado_em);
+    CREATE INDEX IF NOT EXISTS idx_capturas_execucao ON capturas(capturado_em, execucao);
+"""
+
+SQL_ULTIMA = """
+    SELECT c.status, c.headers, c.digest, b.segmento, b.offset, b.tamanho
+    FROM capturas c LEFT JOIN corpos b ON b.digest = c.digest
+    WHERE c.url = ? AND c.capturado_em <= ? AND c.status <> 304
+    ORDER BY c.capturado_em DESC LIMIT 1
+"""
+
+SQL_EXECUCOES = """
+    SELECT execucao, fonte, MIN(capturado_em) AS inicio, MAX(capturado_em) AS fim, COUNT(*) AS capturas
+    FROM capturas
+    WHERE execucao IS NOT NULL AND capturado_em >= ? AND capturado_em < ?
+    GROUP BY execucao, fonte ORDER BY fim
+"""
+
+# Cabeçalhos que deixam de valer quando o corpo é guardado decodificado
+SEM_VALOR_DECODIFICADO = {"content-encoding", "content-length", "transfer-encoding"}
+
+def _agora() -> str:
+    return datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%S.%fZ")
+
+def _compressao() -> str:
+    if settings.ARQUIVO_COMPRESSAO == "zstd":
+        try:
+            import zstandard  # noqa: F401
+            return "zst"
+        except ImportError:
+            log.warning("⚠️ zstandard não instalado: arquivo bruto em gzip.")
+    return "gz"
+
+def _comprimir(dados: bytes, extensao: str) -> bytes:
+    if extensao == "zst":
+        import zstandard
+        return zstandard.ZstdCompressor(level=settings.ARQUIVO_NIVEL).compress(dados)
+    obj = zlib.compressobj(6, zlib.DEFLATED, 31)
+    return obj.compress(dados) + obj.flush()
+
+def _descomprimir(dados: bytes, extensao: str) -> bytes:
+    if extensao == "zst":
+        import zstandard
+        return zstandard.ZstdDecompressor().decompress(dados)
+    return zlib.decompress(dados, 47)
+
+def _decodificar(corpo: bytes, codificacao: str) -> bytes | None:
+    """Desfaz o Content-Encoding do servidor; None quando não sabemos decodificar (fica como veio)."""
+    codificacao = codificacao.strip().lower()
+    try:
+        if codificacao in ("gzip", "x-gzip", "deflate"):
+            return zlib.decompress(corpo, 47 if codificacao != "deflate" else zlib.MAX_WBITS)
+        if codificacao == "br":
+            import brotli
+            return brotli.decompress(corpo)
+        if codificacao == "zstd":
+            import zstandard
+            return zstandard.ZstdDecompressor().decompressobj().decompress(corpo)
+    except Exception:
+        return None
+    return None
+
+def digest(corpo: bytes) -> str:
+    """WARC-Payload-Digest: sha1 em base32, como nos WARCs do Heritrix/wget."""
+    return "sha1:" + base64.b32encode(hashlib.sha1(corpo).digest()).decode("ascii")
+
+def registro_warc(url: str, capturado_em: str, status: int, headers: list, corpo: bytes, dig: str) -> bytes:
+    """Registro WARC/1.0 'response' (bloco HTTP completo) pronto para comprimir."""
+    bloco = f"HTTP/1.1 {status}\r\n".encode("latin-1")
+    bloco += "".join(f"{k}: {v}\r\n" for k, v in headers).encode("latin-1", "replace") + b"\r\n" + corpo
+    cabecalho = (
+        "WARC/1.0\r\n"
+        "WARC-Type: response\r\n"
+        f"WARC-Record-ID: <urn:uuid:{uuid.uuid4()}>\r\n"
+        f"WARC-Date: {capturado_em[:19]}Z\r\n"
+        f"WARC-Target-URI: {url}\r\n"
+        f"WARC-Payload-Digest: {dig}\r\n"
+        "Content-Type: application/http;msgtype=response\r\n"
+        f"Content-Length: {len(bloco)}\r\n\r\n"
+    ).encode("utf-8")
+    return cabecalho + bloco + b"\r\n\r\n"
+
+def corpo_do_registro(registro: bytes) -> bytes:
+    """Payload HTTP de um registro WARC (pula o cabeçalho WARC e o cabeçalho HTTP)."""
+    _, _, bloco = registro.partition(b"\r\n\r\n")
+    _, _, corpo = bloco.partition(b"\r\n\r\n")
+    return corpo[:-4] if corpo.endswith(b"\r\n\r\n") else corpo
+
+class Arquivista:
+    """Escrita e leitura do arquivo bruto. Síncrono e thread-safe: o transporte chama via to_thread."""
+    def __init__(self, diretorio: Path):
+        self.diretorio = Path(diretorio)
+        self.diretorio.mkdir(parents=True, exist_ok=True)
+        self._trava = threading.Lock()
+        self._conn = sqlite3.connect(self.diretorio / "indice.db", check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(SCHEMA)
+        self._extensao = _compressao()
+        self._segmento = None   # (nome, arquivo aberto) do segmento em escrita
+        self._leitores = {}     # segmento -> arquivo aberto para leitura
+        self._cache = {}        # digest -> corpo (últimos lidos na reextração)
+
+    def _segmento_em_escrita(self):
+        if self._segmento and self._segmento[1].tell() < settings.ARQUIVO_SEGMENTO_MB * 1024 * 1024:
+            return self._segmento
+        if self._segmento:
+            self._segmento[1].close()
+        nome = f"{datetime.now():%Y%m%d-%H%M%S}-{os.getpid()}.warc.{self._extensao}"
+        self._segmento = (nome, open(self.diretorio / nome, "ab"))
+        return self._segmento
+
+    def gravar(self, url: str, fonte: str | None, execucao: str | None, status: int,
+               headers: list, corpo: bytes, truncado: bool = False):
+        """Arquiva uma resposta. O corpo só é escrito se o digest ainda não existir."""
+        codificacao = next((v for k, v in headers if k.lower() == "content-encoding"), "")
+        if codificacao and corpo:
+            decodificado = _decodificar(corpo, codificacao)
+            if decodificado is not None:
+                corpo = decodificado
+                headers = [(k, v) for k, v in headers if k.lower() not in SEM_VALOR_DECODIFICADO]
+        capturado_em = _agora()
+        dig = digest(corpo) if corpo or status == 200 else None
+        with self._trava:
+            if dig and self._conn.execute("SELECT 1 FROM corpos WHERE digest = ?", (dig,)).fetchone() is None:
+                nome, arquivo = self._segmento_em_escrita()
+                frame = _comprimir(registro_warc(url, capturado_em, status, headers, corpo, dig), self._extensao)
+                offset = arquivo.tell()
+                arquivo.write(frame)
+                arquivo.flush()
+                self._conn.execute("INSERT INTO corpos VALUES (?, ?, ?, ?, ?)", (dig, nome, offset, len(frame), len(corpo)))
+            self._conn.execute(
+                "INSERT INTO capturas (url, fonte, execucao, capturado_em, status, headers, digest, truncado) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (url, fonte, execucao, capturado_em, status, json.dumps(headers), dig, int(truncado)),
+            )
+            self._conn.commit()
+
+    def _ler_corpo(self, dig: str, segmento: str, offset: int, tamanho: int) -> bytes:
+        if dig in self._cache:
+            return self._cache[dig]
+        with self._trava:
+            if segmento not in self._leitores:
+                self._leitores[segmento] = open(self.diretorio / segmento, "rb")
+            arquivo = self._leitores[segmento]
+            arquivo.seek(offset)
+            frame = arquivo.read(tamanho)
+        corpo = corpo_do_registro(_descomprimir(frame, segmento.rsplit(".", 1)[-1]))
+        if len(self._cache) >= 256:
+            self._cache.pop(next(iter(self._cache)))
+        self._cache[dig] = corpo
+        return corpo
+
+    def ler(self, url: str, limite: str) -> tuple[int, list, bytes] | None:
+        """Última resposta (não-304) arquivada para a URL até `limite`: (status, headers, corpo)."""
+        with self._trava:
+            linha = self._conn.execute(SQL_ULTIMA, (url, limite)).fetchone()
+        if linha is None:
+            return None
+        status, headers, dig, segmento, offset, tamanho = linha
+        corpo = self._ler_corpo(dig, segmento, offset, tamanho) if segmento else b""
+        return status, [tuple(h) for h in json.loads(headers)], corpo
+
+    def execucoes(self, de: str, ate: str, fontes: list[str] | None = None) -> list[dict]:
+        """Execuções arquivadas no intervalo [de, ate), em ordem cronológica."""
+        with self._trava:
+            cursor = self._conn.execute(SQL_EXECUCOES, (de, ate))
+            colunas = [c[0] for c in cursor.description]
+            linhas = [dict(zip(colunas, r)) for r in cursor]
+        return [l for l in linhas if not fontes or l["fonte"] in fontes]
+
+    def fechar(self):
+        with self._trava:
+            if self._segmento:
+                self._segmento[1].close()
+                self._segmento = None
+            for arquivo in self._leitores.values():
+                arquivo.close()
+            self._leitores.clear()
+            self._conn.close()
+
+_arquivista = None
+
+def arquivista() -> Arquivista:
+    global _arquivista
+    if _arquivista is None:
+        _arquivista = Arquivista(settings.ARQUIVO_DIR)
+    return _arquivista
+
+def nova_execucao(fonte: str) -> contextvars.Token:
+    """Marca as próximas capturas desta task como uma execução da fonte (reset pelo token)."""
+    return execucao_atual.set(f"{fonte}@{datetime.now(timezone.utc):%Y%m%dT%H%M%S%f}")
+
+async def reextrair(de: str, ate: str, fontes: list[str] | None = None) -> dict:
+    """Repete pelos extratores atuais cada execução arquivada em [de, ate), sem rede, e depois a mais
+    recente de cada fonte repetida. Persistência normal (hash + CDC): só o que o parser novo muda
+    de fato é regravado."""
+    from app.core.database import AsyncSessionLocal, init_db
+    from app.services.manager import EventManager
+    from app.services.extractors import registro
+
+    await init_db()
+    execucoes = arquivista().execucoes(de, ate, fontes)
+    # Repetir o passado deixaria as linhas atuais com dados velhos: cada fonte termina na sua
+    # execução arquivada mais recente (a última do intervalo já é a atual quando não há outra depois)
+    ultimas = {e["fonte"]: e for e in arquivista().execucoes(ate, "9999", sorted({e["fonte"] for e in execucoes}))}
+    execucoes += list(ultimas.values())
+    registradas = registro.fontes_registradas()
+    # O índice de sitemaps e os cursores de feed (este via replay_atual) descrevem o presente, não o dia arquivado
+    settings.DESCOBERTA_SITEMAP = False
+    total = {"execucoes": 0, "capturados": 0, "persistidos": 0, "atualizados": 0, "erros": 0}
+    log.info(
+        f"🗄️ Reextração: {len(execucoes) - len(ultimas)} execuções arquivadas entre {de} e {ate} "
+        f"(+{len(ultimas)} mais recentes, para terminar no estado atual)."
+    )
+
+    async with AsyncSessionLocal() as session:
+        manager = EventManager(session)
+        await manager._aplicar_migrations()
+        for execucao in execucoes:
+            if execucao["fonte"] not in registradas:
+                log.warning(f"⚠️ {execucao['execucao']}: fonte não registrada, ignorada.")
+                continue
+            token = replay_atual.set(execucao["fim"])
+            try:
+                linha, _ = await manager._executar_scraper(registro.criar_extrator(execucao["fonte"]))
+            finally:
+                replay_atual.reset(token)
+            total["execucoes"] += 1
+            for chave in ("capturados", "persistidos", "atualizados", "erros"):
+                total[chave] += linha.get(chave, 0)
+        await manager._pos_ciclo()
+    return total
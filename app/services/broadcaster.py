@@ -0,0 +1,70 @@
+"""
+Padrão de Qualidade: Fan-out Pub/Sub em memória.
+Motivo: Um ciclo de ingestão alcança todos os dashboards conectados via SSE sem polling.
+Cada cliente tem fila própria e limitada; quem não acompanha o ritmo é derrubado
+para nunca segurar a publicação nem crescer a memória do processo.
+"""
+import asyncio
+from typing import Optional
+from app.core.config import settings
+from app.core.logger import log
+
+class Assinante:
+    def __init__(self, cidade: Optional[str], categoria: Optional[str], buffer: int):
+        self.cidade = cidade.lower() if cidade else None
+        self.categoria = categoria
+        self.fila: asyncio.Queue = asyncio.Queue(maxsize=buffer)
+        self.derrubado = False
+
+    def aceita(self, evento: dict) -> bool:
+        if self.cidade and self.cidade not in (evento.get("cidade") or "").lower():
+            return False
+        if self.categoria and evento.get("categoria") != self.categoria:
+            return False
+        return True
+
+class Broadcaster:
+    def __init__(self, buffer: int = settings.SSE_BUFFER_CLIENTE):
+        self.buffer = buffer
+        self._assinantes: set[Assinante] = set()
+
+    @property
+    def total_assinantes(self) -> int:
+        return len(self._assinantes)
+
+    def assinar(self, cidade: Optional[str] = None, categoria: Optional[str] = None) -> Assinante:
+        assinante = Assinante(cidade, categoria, self.buffer)
+        self._assinantes.add(assinante)
+        return assinante
+
+    def cancelar(self, assinante: Assinante):
+        self._assinantes.discard(assinante)
+
+    def _derrubar(self, assinante: Assinante):
+        """Esvazia a fila e deixa só o sentinela (None) para o gerador SSE encerrar a conexão."""
+        assinante.derrubado = True
+        self._assinantes.discard(assinante)
+        while not assinante.fila.empty():
+            assinante.fila.get_nowait()
+        assinante.fila.put_nowait(None)
+
+    def publicar(self, tipo: str, evento: dict) -> int:
+        """Entrega sem bloquear a todos os assinantes compatíveis. Retorna quantos receberam."""
+        entregues = 0
+        lentos = []
+        for assinante in self._assinantes:
+            if not assinante.aceita(evento):
+                continue
+            try:
+                assinante.fila.put_nowait((tipo, evento))
+                entregues += 1
+            except asyncio.QueueFull:
+                lentos.append(assinante)
+
+        for assinante in lentos:
+            self._derrubar(assinante)
+        if lentos:
+            log.warning(f"📴 SSE: {len(lentos)} clientes lentos desconectados.")
+        return entregues
+
+broadcaster = Broadcaster()
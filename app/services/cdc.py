@@ -0,0 +1,76 @@
+"""
+Padrão de Qualidade: Change Data Capture (CDC).
+Motivo: Consumidores sincronizam só o delta desde o último `seq` visto, em vez de baixar o export inteiro.
+"""
+import json
+import sqlite3
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+# Última mudança de cada id após `desde`: mudanças intermediárias do mesmo evento já foram superadas.
+SQL_MUDANCAS = """
+    SELECT c.seq, c.id_unico, c.operacao, c.registrado_em,
+           e.titulo, e.data_evento, e.cidade, e.local, e.descricao, e.categoria,
+           e.preco_base, e.url_evento, e.imagem_url, e.fonte
+    FROM eventos_cdc c
+    JOIN (
+        SELECT id_unico, MAX(seq) AS seq FROM eventos_cdc WHERE seq > :desde GROUP BY id_unico
+    ) ult ON ult.seq = c.seq
+    LEFT JOIN eventos e ON e.id_unico = c.id_unico
+    ORDER BY c.seq
+    LIMIT :limite
+"""
+
+SQL_SEQ_ATUAL = "SELECT COALESCE(MAX(seq), 0) FROM eventos_cdc"
+
+CAMPOS_EVENTO = ("titulo", "data_evento", "cidade", "local", "descricao", "categoria",
+                 "preco_base", "url_evento", "imagem_url", "fonte")
+
+def montar_pagina(rows: list[dict], desde: int, limite: int, seq_atual: int) -> dict:
+    """Converte as linhas do CDC no payload do feed incremental.
+    Operações: "upsert" (evento completo), "delete" (apagado de vez) e "archive" (saiu da tabela
+    quente para o arquivo mensal: continua existindo e sai em /eventos/?incluir_arquivo=true)."""
+    mudancas = []
+    for r in rows:
+        arquivado = r["operacao"] == "A" and r["titulo"] is None
+        apagado = arquivado or r["operacao"] == "D" or r["titulo"] is None
+        evento = None if apagado else {"id_unico": r["id_unico"], **{c: r[c] for c in CAMPOS_EVENTO}}
+        if evento and hasattr(evento["data_evento"], "isoformat"):
+            evento["data_evento"] = evento["data_evento"].isoformat()
+        mudancas.append({
+            "seq": r["seq"],
+            "id_unico": r["id_unico"],
+            "operacao": "archive" if arquivado else "delete" if apagado else "upsert",
+            "evento": evento,
+        })
+
+    ate = mudancas[-1]["seq"] if mudancas else max(desde, 0)
+    return {
+        "desde": desde,
+        "ate": ate,
+        "seq_atual": seq_atual,
+        "tem_mais": len(mudancas) == limite,
+        "mudancas": mudancas,
+    }
+
+async def listar_mudancas(session: AsyncSession, desde: int = 0, limite: int = 1000) -> dict:
+    """Página do feed CDC para a API. O cliente repete a chamada com `desde=ate` enquanto `tem_mais`."""
+    res = await session.execute(text(SQL_MUDANCAS), {"desde": desde, "limite": limite})
+    rows = [dict(r._mapping) for r in res]
+    seq_atual = (await session.execute(text(SQL_SEQ_ATUAL))).scalar_one()
+    return montar_pagina(rows, desde, limite, seq_atual)
+
+def exportar_mudancas(db_path: str, desde: int, destino: str, limite: int = 1_000_000) -> dict:
+    """Versão síncrona (sqlite3) para scripts: grava em `destino` apenas o delta desde `desde`."""
+    conn = sqlite3.connect(db_path)
+    conn.row_factory = sqlite3.Row
+    try:
+        rows = [dict(r) for r in conn.execute(SQL_MUDANCAS, {"desde": desde, "limite": limite})]
+        seq_atual = conn.execute(SQL_SEQ_ATUAL).fetchone()[0]
+    finally:
+        conn.close()
+
+    pagina = montar_pagina(rows, desde, limite, seq_atual)
+    with open(destino, "w", encoding="utf-8") as f:
+        json.dump(pagina, f, ensure_ascii=False, separators=(",", ":"))
+    return pagina
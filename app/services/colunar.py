@@ -0,0 +1,251 @@
+"""
+Padrão de Qualidade: Export Colunar (Parquet) Incremental para Análise.
+Motivo: Os analistas baixavam o `export_eventos.json` (indentado) e reinterpretavam tudo no pandas
+a cada carga. Agora `eventos` vira um dataset Parquet particionado no layout Hive:
+    data/colunar/eventos/mes=AAAA-MM/fonte=<fonte, url-encoded>/eventos.parquet
+    - colunas tipadas (timestamps, float, bool, dicionário para textos repetidos), zstd
+    - colunas derivadas do diário: `contrato` e `artista` (as mesmas regras dos agregados)
+    - os agregados do diário (agg_gasto_cidade_mes, agg_artistas) em data/colunar/agregados/
+Incremental pelo CDC: o índice próprio (`data/colunar/indice.db`) guarda o último `seq` exportado e
+a partição de cada evento; ao fim do ciclo só as partições tocadas (a antiga e a nova de cada
+evento mudado) são reescritas, de forma atômica. Meses já arquivados (app/services/historico.py)
+são lidos também da partição mensal do arquivo: o Parquet não perde o histórico.
+O pyarrow é opcional: sem ele o export é pulado e o endpoint Arrow responde 503.
+"""
+import asyncio
+import json
+import os
+import shutil
+import sqlite3
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Iterator, Optional
+from urllib.parse import quote
+
+from app.core.config import settings
+from app.core.logger import log
+from app.services.analiticos import ARTISTA_SQL, CONTRATO_SQL
+
+COLUNAR_DIR = settings.DATA_DIR / "colunar"
+EVENTOS_DIR = COLUNAR_DIR / "eventos"
+AGREGADOS_DIR = COLUNAR_DIR / "agregados"
+INDICE = COLUNAR_DIR / "indice.db"
+ARQUIVO_PARTICAO = "eventos.parquet"
+MIDIA_ARROW = "application/vnd.apache.arrow.stream"
+
+SQL_PARTICAO = f"""
+    SELECT e.id_unico, e.titulo, e.data_evento, e.cidade, e.codigo_ibge, e.local, e.descricao, e.categoria,
+           e.preco_base, e.url_evento, e.imagem_url, e.detectado_em, e.data_estimada,
+           {CONTRATO_SQL} AS contrato, {ARTISTA_SQL} AS artista
+    FROM eventos e
+    WHERE e.data_evento >= :inicio AND e.data_evento < :fim AND e.fonte = :fonte
+"""
+SQL_CHAVES = "SELECT DISTINCT strftime('%Y-%m', data_evento) AS mes, fonte FROM eventos WHERE data_evento IS NOT NULL"
+SQL_LOCAIS = "SELECT id_unico, strftime('%Y-%m', data_evento), fonte FROM eventos"
+SQL_MUDADOS = """
+    SELECT DISTINCT c.id_unico, strftime('%Y-%m', e.data_evento), e.fonte
+    FROM eventos_cdc c LEFT JOIN eventos e ON e.id_unico = c.id_unico
+    WHERE c.seq > ? AND c.seq <= ?
+"""
+SQL_INDICE = """
+    CREATE TABLE IF NOT EXISTS estado (id INTEGER PRIMARY KEY CHECK (id = 1), seq INTEGER NOT NULL, exportado_em TEXT);
+    CREATE TABLE IF NOT EXISTS particao_do_evento (id_unico TEXT PRIMARY KEY, mes TEXT NOT NULL, fonte TEXT NOT NULL);
+"""
+
+def disponivel() -> bool:
+    try:
+        import pyarrow  # noqa: F401
+        return True
+    except ImportError:
+        return False
+
+def _esquema():
+    import pyarrow as pa
+    texto_repetido = pa.dictionary(pa.int32(), pa.string())
+    return pa.schema([
+        ("id_unico", pa.string()), ("titulo", pa.string()), ("data_evento", pa.timestamp("us")),
+        ("cidade", texto_repetido), ("codigo_ibge", pa.int32()), ("local", texto_repetido),
+        ("descricao", pa.string()), ("categoria", texto_repetido), ("preco_base", pa.float64()),
+        ("url_evento", pa.string()), ("imagem_url", pa.string()), ("detectado_em", pa.timestamp("us")),
+        ("data_estimada", pa.bool_()), ("contrato", pa.bool_()), ("artista", pa.string()),
+    ])
+
+def _particionamento():
+    import pyarrow as pa
+    import pyarrow.dataset as ds
+    return ds.partitioning(pa.schema([("mes", pa.string()), ("fonte", pa.string())]), flavor="hive")
+
+def _diretorio(mes: str, fonte: str) -> Path:
+    return EVENTOS_DIR / f"mes={mes}" / f"fonte={quote(fonte, safe='')}"
+
+def _intervalo(mes: str) -> dict:
+    ano, m = map(int, mes.split("-"))
+    fim = f"{ano + 1}-01-01" if m == 12 else f"{ano}-{m + 1:02d}-01"
+    return {"inicio": f"{mes}-01", "fim": fim}
+
+def _linhas_da_particao(conn: sqlite3.Connection, mes: str, fonte: str) -> list[tuple]:
+    """Linhas quentes do mês/fonte + as do arquivo mensal daquele mês (a tabela quente ganha)."""
+    from app.services.historico import HISTORICO_DIR
+
+    params = {**_intervalo(mes), "fonte": fonte}
+    linhas = conn.execute(SQL_PARTICAO, params).fetchall()
+    arquivo_mes = HISTORICO_DIR / f"eventos_{mes.replace('-', '_')}.db"
+    if arquivo_mes.exists():
+        frio = sqlite3.connect(f"file:{arquivo_mes}?mode=ro", uri=True)
+        try:
+            quentes = {linha[0] for linha in linhas}
+            linhas.extend(l for l in frio.execute(SQL_PARTICAO, params) if l[0] not in quentes)
+        finally:
+            frio.close()
+    return linhas
+
+def _gravar_atomico(tabela, destino: Path):
+    import pyarrow.parquet as pq
+    destino.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(prefix=f".{destino.name}.", suffix=".tmp", dir=destino.parent)
+    os.close(fd)
+    try:
+        pq.write_table(tabela, tmp, compression="zstd", use_dictionary=True)
+        os.replace(tmp, destino)  # leitor nunca vê arquivo pela metade
+    except BaseException:
+        Path(tmp).unlink(missing_ok=True)
+        raise
+
+def _escrever_particao(conn: sqlite3.Connection, mes: str, fonte: str) -> int:
+    """(Re)escreve uma partição inteira. Partição que ficou vazia é removida."""
+    import pyarrow as pa
+
+    linhas = _linhas_da_particao(conn, mes, fonte)
+    diretorio = _diretorio(mes, fonte)
+    if not linhas:
+        shutil.rmtree(diretorio, ignore_errors=True)
+        return 0
+    esquema = _esquema()
+    colunas = list(zip(*sorted(linhas, key=lambda l: (l[2] or "", l[0]))))  # ordenado por data: filtros pulam row groups
+    arrays = []
+    for campo, valores in zip(esquema, colunas):
+        if pa.types.is_timestamp(campo.type):
+            arrays.append(pa.array(valores, pa.string()).cast(campo.type))
+        elif pa.types.is_boolean(campo.type):
+            arrays.append(pa.array([None if v is None else bool(v) for v in valores], campo.type))
+        elif pa.types.is_dictionary(campo.type):
+            arrays.append(pa.array(valores, pa.string()).dictionary_encode())
+        else:
+            arrays.append(pa.array(valores, campo.type))
+    _gravar_atomico(pa.Table.from_arrays(arrays, schema=esquema), diretorio / ARQUIVO_PARTICAO)
+    return len(linhas)
+
+def _exportar_agregados(conn: sqlite3.Connection):
+    """Agregados do diário (app/services/analiticos.py): tabelas pequenas, reescritas inteiras."""
+    import pyarrow as pa
+
+    for tabela in ("agg_gasto_cidade_mes", "agg_artistas"):
+        cursor = conn.execute(f"SELECT * FROM {tabela}")
+        nomes = [c[0] for c in cursor.description]
+        linhas = cursor.fetchall()
+        dados = {nome: [l[i] for l in linhas] for i, nome in enumerate(nomes)}
+        _gravar_atomico(pa.table(dados), AGREGADOS_DIR / f"{tabela}.parquet")
+
+def _chaves_arquivadas() -> set[tuple[str, str]]:
+    from app.services.historico import particoes
+
+    chaves = set()
+    for particao in particoes():
+        frio = sqlite3.connect(f"file:{particao}?mode=ro", uri=True)
+        try:
+            chaves.update(frio.execute(SQL_CHAVES).fetchall())
+        finally:
+            frio.close()
+    return chaves
+
+def exportar(db_path: Optional[Path] = None, completo: bool = False) -> dict:
+    """Leva o dataset Parquet até o último `seq` do CDC. Devolve {"particoes": n, "eventos": n}."""
+    db_path = db_path or settings.DB_PATH
+    inicio = time.perf_counter()
+    COLUNAR_DIR.mkdir(parents=True, exist_ok=True)
+    indice = sqlite3.connect(INDICE)
+    conn = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True, timeout=30)
+    try:
+        indice.executescript(SQL_INDICE)
+        conn.execute("BEGIN")  # um snapshot de leitura só: seq, partições e linhas consistentes
+        ate = conn.execute("SELECT COALESCE(MAX(seq), 0) FROM eventos_cdc").fetchone()[0]
+        estado = indice.execute("SELECT seq FROM estado WHERE id = 1").fetchone()
+        if completo or estado is None:
+            shutil.rmtree(EVENTOS_DIR, ignore_errors=True)
+            indice.execute("DELETE FROM particao_do_evento")
+            locais = conn.execute(SQL_LOCAIS).fetchall()
+            tocadas = set(conn.execute(SQL_CHAVES).fetchall()) | _chaves_arquivadas()
+        elif ate > estado[0]:
+            locais = conn.execute(SQL_MUDADOS, (estado[0], ate)).fetchall()
+            antigas = indice.execute(
+                "SELECT mes, fonte FROM particao_do_evento WHERE id_unico IN (SELECT value FROM json_each(?))",
+                (json.dumps([l[0] for l in locais]),)).fetchall()
+            tocadas = {(mes, fonte) for _, mes, fonte in locais if mes and fonte} | set(antigas)
+        else:
+            return {"particoes": 0, "eventos": 0}
+
+        eventos = sum(_escrever_particao(conn, mes, fonte) for mes, fonte in sorted(tocadas) if mes and fonte)
+        if settings.ANALITICOS and conn.execute(
+                "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'agg_artistas'").fetchone():
+            _exportar_agregados(conn)
+        conn.execute("COMMIT")
+
+        # Apagado de vez: sai do índice; arquivado: a partição antiga continua sendo a dele
+        indice.executemany("INSERT OR REPLACE INTO particao_do_evento VALUES (?, ?, ?)",
+                           [l for l in locais if l[1] and l[2]])
+        indice.execute("INSERT OR REPLACE INTO estado (id, seq, exportado_em) VALUES (1, ?, ?)",
+                       (ate, datetime.now().isoformat(sep=" ", timespec="seconds")))
+        indice.commit()
+    finally:
+        conn.close()
+        indice.close()
+    log.info(f"🧊 Export colunar: {len(tocadas)} partições reescritas ({eventos} eventos) em {time.perf_counter() - inicio:.2f}s")
+    return {"particoes": len(tocadas), "eventos": eventos}
+
+async def exportar_se_ligado() -> dict:
+    """Chamado ao fim de cada ciclo (depois do arquivo: meses recém-arquivados já saem do arquivo)."""
+    if not settings.COLUNAR:
+        return {}
+    if not disponivel():
+        log.warning("⚠️ pyarrow não instalado: export colunar desligado.")
+        return {}
+    return await asyncio.to_thread(exportar)
+
+def iterar_arrow(de: Optional[str] = None, ate: Optional[str] = None, fontes: Optional[list] = None) -> Iterator[bytes]:
+    """Stream Arrow IPC do dataset: um record batch por vez (memória limitada ao batch)."""
+    import pyarrow as pa
+    import pyarrow.dataset as ds
+
+    dataset = ds.dataset(EVENTOS_DIR, format="parquet", partitioning=_particionamento())
+    filtro = None
+    for condicao in (
+        ds.field("mes") >= de if de else None,
+        ds.field("mes") <= ate if ate else None,
+        ds.field("fonte").isin(fontes) if fontes else None,
+    ):
+        if condicao is not None:
+            filtro = condicao if filtro is None else filtro & condicao
+
+    pedacos: list[bytes] = []
+
+    class _Coletor:
+        """Destino do writer IPC: guarda os bytes até o próximo yield."""
+        closed = False
+
+        def write(self, dados):
+            pedacos.append(bytes(dados))
+            return len(dados)
+
+        def flush(self):
+            pass
+
+    coletor = _Coletor()
+    writer = pa.ipc.new_stream(pa.PythonFile(coletor, mode="w"), dataset.schema)
+    for batch in dataset.to_batches(filter=filtro, batch_size=settings.COLUNAR_LOTE):
+        writer.write_batch(batch)
+        yield b"".join(pedacos)
+        pedacos.clear()
+    writer.close()
+    yield b"".join(pedacos)
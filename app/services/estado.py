@@ -0,0 +1,30 @@
+"""
+Padrão de Qualidade: Estado Operacional Persistente.
+Motivo: Agenda adaptativa (e futuros cursores por fonte) precisa lembrar o que aprendeu entre
+restarts do serviço. Tabela chave -> JSON, com upsert atômico do próprio SQLite.
+"""
+import json
+from typing import Any
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+SQL_LER = text("SELECT valor FROM estado WHERE chave = :chave")
+SQL_LER_PREFIXO = text("SELECT chave, valor FROM estado WHERE substr(chave, 1, length(:prefixo)) = :prefixo")
+SQL_GRAVAR = text("""
+    INSERT INTO estado (chave, valor, atualizado_em) VALUES (:chave, :valor, CURRENT_TIMESTAMP)
+    ON CONFLICT(chave) DO UPDATE SET valor = excluded.valor, atualizado_em = CURRENT_TIMESTAMP
+""")
+
+async def ler_estado(session: AsyncSession, chave: str, padrao: Any = None) -> Any:
+    valor = (await session.execute(SQL_LER, {"chave": chave})).scalar()
+    return json.loads(valor) if valor is not None else padrao
+
+async def ler_estados(session: AsyncSession, prefixo: str) -> dict[str, Any]:
+    """Todas as chaves que começam com `prefixo` (ex: "agenda:")."""
+    res = await session.execute(SQL_LER_PREFIXO, {"prefixo": prefixo})
+    return {row.chave: json.loads(row.valor) for row in res}
+
+async def gravar_estado(session: AsyncSession, chave: str, valor: Any, commit: bool = True):
+    await session.execute(SQL_GRAVAR, {"chave": chave, "valor": json.dumps(valor, ensure_ascii=False, default=str)})
+    if commit:
+        await session.commit()
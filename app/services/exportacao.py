@@ -0,0 +1,129 @@
+"""
+Padrão de Qualidade: Export em Streaming (memória constante).
+Motivo: Substituir o `fetchall()` + `json.dump(indent=2)` dos scripts offline por um
+pipeline de geradores: cursor SQLite em lotes -> serialização -> gzip opcional -> destino.
+O mesmo pipeline alimenta o endpoint HTTP e o snapshot do dashboard (app/services/snapshot.py).
+"""
+import json
+import os
+import sqlite3
+import tempfile
+import zlib
+from datetime import datetime
+from pathlib import Path
+from typing import Iterable, Iterator, Optional
+
+from app.core.config import settings
+from app.core.logger import log
+
+# Colunas consumidas pelo dashboard (index.html) e pelos exports legados
+SQL_EXPORT = """
+    SELECT fonte, titulo, local, cidade, categoria, preco_base, url_evento, imagem_url,
+           datetime(data_evento) AS data, datetime(detectado_em, 'localtime') AS capturado_em
+    FROM eventos
+    ORDER BY {ordem}
+"""
+
+ORDENS = {
+    "data": "data_evento ASC",
+    "fonte": "fonte ASC, titulo ASC",
+}
+
+FORMATOS = {
+    "json": "application/json",
+    "ndjson": "application/x-ndjson",
+}
+
+def iterar_eventos(db_path: Optional[Path] = None, ordem: str = "data", lote: int = settings.EXPORT_LOTE) -> Iterator[dict]:
+    """Percorre `eventos` com o cursor do SQLite em lotes de `lote` linhas (nada de fetchall)."""
+    db_path = db_path or settings.DB_PATH
+    # O Starlette consome o gerador em threadpool: cada next() pode cair numa thread diferente.
+    # O acesso continua serial (um next por vez), então a checagem de thread pode ser desligada.
+    conn = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True, check_same_thread=False)
+    conn.row_factory = sqlite3.Row
+    try:
+        cursor = conn.execute(SQL_EXPORT.format(ordem=ORDENS[ordem]))
+        while True:
+            linhas = cursor.fetchmany(lote)
+            if not linhas:
+                break
+            for linha in linhas:
+                yield dict(linha)
+    finally:
+        conn.close()
+
+def gerar_ndjson(eventos: Iterable[dict], lote: int = settings.EXPORT_LOTE) -> Iterator[bytes]:
+    """Uma linha por evento, entregue em blocos de `lote` linhas: o StreamingResponse faz um salto
+    de threadpool por bloco, então blocos de uma linha só deixavam o export dominado por overhead."""
+    bloco = []
+    for ev in eventos:
+        bloco.append(json.dumps(ev, ensure_ascii=False, separators=(",", ":")))
+        if len(bloco) >= lote:
+            yield ("\n".join(bloco) + "\n").encode("utf-8")
+            bloco = []
+    if bloco:
+        yield ("\n".join(bloco) + "\n").encode("utf-8")
+
+def gerar_json(eventos: Iterable[dict], metadados: Optional[dict] = None, lote: int = settings.EXPORT_LOTE) -> Iterator[bytes]:
+    """JSON minificado em blocos: `{"eventos":[...],"total":N,...}`. O total só é conhecido no fim,
+    por isso vai depois da lista (a ordem das chaves é irrelevante para quem faz JSON.parse)."""
+    yield b'{"eventos":['
+    total = 0
+    bloco = []
+    for ev in eventos:
+        bloco.append(json.dumps(ev, ensure_ascii=False, separators=(",", ":")))
+        total += 1
+        if len(bloco) >= lote:
+            yield (("," if total > len(bloco) else "") + ",".join(bloco)).encode("utf-8")
+            bloco = []
+    if bloco:
+        yield (("," if total > len(bloco) else "") + ",".join(bloco)).encode("utf-8")
+
+    rodape = {"total": total, **(metadados or {})}
+    yield b"]," + json.dumps(rodape, ensure_ascii=False, separators=(",", ":"))[1:].encode("utf-8")
+
+def comprimir_gzip(blocos: Iterable[bytes], nivel: int = 6) -> Iterator[bytes]:
+    compressor = zlib.compressobj(nivel, zlib.DEFLATED, 31)  # wbits=31 -> container gzip
+    for bloco in blocos:
+        saida = compressor.compress(bloco)
+        if saida:
+            yield saida
+    yield compressor.flush()
+
+def gerar_export(formato: str = "json", gzip: bool = False, ordem: str = "data",
+                 db_path: Optional[Path] = None, metadados: Optional[dict] = None) -> Iterator[bytes]:
+    """Pipeline completo de export; cada etapa é um gerador, então a memória não depende do tamanho da tabela."""
+    eventos = iterar_eventos(db_path, ordem=ordem)
+    if formato == "ndjson":
+        blocos = gerar_ndjson(eventos)
+    else:
+        blocos = gerar_json(eventos, metadados={"gerado_em": datetime.now().isoformat(timespec="seconds"), **(metadados or {})})
+    return comprimir_gzip(blocos) if gzip else blocos
+
+def gravar_atomico(destino: Path, blocos: Iterable[bytes]) -> int:
+    """Grava em arquivo temporário no mesmo diretório e troca com os.replace: leitores nunca veem arquivo pela metade."""
+    destino = Path(destino)
+    destino.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(prefix=f".{destino.name}.", dir=destino.parent)
+    escritos = 0
+    try:
+        with os.fdopen(fd, "wb") as f:
+            for bloco in blocos:
+                f.write(bloco)
+                escritos += len(bloco)
+            f.flush()
+            os.fsync(f.fileno())
+        # Permissões para o grupo do servidor (www-data)
+        os.chmod(tmp, 0o664)
+        os.replace(tmp, destino)
+    except Exception:
+        if os.path.exists(tmp):
+            os.unlink(tmp)
+        raise
+    return escritos
+
+def exportar_arquivo(destino: Path, formato: str = "json", gzip: bool = False, ordem: str = "data",
+                     db_path: Optional[Path] = None, metadados: Optional[dict] = None) -> int:
+    escritos = gravar_atomico(destino, gerar_export(formato, gzip, ordem, db_path, metadados))
+    log.info(f"📦 Export {formato}{'.gz' if gzip else ''} gravado em {destino} ({escritos / 1024:.1f} KB)")
+    return escritos
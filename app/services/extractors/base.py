@@ -5,9 +5,16 @@ Motivo: Evitar duplicação de lógica de rede e logs entre diferentes scrapers.
 import httpx
 from abc import ABC, abstractmethod
 from app.core.logger import log
+from app.core.metrics import medir_etapa
+from app.services.arquivo import replay_atual
+from app.services.extractors.transporte import TransporteInstrumentado, TransporteReplay
 import random
 
 class BaseExtractor(ABC):
+    # Estado que a última extract() quer gravar na tabela `estado` (ex: cursor de feed), {chave: valor}.
+    # O manager grava no mesmo commit do lote da fonte: cursor nunca anda à frente dos eventos.
+    estado_pendente: dict = {}
+
     def __init__(self):
         self.user_agents = [
             "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
@@ -22,13 +29,30 @@ class BaseExtractor(ABC):
             "Accept-Language": "pt-BR,pt;q=0.9,en-US;q=0.8,en;q=0.7",
         }
 
+    def criar_cliente(self, **kwargs) -> httpx.AsyncClient:
+        """
+        AsyncClient padrão dos extratores: toda requisição passa pelo transporte instrumentado
+        (latência, bytes e falhas por host em /metrics; respostas arquivadas). Na reextração
+        a rede é trocada pelo arquivo. Aceita os mesmos kwargs do httpx.AsyncClient.
+        """
+        http2 = kwargs.pop("http2", False)
+        limite = replay_atual.get()
+        interno = TransporteReplay(limite) if limite else httpx.AsyncHTTPTransport(http2=http2)
+        kwargs["transport"] = TransporteInstrumentado(interno, fonte=self.__class__.__name__)
+        return httpx.AsyncClient(**kwargs)
+
+    def etapa(self, nome: str):
+        """Cronometra uma etapa (fetch, parse...) desta fonte: `with self.etapa("parse"): ...`"""
+        return medir_etapa(self.__class__.__name__, nome)
+
     async def fetch_html(self, url: str):
         """
         Realiza a requisição assíncrona com tratamento de erro e retry simples.
         """
-        async with httpx.AsyncClient(headers=self.get_headers(), follow_redirects=True) as client:
+        async with self.criar_cliente(headers=self.get_headers(), follow_redirects=True) as client:
             try:
-                response = await client.get(url, timeout=15.0)
+                with self.etapa("fetch"):
+                    response = await client.get(url, timeout=15.0)
                 response.raise_for_status()
                 return response.text
             except Exception as e:
@@ -0,0 +1,313 @@
+"""
+Padrão de Qualidade: Extração por Dados Estruturados (schema.org).
+Motivo: As páginas de eventos já publicam os dados prontos para o Google: blocos JSON-LD,
+microdata (itemscope/itemprop) e o estado do Next.js (__NEXT_DATA__). Ler isso é um json.loads
+por bloco, e vem com data, preço e local de verdade, em vez de título deduzido do slug.
+
+Uma única varredura do documento acha os blocos <script> (regex compilada, sem montar DOM);
+a árvore do selectolax só é construída quando a página tem microdata. Tudo vira um dicionário "achatado"
+(nome, inicio, url, local, cidade, imagem, preco, descricao, tipo) e depois EventoSchema.
+Uma fonte usa isso com poucas linhas: herdando EstruturadoExtractor e preenchendo a config,
+ou chamando `extrair_eventos` direto no próprio parser (com fallback para o método antigo).
+"""
+import hashlib
+import json
+import re
+from datetime import datetime, timedelta, timezone
+from html import unescape
+from urllib.parse import urljoin
+from selectolax.parser import HTMLParser
+
+from app.schemas.evento import EventoSchema
+from app.services.extractors.base import BaseExtractor
+from app.core.logger import log
+
+# Minas não tem horário de verão desde 2019: datas com fuso são gravadas no horário de Brasília
+FUSO_BRASILIA = timezone(timedelta(hours=-3))
+
+# Subtipos de schema:Event -> categoria do hub (os demais usam a categoria padrão da fonte)
+CATEGORIAS_POR_TIPO = {
+    "MusicEvent": "Show",
+    "TheaterEvent": "Teatro",
+    "ComedyEvent": "Stand-up",
+    "DanceEvent": "Dança",
+    "Festival": "Festival",
+    "ExhibitionEvent": "Exposição",
+    "VisualArtsEvent": "Exposição",
+    "FoodEvent": "Gastronomia",
+    "ScreeningEvent": "Cinema",
+    "ChildrensEvent": "Infantil",
+    "LiteraryEvent": "Literatura",
+    "SportsEvent": "Esporte",
+}
+
+RE_SCRIPT = re.compile(r"<script\b([^>]*)>(.*?)</script\s*>", re.S | re.I)
+RE_ATTR_TIPO_LD = re.compile(r"""type\s*=\s*["']?application/ld\+json""", re.I)
+RE_ATTR_ID_NEXT = re.compile(r"""id\s*=\s*["']?__NEXT_DATA__""")
+
+def _eh_evento(tipo) -> bool:
+    tipos = tipo if isinstance(tipo, list) else [tipo]
+    return any(isinstance(t, str) and (t.rsplit("/", 1)[-1].endswith("Event") or t.endswith("Festival"))
+               for t in tipos)
+
+def _tipo_curto(tipo) -> str:
+    if isinstance(tipo, list):
+        tipo = next((t for t in tipo if _eh_evento(t)), tipo[0] if tipo else "")
+    return str(tipo or "").rsplit("/", 1)[-1]
+
+def _primeiro(valor):
+    return valor[0] if isinstance(valor, list) and valor else valor
+
+def _texto(valor) -> str:
+    valor = _primeiro(valor)
+    if isinstance(valor, dict):
+        valor = valor.get("name") or valor.get("url") or valor.get("@id") or ""
+    return " ".join(str(valor or "").split())
+
+def _caminho(dado, caminho: str):
+    """Lê 'a.b.0.c' de dicts/listas aninhados; None se algum passo não existir."""
+    for parte in caminho.split("."):
+        if isinstance(dado, dict):
+            dado = dado.get(parte)
+        elif isinstance(dado, list) and parte.isdigit() and int(parte) < len(dado):
+            dado = dado[int(parte)]
+        else:
+            return None
+    return dado
+
+def _percorrer(dado):
+    """Todos os dicts de uma árvore JSON (pilha explícita: estados do Next.js podem ser profundos)."""
+    pilha = [dado]
+    while pilha:
+        atual = pilha.pop()
+        if isinstance(atual, dict):
+            yield atual
+            pilha.extend(v for v in atual.values() if isinstance(v, (dict, list)))
+        elif isinstance(atual, list):
+            pilha.extend(v for v in atual if isinstance(v, (dict, list)))
+
+def achatar_schema(ev: dict) -> dict:
+    """schema:Event (JSON-LD ou microdata já convertido em dict) -> dicionário achatado."""
+    local = _primeiro(ev.get("location"))
+    cidade = ""
+    if isinstance(local, dict):
+        endereco = _primeiro(local.get("address"))
+        if isinstance(endereco, dict):
+            cidade = _texto(endereco.get("addressLocality"))
+        nome_local = _texto(local.get("name")) or (_texto(endereco) if isinstance(endereco, str) else "")
+    else:
+        nome_local = _texto(local)
+
+    ofertas = ev.get("offers")
+    precos = []
+    for oferta in ofertas if isinstance(ofertas, list) else [ofertas]:
+        if isinstance(oferta, dict):
+            precos.append(oferta.get("price", oferta.get("lowPrice")))
+    gratuito = str(ev.get("isAccessibleForFree", "")).lower() in ("true", "1")
+
+    imagem = _primeiro(ev.get("image"))
+    if isinstance(imagem, dict):
+        imagem = imagem.get("url") or imagem.get("contentUrl")
+
+    return {
+        "nome": _texto(ev.get("name")),
+        "inicio": _texto(ev.get("startDate")),
+        "url": _texto(ev.get("url")),
+        "local": nome_local,
+        "cidade": cidade,
+        "imagem": imagem if isinstance(imagem, str) else "",
+        "preco": 0.0 if gratuito else precos,
+        "descricao": _texto(ev.get("description")),
+        "tipo": _tipo_curto(ev.get("@type") or ev.get("itemtype")),
+    }
+
+def _valor_microdata(no) -> object:
+    attrs = no.attributes
+    if "itemscope" in attrs:
+        return _objeto_microdata(no)
+    for atributo in ("content", "datetime", "href", "src"):
+        if attrs.get(atributo):
+            return attrs[atributo]
+    return no.text(deep=True)
+
+def _escopo(no):
+    """Elemento itemscope mais próximo acima de `no` (o dono da propriedade)."""
+    pai = no.parent
+    while pai is not None and "itemscope" not in pai.attributes:
+        pai = pai.parent
+    return pai
+
+def _objeto_microdata(raiz) -> dict:
+    objeto = {"@type": raiz.attributes.get("itemtype") or ""}
+    for no in raiz.css("[itemprop]"):
+        if not _mesmo_no(_escopo(no), raiz):
+            continue  # propriedade de um item aninhado (ex: o Place dentro do Event)
+        for prop in (no.attributes.get("itemprop") or "").split():
+            objeto.setdefault(prop, _valor_microdata(no))
+    return objeto
+
+def _mesmo_no(a, b) -> bool:
+    # selectolax cria um objeto Python novo a cada navegação: compara pela posição no documento
+    return a is not None and b is not None and a.mem_id == b.mem_id
+
+def encontrar_eventos(html: str, campos_next: dict | None = None) -> list[dict]:
+    """
+    Uma varredura do documento, três formatos. Devolve dicionários achatados.
+    `campos_next`: chave achatada -> caminho pontilhado dentro de cada item do __NEXT_DATA__
+    (obrigatórios: "nome" e "inicio"; um item só conta se os dois existirem).
+    """
+    achados = []
+    tem_ld = "application/ld+json" in html  # agulha longa: a busca do CPython salta mais
+    tem_next = bool(campos_next) and "__NEXT_DATA__" in html
+
+    for m in RE_SCRIPT.finditer(html) if (tem_ld or tem_next) else ():
+        attrs = m.group(1)
+        eh_ld = tem_ld and RE_ATTR_TIPO_LD.search(attrs) is not None
+        eh_next = tem_next and RE_ATTR_ID_NEXT.search(attrs) is not None
+        if not (eh_ld or eh_next):
+            continue
+        try:
+            dado = json.loads(m.group(2) or "null")
+        except ValueError as e:
+            log.debug(f"[Estruturado] Bloco JSON inválido: {e}")
+            continue
+        if eh_ld:
+            achados.extend(achatar_schema(d) for d in _percorrer(dado) if _eh_evento(d.get("@type")))
+        else:
+            for d in _percorrer(dado):
+                item = {chave: _caminho(d, caminho) for chave, caminho in campos_next.items()}
+                if item.get("nome") and item.get("inicio"):
+                    achados.append({chave: (v if chave == "preco" else _texto(v)) for chave, v in item.items()})
+
+    if "itemscope" not in html:
+        return achados
+    for no in HTMLParser(html).css("[itemscope][itemtype]"):
+        if _eh_evento(no.attributes.get("itemtype") or ""):
+            achados.append(achatar_schema(_objeto_microdata(no)))
+    return achados
+
+def _data(valor: str) -> datetime | None:
+    try:
+        data = datetime.fromisoformat(valor.strip())
+    except (ValueError, AttributeError):
+        return None
+    if data.tzinfo is not None:
+        data = data.astimezone(FUSO_BRASILIA).replace(tzinfo=None)
+    return data
+
+def _preco(valor) -> float:
+    """Menor preço informado; ausente ou ilegível vale 0.0, como nos outros extratores."""
+    candidatos = []
+    for v in valor if isinstance(valor, list) else [valor]:
+        try:
+            candidatos.append(float(str(v).replace(",", ".")))
+        except (TypeError, ValueError):
+            continue
+    return min(candidatos) if candidatos else 0.0
+
+def _absoluta(base: str, url: str | None) -> str:
+    if not url:
+        return base
+    return url if url.startswith(("https://", "http://")) else urljoin(base, url)
+
+def para_evento(item: dict, fonte: str, url_base: str, cidade_padrao: str, categoria_padrao: str) -> EventoSchema | None:
+    titulo = item.get("nome") or ""
+    if len(titulo) < 3:
+        return None
+    url = _absoluta(url_base, item.get("url"))
+    data = _data(item.get("inicio") or "")
+    cidade = item.get("cidade") or cidade_padrao
+    # Mesmo id dos extratores por regex (md5 da URL): trocar de método não duplica eventos
+    uid = hashlib.md5((url if item.get("url") else f"{titulo}-{item.get('inicio')}").encode("utf-8")).hexdigest()
+    return EventoSchema(
+        id_unico=uid,
+        titulo=titulo[:250],
+        data_evento=data or datetime.now(),
+        cidade=cidade,
+        local=item.get("local") or cidade,
+        descricao=(item.get("descricao") or "")[:2000],
+        categoria=CATEGORIAS_POR_TIPO.get(item.get("tipo") or "", categoria_padrao),
+        preco_base=_preco(item.get("preco")),
+        url_evento=url,
+        imagem_url=_absoluta(url_base, item.get("imagem")) if item.get("imagem") else "",
+        fonte=fonte,
+        data_estimada=data is None,
+    )
+
+def extrair_eventos(html: str, fonte: str, url_base: str, cidade_padrao: str,
+                    categoria_padrao: str = "Entretenimento", campos_next: dict | None = None) -> list[EventoSchema]:
+    """Eventos estruturados do documento, deduplicados por id_unico (JSON-LD e microdata costumam repetir)."""
+    eventos = {}
+    for item in encontrar_eventos(html, campos_next):
+        ev = para_evento(item, fonte, url_base, cidade_padrao, categoria_padrao)
+        if ev is not None:
+            eventos.setdefault(ev.id_unico, ev)
+    return list(eventos.values())
+
+RE_META = re.compile(r"<meta\b([^>]*)>", re.I)
+RE_ATRIBUTO = re.compile(r"""([\w:-]+)\s*=\s*(?:"([^"]*)"|'([^']*)')""")
+
+def opengraph(html: str) -> dict[str, str]:
+    """<meta property="og:*"> e <meta name="description">, em qualquer ordem de atributos."""
+    metas = {}
+    for m in RE_META.finditer(html):
+        attrs = {k.lower(): (a if a is not None else b) for k, a, b in RE_ATRIBUTO.findall(m.group(1))}
+        chave = attrs.get("property") or attrs.get("name")
+        if chave and "content" in attrs and (chave.startswith("og:") or chave == "description"):
+            metas.setdefault(chave.lower(), unescape(attrs["content"]).strip())
+    return metas
+
+def _informou_preco(valor) -> bool:
+    return any(v not in (None, "") for v in (valor if isinstance(valor, list) else [valor]))
+
+def detalhes_do_evento(html: str, url: str) -> dict:
+    """
+    Campos de EventoSchema que a página de detalhe sabe melhor que a listagem. Só devolve o que
+    a página informa de fato (campo ausente não apaga o valor da listagem). Datas em ISO (JSON).
+    """
+    itens = [i for i in encontrar_eventos(html) if i.get("nome")]
+    # Página de detalhe costuma listar "eventos relacionados": prefere o item desta URL
+    item = next((i for i in itens if i.get("url") and _absoluta(url, i["url"]) == url), itens[0] if itens else {})
+    og = opengraph(html)
+    campos = {}
+
+    titulo = item.get("nome") or og.get("og:title")
+    if titulo:
+        campos["titulo"] = titulo[:250]
+    data = _data(item.get("inicio") or "")
+    if data:
+        campos["data_evento"] = data.isoformat()
+    if _informou_preco(item.get("preco")):
+        campos["preco_base"] = _preco(item["preco"])
+    if item.get("local"):
+        campos["local"] = item["local"][:255]
+    if item.get("cidade"):
+        campos["cidade"] = item["cidade"][:100]
+    descricao = item.get("descricao") or og.get("og:description") or og.get("description")
+    if descricao:
+        campos["descricao"] = descricao[:2000]
+    imagem = item.get("imagem") or og.get("og:image")
+    if imagem:
+        campos["imagem_url"] = _absoluta(url, imagem)[:500]
+    if item.get("tipo") in CATEGORIAS_POR_TIPO:
+        campos["categoria"] = CATEGORIAS_POR_TIPO[item["tipo"]]
+    return campos
+
+class EstruturadoExtractor(BaseExtractor):
+    """Fonte só de configuração: a página publica schema:Event, basta dizer onde e como rotular."""
+    URL_ALVO = ""
+    FONTE = ""
+    CIDADE_PADRAO = "Belo Horizonte"
+    CATEGORIA_PADRAO = "Entretenimento"
+    CAMPOS_NEXT = None  # ex: {"nome": "name", "inicio": "start_date", "url": "url"}
+
+    async def extract(self) -> list[EventoSchema]:
+        html = await self.fetch_html(self.URL_ALVO)
+        if not html:
+            return []
+        with self.etapa("parse"):
+            return self.parsear(html)
+
+    def parsear(self, html: str) -> list[EventoSchema]:
+        return extrair_eventos(html, self.FONTE, self.URL_ALVO, self.CIDADE_PADRAO,
+                               self.CATEGORIA_PADRAO, self.CAMPOS_NEXT)
@@ -10,7 +10,7 @@ import httpx
 import hashlib
 from tqdm import tqdm
 from datetime import datetime, timedelta
-from typing import Optional
+from typing import Iterable, Optional
 
 from app.schemas.evento import EventoSchema
 from app.services.extractors.base import BaseExtractor
@@ -58,102 +58,112 @@ class DiarioOficialExtractor(BaseExtractor):
 
     async def _processar_pdf_streaming(self, pdf_url: str) -> list[EventoSchema]:
         chunks = []
-        async with httpx.AsyncClient(follow_redirects=True, timeout=120.0) as client:
-            async with client.stream("GET", pdf_url) as resp:
-                async for chunk in resp.aiter_bytes(chunk_size=65536):
-                    chunks.append(chunk)
+        async with self.criar_cliente(follow_redirects=True, timeout=120.0) as client:
+            with self.etapa("fetch"):
+                async with client.stream("GET", pdf_url) as resp:
+                    async for chunk in resp.aiter_bytes(chunk_size=65536):
+                        chunks.append(chunk)
         
         pdf_bytes = b"".join(chunks)
         gc.collect()
-        return self._extrair_eventos_fatiados(pdf_bytes, pdf_url)
+        with self.etapa("parse"):
+            return self._extrair_eventos_fatiados(pdf_bytes, pdf_url)
 
     def _extrair_eventos_fatiados(self, pdf_bytes: bytes, pdf_url: str) -> list[EventoSchema]:
         try:
             reader = PdfReader(io.BytesIO(pdf_bytes))
             total_paginas = len(reader.pages)
             log.info(f"📄 Minerando {total_paginas} páginas...")
-
-            eventos: list[EventoSchema] = []
-            hashes_vistos = {} # Usado para manter o maior valor por artista/cidade
             pbar = tqdm(total=total_paginas, desc="Extraindo v11.7", unit="pág")
 
-            cidade_atual = "Minas Gerais"
-
-            for i in range(total_paginas):
-                pbar.update(1)
-                texto = reader.pages[i].extract_text() or ""
-                
-                # 1. Atualiza Cidade
-                m_cid = RE_CIDADE.search(texto)
-                if m_cid: cidade_atual = m_cid.group(1).strip().title()
-
-                # 2. Fatiamento por Bloco de Publicação (Publicado por)
-                blocos = re.split(r"Publicado por:", texto, flags=re.IGNORECASE)
-                
-                for bloco in blocos:
-                    if not re.search(KEYWORDS_ANCORA, bloco.lower()): continue
-                    if any(v in bloco.lower() for v in PALAVRAS_VETO): continue
-
-                    # 3. Fatiamento Interno por Valor (Resolve múltiplos shows)
-                    fatias = re.split(r"(?=R\$\s*[\(]?\s*[\d\.]+,\d{2})", bloco)
-                    contexto_acumulado = ""
-                    
-                    for fatia in fatias:
-                        texto_analise = (contexto_acumulado[-300:] + fatia)
-                        contexto_acumulado = fatia
-                        
-                        # Extração de Artista
-                        m_art = RE_ARTISTA.search(texto_analise)
-                        if not m_art: continue
-                        
-                        nome = m_art.group(1).strip()
-                        # Limpa lixo residual do nome
-                        nome = re.split(r'\s+(?:CNPJ|CPF|LTDA|MEI|VALOR|OBJETO|\d{2}\.)', nome, flags=re.IGNORECASE)[0]
-                        nome = re.sub(r'^(?:Artística|Musical|Show|Banda|Dupla)\s+', '', nome, flags=re.IGNORECASE).strip().title()
-                        
-                        if len(nome) < 3: continue
-
-                        # Extração de Valor
-                        valor = 0.0
-                        m_val = RE_VALOR.search(texto_analise)
-                        if m_val:
-                            try: valor = float(m_val.group(1).replace(".", "").replace(",", "."))
-                            except: pass
-                        
-                        if valor > 850000: continue
-
-                        # Extração de Data
-                        m_dt = RE_DATA.search(texto_analise)
-                        data_ev = datetime.now() + timedelta(days=30)
-                        if m_dt:
-                            try: data_ev = datetime.strptime(m_dt.group(1), "%d/%m/%Y")
-                            except: pass
-
-                        tipo = "Show Musical"
-                        if "carnaval" in texto_analise.lower(): tipo = "Show Carnavalesco"
-                        elif "aniversário" in texto_analise.lower(): tipo = "Aniversário de Cidade"
-
-                        # 4. Deduplicação por maior valor
-                        h = f"{nome}-{cidade_atual}"
-                        if h not in hashes_vistos or valor > hashes_vistos[h].preco_base:
-                            hashes_vistos[h] = EventoSchema(
-                                titulo=f"{tipo}: {nome}",
-                                data_evento=data_ev,
-                                cidade=cidade_atual,
-                                local=f"Município de {cidade_atual}",
-                                preco_base=valor,
-                                fonte="AMM-MG (v11.7.0)",
-                                url_origem=pdf_url,
-                                vibe="show"
-                            )
-
-                if i % 30 == 0: gc.collect()
+            def paginas():
+                for i in range(total_paginas):
+                    pbar.update(1)
+                    yield reader.pages[i].extract_text() or ""
+                    if i % 30 == 0: gc.collect()
 
+            eventos = fatiar_paginas(paginas(), pdf_url)
             pbar.close()
-            eventos = list(hashes_vistos.values())
             log.info(f"✅ Sucesso! {len(eventos)} eventos únicos minerados.")
             return eventos
         except Exception as e:
             if 'pbar' in locals(): pbar.close()
             log.error(f"❌ Falha: {e}")
             return []
+
+def fatiar_paginas(paginas: Iterable[str], pdf_url: str) -> list[EventoSchema]:
+    """Fatiador do diário (puro, sem rede nem PDF): recebe o texto de cada página e devolve os shows."""
+    hashes_vistos = {} # Usado para manter o maior valor por artista/cidade
+    cidade_atual = "Minas Gerais"
+
+    for texto in paginas:
+        # 1. Atualiza Cidade
+        m_cid = RE_CIDADE.search(texto)
+        if m_cid: cidade_atual = m_cid.group(1).strip().title()
+
+        # 2. Fatiamento por Bloco de Publicação (Publicado por)
+        blocos = re.split(r"Publicado por:", texto, flags=re.IGNORECASE)
+        
+        for bloco in blocos:
+            if not re.search(KEYWORDS_ANCORA, bloco.lower()): continue
+            if any(v in bloco.lower() for v in PALAVRAS_VETO): continue
+
+            # 3. Fatiamento Interno por Valor (Resolve múltiplos shows)
+            fatias = re.split(r"(?=R\$\s*[\(]?\s*[\d\.]+,\d{2})", bloco)
+            contexto_acumulado = ""
+            
+            for fatia in fatias:
+                texto_analise = (contexto_acumulado[-300:] + fatia)
+                contexto_acumulado = fatia
+                
+                # Extração de Artista
+                m_art = RE_ARTISTA.search(texto_analise)
+                if not m_art: continue
+                
+                nome = m_art.group(1).strip()
+                # Limpa lixo residual do nome
+                nome = re.split(r'\s+(?:CNPJ|CPF|LTDA|MEI|VALOR|OBJETO|\d{2}\.)', nome, flags=re.IGNORECASE)[0]
+                nome = re.sub(r'^(?:Artística|Musical|Show|Banda|Dupla)\s+', '', nome, flags=re.IGNORECASE).strip().title()
+                
+                if len(nome) < 3: continue
+
+                # Extração de Valor
+                valor = 0.0
+                m_val = RE_VALOR.search(texto_analise)
+                if m_val:
+                    try: valor = float(m_val.group(1).replace(".", "").replace(",", "."))
+                    except: pass
+                
+                if valor > 850000: continue
+
+                # Extração de Data
+                m_dt = RE_DATA.search(texto_analise)
+                data_ev = datetime.now() + timedelta(days=30)
+                data_estimada = True
+                if m_dt:
+                    try:
+                        data_ev = datetime.strptime(m_dt.group(1), "%d/%m/%Y")
+                        data_estimada = False
+                    except: pass
+
+                tipo = "Show Musical"
+                if "carnaval" in texto_analise.lower(): tipo = "Show Carnavalesco"
+                elif "aniversário" in texto_analise.lower(): tipo = "Aniversário de Cidade"
+
+                # 4. Deduplicação por maior valor
+                h = f"{nome}-{cidade_atual}"
+                if h not in hashes_vistos or valor > hashes_vistos[h].preco_base:
+                    hashes_vistos[h] = EventoSchema(
+                        id_unico=hashlib.md5(h.encode("utf-8")).hexdigest(),
+                        titulo=f"{tipo}: {nome}",
+                        data_evento=data_ev,
+                        cidade=cidade_atual,
+                        local=f"Município de {cidade_atual}",
+                        categoria=tipo,
+                        preco_base=valor,
+                        url_evento=pdf_url,
+                        fonte="AMM-MG (v11.7.0)",
+                        data_estimada=data_estimada
+                    )
+
+    return list(hashes_vistos.values())
@@ -0,0 +1,142 @@
+"""
+Padrão de Qualidade: Enriquecimento por Página de Detalhe (com cache).
+Motivo: As listagens só dão URL e um título deduzido do slug; data, preço, local e imagem
+reais estão na página de cada evento. Buscar todas a cada ciclo custaria o catálogo inteiro,
+então o resultado fica em cache por URL (tabela `enriquecimento`):
+    - URL nunca vista                  -> GET da página de detalhe
+    - listagem igual à da última busca -> usa o cache, sem rede
+    - listagem mudou                   -> GET condicional (If-None-Match / If-Modified-Since);
+                                          304 reaproveita o cache
+    - erro                             -> nova tentativa nos ciclos seguintes, até ENRIQUECIMENTO_TENTATIVAS
+O custo por ciclo acompanha os eventos novos/alterados, não o tamanho do catálogo.
+Roda antes do diff por hash: o evento já chega enriquecido e um ciclo sem novidade não grava nada.
+"""
+import asyncio
+import json
+from datetime import datetime
+from urllib.parse import urlsplit
+import httpx
+from sqlalchemy import text, bindparam
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.logger import log
+from app.core import metrics
+from app.schemas.evento import EventoSchema
+from app.services.extractors.dados_estruturados import detalhes_do_evento
+
+LOTE_SQL = 500  # URLs por SELECT ... IN (bem abaixo do limite de variáveis do SQLite)
+
+SQL_LER = text("""
+    SELECT url, hash_listagem, etag, last_modified, dados, status, tentativas
+    FROM enriquecimento WHERE url IN :urls
+""").bindparams(bindparam("urls", expanding=True))
+
+SQL_GRAVAR = text("""
+    INSERT INTO enriquecimento (url, hash_listagem, etag, last_modified, dados, status, tentativas, atualizado_em)
+    VALUES (:url, :hash_listagem, :etag, :last_modified, :dados, :status, :tentativas, CURRENT_TIMESTAMP)
+    ON CONFLICT(url) DO UPDATE SET
+        hash_listagem = excluded.hash_listagem, etag = excluded.etag, last_modified = excluded.last_modified,
+        dados = excluded.dados, status = excluded.status, tentativas = excluded.tentativas,
+        atualizado_em = CURRENT_TIMESTAMP
+""")
+
+async def ler_cache(session: AsyncSession, urls: list[str]) -> dict[str, dict]:
+    cache = {}
+    for i in range(0, len(urls), LOTE_SQL):
+        res = await session.execute(SQL_LER, {"urls": urls[i:i + LOTE_SQL]})
+        cache.update({row.url: dict(row._mapping) for row in res})
+    return cache
+
+async def gravar_cache(session: AsyncSession, linha: dict):
+    await session.execute(SQL_GRAVAR, {k: linha[k] for k in (
+        "url", "hash_listagem", "etag", "last_modified", "dados", "status", "tentativas")})
+
+def aplicar(ev: EventoSchema, dados: str | None) -> EventoSchema:
+    """Sobrepõe ao evento da listagem os campos que a página de detalhe informou."""
+    campos = json.loads(dados) if dados else {}
+    if not campos:
+        return ev
+    if "data_evento" in campos:
+        campos["data_evento"] = datetime.fromisoformat(campos["data_evento"])
+        campos["data_estimada"] = False
+    return ev.model_copy(update=campos)
+
+def _precisa_buscar(linha: dict | None, hash_listagem: str) -> bool:
+    if linha is None:
+        return True
+    if linha["hash_listagem"] != hash_listagem:
+        return True  # condicional: um 304 custa só o cabeçalho
+    return linha["status"] == "erro" and linha["tentativas"] < settings.ENRIQUECIMENTO_TENTATIVAS
+
+async def buscar_detalhe(client: httpx.AsyncClient, semaforos: dict, url: str, linha: dict | None, hash_listagem: str) -> tuple[dict, str]:
+    """GET (condicional quando há validadores) sob o limite do host. Devolve (linha nova do cache, desfecho)."""
+    anterior = linha or {"etag": None, "last_modified": None, "dados": None, "tentativas": 0}
+    headers = {}
+    if anterior["etag"]:
+        headers["If-None-Match"] = anterior["etag"]
+    if anterior["last_modified"]:
+        headers["If-Modified-Since"] = anterior["last_modified"]
+
+    host = urlsplit(url).hostname or ""
+    semaforo = semaforos.setdefault(host, asyncio.Semaphore(settings.ENRIQUECIMENTO_POR_HOST))
+    nova = {**anterior, "url": url, "hash_listagem": hash_listagem}
+    try:
+        async with semaforo:
+            resp = await client.get(url, headers=headers)
+    except httpx.HTTPError as e:
+        log.debug(f"[Enriquecimento] Erro de rede em {url}: {e.__class__.__name__}")
+        return {**nova, "status": "erro", "tentativas": anterior["tentativas"] + 1}, "erro"
+
+    if resp.status_code == 304 and linha is not None:
+        return {**nova, "status": linha["status"]}, "304"
+    if resp.status_code != 200:
+        return {**nova, "status": "erro", "tentativas": anterior["tentativas"] + 1}, "erro"
+
+    campos = await asyncio.to_thread(detalhes_do_evento, resp.text, url)
+    return {
+        **nova,
+        "etag": resp.headers.get("etag"),
+        "last_modified": resp.headers.get("last-modified"),
+        "dados": json.dumps(campos, ensure_ascii=False) if campos else None,
+        "status": "ok" if campos else "vazio",
+        "tentativas": 0,
+    }, "200"
+
+async def enriquecer(session: AsyncSession, scraper, eventos: list[EventoSchema]) -> list[EventoSchema]:
+    """Eventos da listagem com os campos da página de detalhe (do cache ou buscados agora)."""
+    fonte = scraper.__class__.__name__
+    # URL repetida no lote é página de listagem (não de detalhe): não há o que enriquecer
+    contagem = {}
+    for ev in eventos:
+        contagem[ev.url_evento] = contagem.get(ev.url_evento, 0) + 1
+    hashes = {ev.url_evento: ev.hash_conteudo() for ev in eventos if contagem[ev.url_evento] == 1}
+    cache = await ler_cache(session, list(hashes))
+
+    pendentes = [url for url, h in hashes.items() if _precisa_buscar(cache.get(url), h)]
+    adiados = max(len(pendentes) - settings.ENRIQUECIMENTO_MAX_POR_CICLO, 0)
+    pendentes = pendentes[:settings.ENRIQUECIMENTO_MAX_POR_CICLO]
+    desfechos = {"cache": len(hashes) - len(pendentes) - adiados}
+
+    if pendentes:
+        limites = httpx.Limits(max_connections=settings.ENRIQUECIMENTO_POR_HOST * 4)
+        async with scraper.criar_cliente(headers=scraper.get_headers(), follow_redirects=True,
+                                         timeout=20.0, limits=limites) as client:
+            semaforos = {}
+            resultados = await asyncio.gather(*(
+                buscar_detalhe(client, semaforos, url, cache.get(url), hashes[url]) for url in pendentes
+            ))
+        for linha, desfecho in resultados:
+            cache[linha["url"]] = linha
+            desfechos[desfecho] = desfechos.get(desfecho, 0) + 1
+            await gravar_cache(session, linha)
+        await session.commit()
+
+    for desfecho, total in desfechos.items():
+        metrics.enriquecimento.inc(total, fonte=fonte, resultado=desfecho)
+    if pendentes or adiados:
+        resumo = " | ".join(f"{k}: {v}" for k, v in desfechos.items())
+        log.info(f"🔎 {fonte}: enriquecimento de {len(pendentes)} páginas ({resumo}; {adiados} adiados)")
+
+    return [aplicar(ev, cache[ev.url_evento]["dados"]) if ev.url_evento in hashes and ev.url_evento in cache else ev
+            for ev in eventos]
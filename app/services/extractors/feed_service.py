@@ -0,0 +1,182 @@
+"""
+Padrão de Qualidade: Ingestão Incremental de Feeds (RSS 2.0 e Atom).
+Motivo: Feed é a fonte mais barata que temos, mas reler o documento inteiro a cada rodada não é.
+    - GET condicional (ETag / Last-Modified): feed sem novidade custa um 304
+    - parse em streaming (XMLPullParser alimentado pelos chunks da resposta): cada <item>/<entry>
+      é tratado e descartado assim que fecha, sem montar a árvore inteira
+    - cursor por feed na tabela `estado` (último GUID e data vistos): o download é interrompido
+      no primeiro item já conhecido. O cursor novo sai em `estado_pendente` junto com os eventos
+      e o manager só o grava no commit do lote da fonte: falha ao persistir não pula itens
+Uma fonte nova é só configuração: subclasse com URL/FONTE/PALAVRAS_CHAVE, ou uma entrada no
+registro com "config" (o registro cria a subclasse com o nome da fonte).
+"""
+import hashlib
+import xml.etree.ElementTree as ET
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+
+from app.schemas.evento import EventoSchema
+from app.services.arquivo import replay_atual
+from app.services.extractors.base import BaseExtractor
+from app.services.extractors.dados_estruturados import FUSO_BRASILIA
+from app.core.logger import log
+
+PREFIXO_ESTADO = "feed:"
+TAGS_ITEM = ("item", "entry")  # RSS 2.0 / Atom
+
+def _local(tag: str) -> str:
+    """Tag sem namespace: '{http://www.w3.org/2005/Atom}entry' -> 'entry'."""
+    return tag.rsplit("}", 1)[-1]
+
+def _data(texto: str | None) -> datetime | None:
+    """pubDate (RFC 822) do RSS ou published/updated (ISO 8601) do Atom, no horário de Brasília."""
+    if not texto:
+        return None
+    texto = texto.strip()
+    try:
+        data = parsedate_to_datetime(texto)
+    except (TypeError, ValueError):
+        try:
+            data = datetime.fromisoformat(texto)
+        except ValueError:
+            return None
+    if data.tzinfo is None:
+        data = data.replace(tzinfo=timezone.utc)
+    return data.astimezone(FUSO_BRASILIA).replace(tzinfo=None)
+
+def ler_item(elemento: ET.Element) -> dict:
+    """<item> (RSS) ou <entry> (Atom) -> {guid, titulo, link, publicado, resumo}."""
+    campos = {}
+    link = None
+    for filho in elemento:
+        nome = _local(filho.tag)
+        if nome == "link":
+            # Atom: <link rel="alternate" href=...>; RSS: <link>texto</link>
+            if filho.get("href") and filho.get("rel", "alternate") == "alternate":
+                link = link or filho.get("href")
+            elif filho.text:
+                link = link or filho.text.strip()
+        elif filho.text and nome not in campos:
+            campos[nome] = filho.text.strip()
+    return {
+        "guid": campos.get("guid") or campos.get("id") or link or "",
+        "titulo": " ".join((campos.get("title") or "").split()),
+        "link": link or campos.get("guid") or "",
+        "publicado": _data(campos.get("pubDate") or campos.get("published") or campos.get("updated")),
+        "resumo": campos.get("description") or campos.get("summary") or campos.get("content") or "",
+    }
+
+def ja_visto(item: dict, cursor: dict) -> bool:
+    """Primeiro item conhecido: mesmo GUID do cursor ou publicado antes dele (feed em ordem decrescente)."""
+    if cursor.get("guid") and item["guid"] == cursor["guid"]:
+        return True
+    visto_em = cursor.get("publicado")
+    return bool(visto_em and item["publicado"] and item["publicado"] < datetime.fromisoformat(visto_em))
+
+class FeedExtractor(BaseExtractor):
+    URL = ""
+    FONTE = ""
+    CIDADE_PADRAO = "Minas Gerais"
+    LOCAL_PADRAO = "Ver detalhes na matéria"
+    CATEGORIA_PADRAO = "Divulgação"
+    PALAVRAS_CHAVE = None  # tupla de termos (minúsculos) que o título precisa conter; None = todos
+    PREFIXO_TITULO = ""
+    MAX_ITENS = 200        # teto por rodada (primeira leitura de um feed grande)
+    HEADERS = None         # dict de cabeçalhos fixos; None usa get_headers()
+    HTTP2 = False
+    INCREMENTAL = True     # só devolve itens novos: o manager não trata os demais como "sumidos"
+
+    def chave_estado(self) -> str:
+        return PREFIXO_ESTADO + self.__class__.__name__
+
+    async def extract(self) -> list[EventoSchema]:
+        from app.core.database import AsyncSessionLocal
+        from app.services.estado import ler_estado
+
+        nome = self.__class__.__name__
+        self.estado_pendente = {}
+        # Na reextração o cursor (do presente) cortaria o feed arquivado, e o feed antigo o voltaria atrás
+        em_replay = replay_atual.get() is not None
+        cursor = {}
+        if not em_replay:
+            async with AsyncSessionLocal() as session:
+                cursor = await ler_estado(session, self.chave_estado(), {})
+
+        headers = dict(self.HEADERS or self.get_headers())
+        if cursor.get("etag"):
+            headers["If-None-Match"] = cursor["etag"]
+        if cursor.get("last_modified"):
+            headers["If-Modified-Since"] = cursor["last_modified"]
+
+        itens = []
+        try:
+            async with self.criar_cliente(timeout=30.0, headers=headers, follow_redirects=True, http2=self.HTTP2) as client:
+                # fetch e parse andam juntos (streaming): a etapa inteira fica em "fetch"
+                with self.etapa("fetch"):
+                    async with client.stream("GET", self.URL) as resp:
+                        if resp.status_code == 304:
+                            log.info(f"📰 {nome}: feed sem novidade (304).")
+                            return []
+                        if resp.status_code != 200:
+                            log.error(f"⚠️ {nome}: feed recusou ({resp.status_code}).")
+                            return []
+                        parser = ET.XMLPullParser(events=("end",))
+                        async for chunk in resp.aiter_bytes():
+                            if self._consumir(parser, chunk, cursor, itens):
+                                break  # item já conhecido: o resto do feed não é baixado
+                        validadores = {"etag": resp.headers.get("etag"), "last_modified": resp.headers.get("last-modified")}
+        except ET.ParseError as e:
+            log.error(f"❌ {nome}: XML inválido ({e}).")
+            return []
+        except Exception as e:
+            log.error(f"❌ Erro na comunicação com {nome}: {e}")
+            return []
+
+        # Cursor = item mais novo desta leitura (ou o anterior, se nada mudou)
+        novo_cursor = {**cursor, **validadores}
+        if itens:
+            mais_novo = itens[0]
+            novo_cursor["guid"] = mais_novo["guid"]
+            if mais_novo["publicado"]:
+                novo_cursor["publicado"] = mais_novo["publicado"].isoformat()
+        if not em_replay:
+            self.estado_pendente = {self.chave_estado(): novo_cursor}
+
+        eventos = [ev for ev in map(self.para_evento, itens) if ev is not None]
+        log.info(f"📰 {nome}: {len(itens)} itens novos no feed, {len(eventos)} viraram eventos.")
+        return eventos
+
+    def _consumir(self, parser: ET.XMLPullParser, chunk: bytes, cursor: dict, itens: list) -> bool:
+        """Alimenta o parser; True quando chegou a um item já visto ou ao teto MAX_ITENS."""
+        parser.feed(chunk)
+        for _, elemento in parser.read_events():
+            if _local(elemento.tag) not in TAGS_ITEM:
+                continue
+            item = ler_item(elemento)
+            elemento.clear()  # memória constante: o item já foi convertido
+            if ja_visto(item, cursor):
+                return True
+            itens.append(item)
+            if len(itens) >= self.MAX_ITENS:
+                return True
+        return False
+
+    def para_evento(self, item: dict) -> EventoSchema | None:
+        titulo = item["titulo"]
+        if not titulo or not item["link"]:
+            return None
+        if self.PALAVRAS_CHAVE and not any(p in titulo.lower() for p in self.PALAVRAS_CHAVE):
+            return None
+        return EventoSchema(
+            id_unico=hashlib.md5((item["guid"] or item["link"]).encode("utf-8")).hexdigest(),
+            titulo=f"{self.PREFIXO_TITULO}{titulo}"[:250],
+            # Matéria não traz a data do evento: a publicação é só um valor provisório
+            data_evento=item["publicado"] or datetime.now(),
+            cidade=self.CIDADE_PADRAO,
+            local=self.LOCAL_PADRAO,
+            categoria=self.CATEGORIA_PADRAO,
+            preco_base=0.0,
+            url_evento=item["link"],
+            fonte=self.FONTE or self.__class__.__name__,
+            data_estimada=True,
+        )
@@ -18,7 +18,7 @@ class OTempoExtractor(BaseExtractor):
         headers = {"User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"}
         
         try:
-            async with httpx.AsyncClient(timeout=30.0, headers=headers, follow_redirects=True) as client:
+            async with self.criar_cliente(timeout=30.0, headers=headers, follow_redirects=True) as client:
                 resp = await client.get(self.URL)
                 if resp.status_code != 200:
                     log.error(f"⚠️ O TEMPO recusou: {resp.status_code}")
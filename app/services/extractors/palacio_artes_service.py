@@ -19,43 +19,62 @@ def extrair_slug_da_url(url: str) -> str:
 
 class PalacioArtesExtractor(BaseExtractor):
     URL_ALVO = "https://fcs.mg.gov.br/programacao/"
+    ENRIQUECER = True  # a listagem só tem o link: data, preço e imagem vêm da página do espetáculo
+    # Índice do WordPress; só os sitemaps de programação/espetáculos interessam
+    SITEMAP = {
+        "urls": ["https://fcs.mg.gov.br/sitemap_index.xml"],
+        "filhos": r"programacao|espetaculo|evento",
+        "padrao": r"fcs\.mg\.gov\.br/(programacao|espetaculo|evento)s?/[^/?#]+/?$",
+        "fonte": "FCS (Palácio)",
+        "cidade": "Belo Horizonte",
+        "local": "Palácio das Artes",  # o mesmo da listagem: as duas vias geram o mesmo hash
+        "categoria": "Cultura",
+    }
 
     async def extract(self) -> list[EventoSchema]:
-        eventos_unicos = {}
         headers = {"User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64)"}
         try:
-            async with httpx.AsyncClient(timeout=25.0, headers=headers, follow_redirects=True) as client:
-                resp = await client.get(self.URL_ALVO)
-                tree = HTMLParser(resp.text)
-                
-                # Seletores mais amplos para o Palácio
-                contentores = tree.css("article, .elementor-post, .evento")
+            async with self.criar_cliente(timeout=25.0, headers=headers, follow_redirects=True) as client:
+                with self.etapa("fetch"):
+                    resp = await client.get(self.URL_ALVO)
+            with self.etapa("parse"):
+                return self.parsear(resp.text)
+        except Exception as e:
+            log.error(f"[Palácio] Erro Crítico: {e}")
+        return []
 
-                for card in contentores:
-                    a_node = card.css_first("a")
-                    if not a_node: continue
-                    href = a_node.attributes.get("href", "")
-                    if "fcs.mg.gov.br" not in href: continue
+    def parsear(self, html: str) -> list[EventoSchema]:
+        """Parsing puro (sem rede) da página de programação."""
+        eventos_unicos = {}
+        tree = HTMLParser(html)
+        
+        # Seletores mais amplos para o Palácio
+        contentores = tree.css("article, .elementor-post, .evento")
 
-                    # Define data fixa no futuro para não poluir "hoje" enquanto o scraper amadurece
-                    data_obj = datetime.now().replace(hour=19, minute=0, second=0)
-                    
-                    titulo = extrair_slug_da_url(href)
-                    uid = hashlib.md5(href.encode()).hexdigest()
+        for card in contentores:
+            a_node = card.css_first("a")
+            if not a_node: continue
+            href = a_node.attributes.get("href", "")
+            if "fcs.mg.gov.br" not in href: continue
 
-                    if uid not in eventos_unicos:
-                        # CORREÇÃO: preco_base e categoria agora inclusos para o Pydantic
-                        eventos_unicos[uid] = EventoSchema(
-                            id_unico=uid,
-                            titulo=titulo[:250],
-                            data_evento=data_obj,
-                            cidade="Belo Horizonte",
-                            local="Palácio das Artes",
-                            categoria="Cultura",
-                            preco_base=0.0,
-                            url_evento=href,
-                            fonte="FCS (Palácio)"
-                        )
-        except Exception as e:
-            log.error(f"[Palácio] Erro Crítico: {e}")
+            # Define data fixa no futuro para não poluir "hoje" enquanto o scraper amadurece
+            data_obj = datetime.now().replace(hour=19, minute=0, second=0)
+            
+            titulo = extrair_slug_da_url(href)
+            uid = hashlib.md5(href.encode()).hexdigest()
+
+            if uid not in eventos_unicos:
+                # CORREÇÃO: preco_base e categoria agora inclusos para o Pydantic
+                eventos_unicos[uid] = EventoSchema(
+                    id_unico=uid,
+                    titulo=titulo[:250],
+                    data_evento=data_obj,
+                    cidade="Belo Horizonte",
+                    local=self.SITEMAP["local"],
+                    categoria="Cultura",
+                    preco_base=0.0,
+                    url_evento=href,
+                    fonte="FCS (Palácio)",
+                    data_estimada=True
+                )
         return list(eventos_unicos.values())
@@ -7,41 +7,74 @@ from app.schemas.evento import EventoSchema
 from app.services.extractors.base import BaseExtractor
 from app.core.logger import log
 
+def data_do_card(dia: int, mes: int, hoje: datetime | None = None) -> datetime | None:
+    """dd/mm sem ano: o ano corrente, ou o próximo se a data já passou há mais de 30 dias."""
+    hoje = hoje or datetime.now()
+    try:
+        data = datetime(hoje.year, mes, dia, 19, 0)
+        if data < hoje - timedelta(days=30):
+            data = data.replace(year=hoje.year + 1)
+    except ValueError:  # 29/02 fora de ano bissexto, 31/04...
+        return None
+    return data
+
 class PortalBHExtractor(BaseExtractor):
     BASE_URL = "https://portalbelohorizonte.com.br"
+    ENRIQUECER = True  # listagem só tem título e dd/mm: horário, local e imagem vêm da página do evento
+    # A listagem /eventos só mostra a primeira página; o sitemap (Drupal) tem o catálogo inteiro
+    SITEMAP = {
+        "urls": ["https://portalbelohorizonte.com.br/sitemap.xml"],
+        "padrao": r"portalbelohorizonte\.com\.br/eventos/[^/?#]+$",
+        "fonte": "Portal BH",
+        "cidade": "Belo Horizonte",
+        "local": "Portal BH",  # o mesmo da listagem: as duas vias geram o mesmo hash
+        "categoria": "Cultura Institucional",
+    }
 
     async def extract(self) -> list[EventoSchema]:
-        eventos_unicos = {}
         headers = {"User-Agent": "Mozilla/5.0"}
-        async with httpx.AsyncClient(timeout=25.0, headers=headers) as client:
-            resp = await client.get(f"{self.BASE_URL}/eventos")
-            tree = HTMLParser(resp.text)
+        async with self.criar_cliente(timeout=25.0, headers=headers) as client:
+            with self.etapa("fetch"):
+                resp = await client.get(f"{self.BASE_URL}/eventos")
+        with self.etapa("parse"):
+            return self.parsear(resp.text)
+
+    def parsear(self, html: str) -> list[EventoSchema]:
+        """Parsing puro (sem rede) da listagem de eventos do portal."""
+        eventos_unicos = {}
+        tree = HTMLParser(html)
+        
+        for card in tree.css(".views-row, article"):
+            a_node = card.css_first("a[href*='/eventos/']")
+            if not a_node: continue
+            
+            titulo = a_node.text(strip=True)
+            url = self.BASE_URL + a_node.attributes.get("href", "")
+            
+            # --- TÉCNICA DE EXTRAÇÃO DE DATA ---
+            # Procura por padrões dd/mm ou classes de data
+            texto_card = card.text().lower()
+            data_obj = datetime.now() + timedelta(days=2) # Default: daqui a 2 dias (Evita 'Hoje')
+            data_estimada = True
             
-            for card in tree.css(".views-row, article"):
-                a_node = card.css_first("a[href*='/eventos/']")
-                if not a_node: continue
-                
-                titulo = a_node.text(strip=True)
-                url = self.BASE_URL + a_node.attributes.get("href", "")
-                
-                # --- TÉCNICA DE EXTRAÇÃO DE DATA ---
-                # Procura por padrões dd/mm ou classes de data
-                texto_card = card.text().lower()
-                data_obj = datetime.now() + timedelta(days=2) # Default: daqui a 2 dias (Evita 'Hoje')
-                
-                match = re.search(r'(\d{2})[/\-](\d{2})', texto_card)
-                if match:
-                    dia, mes = map(int, match.groups())
-                    data_obj = datetime(2026, mes, dia, 19, 0) # Força ano 2026
+            match = re.search(r'(\d{2})[/\-](\d{2})', texto_card)
+            data_card = data_do_card(*map(int, match.groups())) if match else None
+            if data_card:
+                data_obj = data_card
+                data_estimada = False
 
-                uid = hashlib.md5(url.encode()).hexdigest()
-                if uid not in eventos_unicos:
-                    eventos_unicos[uid] = EventoSchema(
-                        id_unico=uid,
-                        titulo=titulo,
-                        data_evento=data_obj,
-                        cidade="Belo Horizonte",
-                        local="Portal BH",
-                        fonte="Portal BH"
-                    )
-        return list(eventos_unicos.values())
+            uid = hashlib.md5(url.encode()).hexdigest()
+            if uid not in eventos_unicos:
+                eventos_unicos[uid] = EventoSchema(
+                    id_unico=uid,
+                    titulo=titulo,
+                    data_evento=data_obj,
+                    cidade="Belo Horizonte",
+                    local=self.SITEMAP["local"],
+                    categoria="Cultura Institucional",
+                    preco_base=0.0,
+                    url_evento=url,
+                    fonte="Portal BH",
+                    data_estimada=data_estimada
+                )
+        return list(eventos_unicos.values())
\ No newline at end of file
@@ -0,0 +1,82 @@
+"""
+Padrão de Qualidade: Registro Preguiçoso de Extratores.
+Motivo: Importar um extrator puxa httpx, selectolax e (no diário) pypdf/tqdm. O processo da API
+só precisa dos NOMES das fontes para agendar; a classe só é importada quando o job da fonte roda.
+Fontes novas entram pelo dicionário abaixo ou por entry points (grupo `mg_event_hub.extractors`,
+valor "modulo:Classe") sem mudar o custo de boot. Uma entrada com "config" vira uma subclasse
+do alvo com esse nome e esses atributos: dezenas de feeds saem do mesmo FeedExtractor.
+"""
+import importlib
+from app.core.config import settings
+from app.core.logger import log
+
+GRUPO_ENTRY_POINTS = "mg_event_hub.extractors"
+
+# nome -> {"alvo": "modulo:Classe", "config": {atributos de classe} (opcional),
+#          dicas opcionais de agenda em minutos: piso_min, teto_min, inicial_min}
+FONTES = {
+    "PortalBHExtractor": {"alvo": "app.services.extractors.portal_bh_service:PortalBHExtractor"},
+    "SymplaExtractor": {
+        "alvo": "app.services.extractors.sympla_service:SymplaExtractor",
+        "piso_min": 30,  # listagem muda várias vezes ao dia
+    },
+    "PalacioArtesExtractor": {
+        "alvo": "app.services.extractors.palacio_artes_service:PalacioArtesExtractor",
+        "teto_min": 10080,  # programação da temporada quase não muda: cede execuções às outras
+    },
+    "DiarioAMMExtractor": {
+        "alvo": "app.services.extractors.diario_amm_service:DiarioAMMExtractor",
+        "piso_min": 360,  # diário publica uma edição por dia; 3 buscas por rodada
+    },
+    "DiarioOficialExtractor": {
+        "alvo": "app.services.extractors.diario_oficial_service:DiarioOficialExtractor",
+        "piso_min": 720,  # PDF inteiro do diário: caro, e só muda uma vez por dia
+    },
+    "G1Extractor": {"alvo": "app.services.extractors.g1_service:G1Extractor", "piso_min": 30},
+    "OTempoExtractor": {"alvo": "app.services.extractors.otempo_service:OTempoExtractor"},
+    "HospedagemExtractor": {"alvo": "app.services.extractors.hospedagem_service:HospedagemExtractor"},
+}
+
+_registradas = None
+_classes = {}
+
+def fontes_registradas() -> dict[str, dict]:
+    """Fontes embutidas + entry points instalados (lidos uma vez; nada é importado aqui)."""
+    global _registradas
+    if _registradas is None:
+        _registradas = dict(FONTES)
+        try:
+            from importlib.metadata import entry_points
+            for ep in entry_points(group=GRUPO_ENTRY_POINTS):
+                _registradas.setdefault(ep.name, {"alvo": ep.value})
+        except Exception as e:
+            log.warning(f"⚠️ Falha ao ler entry points de extratores: {e}")
+    return _registradas
+
+def nomes_ativos() -> list[str]:
+    """Fontes ligadas em FONTES_ATIVAS, na ordem configurada (nomes desconhecidos são ignorados)."""
+    registradas = fontes_registradas()
+    ativos = []
+    for nome in settings.FONTES_ATIVAS:
+        if nome in registradas:
+            ativos.append(nome)
+        else:
+            log.warning(f"⚠️ Fonte '{nome}' em FONTES_ATIVAS não está registrada.")
+    return ativos
+
+def carregar_classe(nome: str):
+    """Importa a classe da fonte na primeira chamada."""
+    if nome not in _classes:
+        fonte = fontes_registradas().get(nome)
+        if fonte is None:
+            raise ValueError(f"Fonte desconhecida: {nome}")
+        modulo, _, classe = fonte["alvo"].partition(":")
+        alvo = getattr(importlib.import_module(modulo), classe)
+        if fonte.get("config"):
+            # Subclasse com o nome da fonte: travas, métricas e changelog continuam por nome de classe
+            alvo = type(nome, (alvo,), dict(fonte["config"]))
+        _classes[nome] = alvo
+    return _classes[nome]
+
+def criar_extrator(nome: str):
+    return carregar_classe(nome)()
@@ -0,0 +1,210 @@
+"""
+Padrão de Qualidade: Descoberta Incremental por Sitemap.
+Motivo: Reler as listagens acha só o que está nas primeiras páginas, e paga o catálogo inteiro
+a cada rodada. O sitemap do site lista TODAS as URLs de evento com `lastmod`:
+    - índices (<sitemapindex>) e sitemaps (<urlset>, também .xml.gz) lidos em streaming
+      (XMLPullParser por chunk, elementos descartados assim que lidos)
+    - sitemap filho com o mesmo lastmod da última leitura nem é baixado
+    - índice por URL na tabela `sitemap_urls` (lastmod publicado x lastmod já extraído):
+      só URLs novas ou modificadas seguem para a página de detalhe, as novas antes das que
+      falharam; falha repetida desiste após ENRIQUECIMENTO_TENTATIVAS (até o lastmod mudar)
+    - cada URL lembra o sitemap que a lista: o que some de um sitemap lido inteiro sai do índice
+      (e o manager passa a ver o evento como "sumido")
+    - a página de detalhe passa pelo mesmo fetch/cache do enriquecimento (uma busca por URL)
+Uma fonte liga a descoberta com o atributo SITEMAP (dict: urls, padrao, fonte, cidade, local,
+categoria; filhos opcional). O custo de cada ciclo acompanha o que mudou no site.
+"""
+import asyncio
+import hashlib
+import json
+import re
+import zlib
+import xml.etree.ElementTree as ET
+from datetime import datetime
+import httpx
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.logger import log
+from app.schemas.evento import EventoSchema
+from app.services.extractors import enriquecimento
+
+SQL_CONHECIDAS = text("SELECT url, tipo, lastmod, extraido_lastmod, sitemap FROM sitemap_urls WHERE fonte = :fonte")
+SQL_GRAVAR = text("""
+    INSERT INTO sitemap_urls (url, fonte, tipo, lastmod, extraido_lastmod, sitemap, visto_em)
+    VALUES (:url, :fonte, :tipo, :lastmod, :extraido_lastmod, :sitemap, CURRENT_TIMESTAMP)
+    ON CONFLICT(url) DO UPDATE SET
+        lastmod = excluded.lastmod, extraido_lastmod = excluded.extraido_lastmod, sitemap = excluded.sitemap,
+        visto_em = CURRENT_TIMESTAMP
+""")
+SQL_REMOVER = text("DELETE FROM sitemap_urls WHERE url = :url")
+
+def _local(tag: str) -> str:
+    return tag.rsplit("}", 1)[-1]
+
+async def ler_sitemap(client: httpx.AsyncClient, url: str):
+    """Gera (tipo, loc, lastmod) de um <urlset> ("evento") ou <sitemapindex> ("sitemap") em streaming."""
+    parser = ET.XMLPullParser(events=("end",))
+    async with client.stream("GET", url) as resp:
+        if resp.status_code != 200:
+            raise httpx.HTTPStatusError(f"sitemap {resp.status_code}", request=resp.request, response=resp)
+        descompressor = None
+        primeiro = True
+        async for chunk in resp.aiter_bytes():
+            if primeiro:
+                # .xml.gz servido como arquivo (sem Content-Encoding): o httpx entrega os bytes gzip
+                primeiro = False
+                if chunk[:2] == b"\x1f\x8b":
+                    descompressor = zlib.decompressobj(wbits=31)
+            parser.feed(descompressor.decompress(chunk) if descompressor else chunk)
+            for _, elemento in parser.read_events():
+                nome = _local(elemento.tag)
+                if nome not in ("url", "sitemap"):
+                    continue
+                campos = {_local(filho.tag): (filho.text or "").strip() for filho in elemento}
+                elemento.clear()
+                if campos.get("loc"):
+                    yield ("evento" if nome == "url" else "sitemap"), campos["loc"], campos.get("lastmod") or ""
+
+def evento_da_pagina(url: str, dados: str | None, config: dict) -> EventoSchema | None:
+    """Campos da página de detalhe (cache do enriquecimento) -> EventoSchema com o id de sempre: md5(url)."""
+    campos = json.loads(dados) if dados else {}
+    if not campos.get("titulo"):
+        return None
+    data = datetime.fromisoformat(campos["data_evento"]) if campos.get("data_evento") else None
+    cidade = campos.get("cidade") or config.get("cidade", "Belo Horizonte")
+    return EventoSchema(
+        id_unico=_id(url),
+        titulo=campos["titulo"],
+        data_evento=data or datetime.now(),
+        cidade=cidade,
+        local=campos.get("local") or config["local"],
+        descricao=campos.get("descricao", ""),
+        categoria=campos.get("categoria") or config.get("categoria", "Entretenimento"),
+        preco_base=campos.get("preco_base", 0.0),
+        url_evento=url,
+        imagem_url=campos.get("imagem_url", ""),
+        fonte=config["fonte"],
+        data_estimada=data is None,
+    )
+
+def _id(url: str) -> str:
+    return hashlib.md5(url.encode("utf-8")).hexdigest()
+
+async def descobrir(session: AsyncSession, scraper) -> tuple[list[EventoSchema], set[str]]:
+    """Lê os sitemaps da fonte, atualiza o índice e extrai só as URLs de evento novas/modificadas.
+    Devolve (eventos extraídos, ids de todas as URLs de evento do índice)."""
+    config = scraper.SITEMAP
+    fonte = scraper.__class__.__name__
+    padrao = re.compile(config["padrao"])
+    filhos = re.compile(config["filhos"]) if config.get("filhos") else None
+
+    res = await session.execute(SQL_CONHECIDAS, {"fonte": fonte})
+    conhecidas = {row.url: dict(row._mapping) for row in res}
+    alteradas = {}  # url -> linha a gravar
+    removidas = set()
+
+    def registrar(url: str, tipo: str, lastmod: str, extraido: str | None, sitemap: str | None):
+        linha = {"url": url, "fonte": fonte, "tipo": tipo, "lastmod": lastmod, "extraido_lastmod": extraido,
+                 "sitemap": sitemap}
+        conhecidas[url] = alteradas[url] = linha
+        removidas.discard(url)  # saiu de um sitemap e apareceu em outro
+
+    def remover(url_sitemap: str, vistas: set[str]):
+        """Sitemap lido inteiro: o que ele listava e não lista mais sai do índice (e, se era um
+        sitemap filho, as URLs dele junto)."""
+        fila_remocao = [url for url, linha in conhecidas.items() if linha["sitemap"] == url_sitemap and url not in vistas]
+        while fila_remocao:
+            url = fila_remocao.pop()
+            if conhecidas.pop(url, None) is None:
+                continue
+            alteradas.pop(url, None)
+            removidas.add(url)
+            fila_remocao.extend(u for u, linha in conhecidas.items() if linha["sitemap"] == url)
+
+    lidos = pulados = 0
+    async with scraper.criar_cliente(headers=scraper.get_headers(), follow_redirects=True, timeout=60.0) as client:
+        fila = list(config["urls"])
+        while fila:
+            url_sitemap = fila.pop()
+            filhos_lidos = []
+            vistas = set()
+            try:
+                async for tipo, loc, lastmod in ler_sitemap(client, url_sitemap):
+                    anterior = conhecidas.get(loc)
+                    if tipo == "sitemap":
+                        if filhos and not filhos.search(loc):
+                            continue
+                        vistas.add(loc)
+                        if anterior and lastmod and anterior["extraido_lastmod"] == lastmod:
+                            pulados += 1  # filho não mudou desde a última leitura completa
+                            if anterior["sitemap"] != url_sitemap:
+                                registrar(loc, "sitemap", anterior["lastmod"], anterior["extraido_lastmod"], url_sitemap)
+                            continue
+                        fila.append(loc)
+                        filhos_lidos.append((loc, lastmod))
+                    elif padrao.search(loc):
+                        vistas.add(loc)
+                        if anterior is None or anterior["lastmod"] != lastmod or anterior["sitemap"] != url_sitemap:
+                            registrar(loc, "evento", lastmod, anterior["extraido_lastmod"] if anterior else None, url_sitemap)
+                lidos += 1
+            except (httpx.HTTPError, ET.ParseError, zlib.error) as e:
+                log.warning(f"⚠️ {fonte}: sitemap {url_sitemap} ilegível ({e.__class__.__name__}).")
+                continue
+            # O lastmod do filho só é dado como "lido" quando o filho for lido inteiro (na volta da fila)
+            for loc, lastmod in filhos_lidos:
+                anterior = conhecidas.get(loc)
+                registrar(loc, "sitemap", lastmod, anterior["extraido_lastmod"] if anterior else None, url_sitemap)
+            if url_sitemap in conhecidas and conhecidas[url_sitemap]["tipo"] == "sitemap":
+                linha = conhecidas[url_sitemap]
+                registrar(url_sitemap, "sitemap", linha["lastmod"], linha["lastmod"], linha["sitemap"])
+            remover(url_sitemap, vistas)
+
+        candidatas = [
+            url for url, linha in conhecidas.items()
+            if linha["tipo"] == "evento" and linha["extraido_lastmod"] != (linha["lastmod"] or "")
+        ]
+        cache = await enriquecimento.ler_cache(session, candidatas)
+
+        def esgotada(url: str) -> bool:
+            # O lastmod faz o papel do hash da listagem: mudou, a URL ganha nova chance
+            linha = cache.get(url)
+            return (linha is not None and linha["status"] == "erro" and linha["hash_listagem"] == conhecidas[url]["lastmod"]
+                    and linha["tentativas"] >= settings.ENRIQUECIMENTO_TENTATIVAS)
+
+        pendentes = [url for url in candidatas if not esgotada(url)]
+        desistidas = len(candidatas) - len(pendentes)
+        pendentes.sort(key=lambda url: url in cache and cache[url]["status"] == "erro")  # novas antes das repetições
+        adiados = max(len(pendentes) - settings.DESCOBERTA_MAX_POR_CICLO, 0)
+        pendentes = pendentes[:settings.DESCOBERTA_MAX_POR_CICLO]
+
+        semaforos = {}
+        resultados = await asyncio.gather(*(
+            enriquecimento.buscar_detalhe(client, semaforos, url, cache.get(url), conhecidas[url]["lastmod"])
+            for url in pendentes
+        ))
+
+    eventos = []
+    for linha_cache, desfecho in resultados:
+        await enriquecimento.gravar_cache(session, linha_cache)
+        url = linha_cache["url"]
+        if desfecho == "erro":
+            continue  # fica pendente: tenta de novo no próximo ciclo
+        ev = evento_da_pagina(url, linha_cache["dados"], config)
+        if ev is not None:
+            eventos.append(ev)
+        linha = conhecidas[url]
+        registrar(url, "evento", linha["lastmod"], linha["lastmod"] or "", linha["sitemap"])
+
+    for linha in alteradas.values():
+        await session.execute(SQL_GRAVAR, linha)
+    for url in removidas:
+        await session.execute(SQL_REMOVER, {"url": url})
+    await session.commit()
+
+    log.info(
+        f"🗺️ {fonte}: {lidos} sitemaps lidos ({pulados} sem mudança) | {len(pendentes)} URLs novas/modificadas "
+        f"extraídas, {len(eventos)} eventos ({adiados} adiados, {desistidas} desistidas) | {len(removidas)} fora do sitemap"
+    )
+    return eventos, {_id(url) for url, linha in conhecidas.items() if linha["tipo"] == "evento"}
@@ -6,16 +6,24 @@ A estrutura Next.js do Sympla esconde os links dentro de blocos de scripts
 e JSONs internos, tornando o parsing de HTML (DOM) cego. A abordagem final
 descarta o HTMLParser e aplica Regex directamente no texto bruto da resposta 
 HTTP para capturar qualquer string que corresponda a uma URL de evento.
+Antes da regex, tenta os dados estruturados (JSON-LD / microdata / __NEXT_DATA__): quando a
+página os publica, vêm data, preço e local reais. A regex fica como fallback.
+Varre a listagem de cada cidade de CIDADES seguindo ?page=N, com as cidades em paralelo sob um
+limite de conexões por host; uma cidade para na primeira página que não traz id novo para ela
+(cada cidade tem o seu conjunto de vistos; a deduplicação entre cidades só acontece na junção).
 """
 import hashlib
 import httpx
 import asyncio
 import re
+import time
 from datetime import datetime
 
 from app.schemas.evento import EventoSchema
 from app.services.extractors.base import BaseExtractor
+from app.services.extractors.dados_estruturados import extrair_eventos
 from app.core.logger import log
+from app.core import metrics
 
 def extrair_slug(url: str) -> str:
     try:
@@ -29,58 +37,164 @@ def extrair_slug(url: str) -> str:
 
 class SymplaExtractor(BaseExtractor):
     URL_ALVO = "https://www.sympla.com.br/eventos/belo-horizonte-mg"
+    # Listagem por cidade, paginada com ?page=N (a mesma que o site usa no "carregar mais")
+    URL_LISTAGEM = "https://www.sympla.com.br/eventos/{cidade}"
+    # slug da listagem -> nome da cidade gravado no evento (quando a página não informa)
+    CIDADES = {
+        "belo-horizonte-mg": "Belo Horizonte",
+        "contagem-mg": "Contagem",
+        "betim-mg": "Betim",
+        "nova-lima-mg": "Nova Lima",
+        "uberlandia-mg": "Uberlândia",
+        "juiz-de-fora-mg": "Juiz de Fora",
+        "montes-claros-mg": "Montes Claros",
+        "uberaba-mg": "Uberaba",
+        "ipatinga-mg": "Ipatinga",
+        "governador-valadares-mg": "Governador Valadares",
+        "sete-lagoas-mg": "Sete Lagoas",
+        "divinopolis-mg": "Divinópolis",
+        "pocos-de-caldas-mg": "Poços de Caldas",
+        "ouro-preto-mg": "Ouro Preto",
+        "tiradentes-mg": "Tiradentes",
+    }
+    ENRIQUECER = True         # título do slug e data now(): a página do evento tem os dados reais
+    MAX_PAGINAS = 10          # por cidade; a varredura para antes se uma página não trouxer id novo
+    LIMITE_POR_HOST = 4       # requisições simultâneas ao sympla.com.br
+    FONTE = "Sympla (Regex Master)"  # rótulo mantido: é a mesma fonte, só o parser mudou
+    # Itens da busca no estado do Next.js (caminhos dentro de cada item da listagem)
+    CAMPOS_NEXT = {
+        "nome": "name",
+        "inicio": "start_date",
+        "url": "url",
+        "local": "location.name",
+        "cidade": "location.city",
+        "imagem": "images.original",
+    }
+
+    def __init__(self):
+        super().__init__()
+        # cidade -> {"eventos", "paginas", "segundos", "erro"} da última execução (eventos novos na própria cidade)
+        self.relatorio_cidades: dict[str, dict] = {}
 
     async def extract(self) -> list[EventoSchema]:
-        eventos_unicos = {}
         headers = {"User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"}
-        
+        vistos: dict[str, EventoSchema] = {}
+        self.relatorio_cidades = {}
+        por_cidade = []
+        limites = httpx.Limits(max_connections=self.LIMITE_POR_HOST, max_keepalive_connections=self.LIMITE_POR_HOST)
+
         try:
-            async with httpx.AsyncClient(timeout=30.0, headers=headers, follow_redirects=True) as client:
-                log.debug(f"[Sympla] GET Texto Bruto: {self.URL_ALVO}")
-                resp = await client.get(self.URL_ALVO)
-                
+            async with self.criar_cliente(timeout=30.0, headers=headers, follow_redirects=True, limits=limites) as client:
+                semaforo = asyncio.Semaphore(self.LIMITE_POR_HOST)
+                # Cidades em paralelo; dentro de cada cidade as páginas seguem em ordem (é a página
+                # anterior que decide se vale buscar a próxima)
+                por_cidade = await asyncio.gather(*(
+                    self._varrer_cidade(client, semaforo, slug, cidade)
+                    for slug, cidade in self.CIDADES.items()
+                ))
+        except Exception as e:
+            log.error(f"[Sympla] Falha na varredura das cidades: {e}")
+
+        # Junção na ordem de CIDADES (não na de chegada): evento listado em duas cidades fica com a primeira
+        for eventos_cidade in por_cidade:
+            for uid, ev in eventos_cidade.items():
+                vistos.setdefault(uid, ev)
+
+        for slug, r in sorted(self.relatorio_cidades.items(), key=lambda item: -item[1]["eventos"]):
+            falha = f" — interrompida: {r['erro']}" if r["erro"] else ""
+            log.info(f"[Sympla] {slug}: {r['eventos']} eventos novos em {r['paginas']} páginas ({r['segundos']:.1f}s){falha}")
+        return list(vistos.values())
+
+    async def _varrer_cidade(self, client, semaforo: asyncio.Semaphore, slug: str, cidade: str) -> dict[str, EventoSchema]:
+        """Segue ?page=N até acabar, estourar MAX_PAGINAS ou uma página só repetir ids já vistos nesta cidade."""
+        url = self.URL_LISTAGEM.format(cidade=slug)
+        vistos: dict[str, EventoSchema] = {}
+        inicio = time.perf_counter()
+        novos_cidade = paginas = 0
+        erro = None
+        try:
+            for pagina in range(1, self.MAX_PAGINAS + 1):
+                try:
+                    async with semaforo:
+                        with self.etapa("fetch"):
+                            resp = await client.get(url, params={"page": pagina} if pagina > 1 else None)
+                except httpx.HTTPError as e:
+                    log.warning(f"[Sympla] {slug} página {pagina}: erro de rede ({e.__class__.__name__}).")
+                    break
                 if resp.status_code != 200:
-                    log.error(f"[Sympla] Falha na rede: {resp.status_code}")
-                    return []
+                    if pagina == 1:
+                        log.error(f"[Sympla] Falha na rede em {slug}: {resp.status_code}")
+                    break
+                paginas += 1
 
-                texto_bruto = resp.text
-                
-                # Regex 1: Captura URLs completas (https://www.sympla.com.br/evento/nome/123)
-                padrao_absoluto = r'https://www\.sympla\.com\.br/evento/[a-zA-Z0-9\-]+/[0-9]+'
-                links_absolutos = re.findall(padrao_absoluto, texto_bruto)
-                
-                # Regex 2: Captura caminhos relativos ocultos no JSON ("/evento/nome/123")
-                padrao_relativo = r'"(/evento/[a-zA-Z0-9\-]+/[0-9]+)"'
-                links_relativos = re.findall(padrao_relativo, texto_bruto)
-                
-                # Unifica e normaliza tudo
-                todos_links = links_absolutos + [f"https://www.sympla.com.br{path}" for path in links_relativos]
-                links_unicos = list(set(todos_links))
-                
-                log.debug(f"[Sympla] Regex encontrou {len(links_unicos)} URLs de eventos.")
+                with self.etapa("parse"):
+                    eventos = self.parsear(resp.text, cidade)
+                novos = [ev for ev in eventos if ev.id_unico not in vistos]
+                for ev in novos:
+                    vistos[ev.id_unico] = ev
+                novos_cidade += len(novos)
+                if not novos:
+                    break  # página vazia ou só repetida: o resto da listagem não traz nada
+        except Exception as e:  # erro inesperado (parse etc.): encerra só esta cidade, com o que já coletou
+            erro = f"{e.__class__.__name__}: {e}"
+            log.error(f"[Sympla] {slug} página {pagina}: {erro}; mantidos {novos_cidade} eventos já coletados.")
+
+        segundos = time.perf_counter() - inicio
+        self.relatorio_cidades[slug] = {"eventos": novos_cidade, "paginas": paginas, "segundos": round(segundos, 3),
+                                        "erro": erro}
+        metrics.listagem_eventos.inc(novos_cidade, fonte=self.__class__.__name__, listagem=slug)
+        metrics.listagem_paginas.inc(paginas, fonte=self.__class__.__name__, listagem=slug)
+        metrics.listagem_duracao.observar(segundos, fonte=self.__class__.__name__, listagem=slug)
+        return vistos
+
+    def parsear(self, texto_bruto: str, cidade: str = "Belo Horizonte") -> list[EventoSchema]:
+        """Parsing puro (sem rede): dados estruturados da listagem ou, na falta deles, as regex."""
+        estruturados = extrair_eventos(
+            texto_bruto, self.FONTE, self.URL_ALVO, cidade, campos_next=self.CAMPOS_NEXT
+        )
+        if estruturados:
+            log.debug(f"[Sympla] {len(estruturados)} eventos via dados estruturados.")
+            return estruturados
+        return self.parsear_regex(texto_bruto, cidade)
+
+    def parsear_regex(self, texto_bruto: str, cidade: str = "Belo Horizonte") -> list[EventoSchema]:
+        """Fallback: aplica as regex sobre o payload bruto da listagem (título vem do slug)."""
+        eventos_unicos = {}
+
+        # Regex 1: Captura URLs completas (https://www.sympla.com.br/evento/nome/123)
+        padrao_absoluto = r'https://www\.sympla\.com\.br/evento/[a-zA-Z0-9\-]+/[0-9]+'
+        links_absolutos = re.findall(padrao_absoluto, texto_bruto)
+        
+        # Regex 2: Captura caminhos relativos ocultos no JSON ("/evento/nome/123")
+        padrao_relativo = r'"(/evento/[a-zA-Z0-9\-]+/[0-9]+)"'
+        links_relativos = re.findall(padrao_relativo, texto_bruto)
+        
+        # Unifica e normaliza tudo
+        todos_links = links_absolutos + [f"https://www.sympla.com.br{path}" for path in links_relativos]
+        links_unicos = list(set(todos_links))
+        
+        log.debug(f"[Sympla] Regex encontrou {len(links_unicos)} URLs de eventos.")
+        
+        for url_ev in links_unicos:
+            titulo = extrair_slug(url_ev)
+            
+            if len(titulo) < 5 or titulo.lower() == "evento":
+                continue
                 
-                for url_ev in links_unicos:
-                    titulo = extrair_slug(url_ev)
-                    
-                    if len(titulo) < 5 or titulo.lower() == "evento":
-                        continue
-                        
-                    uid = hashlib.md5(url_ev.encode('utf-8')).hexdigest()
-                    
-                    if uid not in eventos_unicos:
-                        eventos_unicos[uid] = EventoSchema(
-                            id_unico=uid,
-                            titulo=titulo[:250],
-                            data_evento=datetime.now(),
-                            cidade="Belo Horizonte",
-                            local="Belo Horizonte (Sympla)",
-                            categoria="Entretenimento",
-                            preco_base=0.0,
-                            url_evento=url_ev,
-                            fonte="Sympla (Regex Master)"
-                        )
-                        
-        except Exception as e:
-            log.error(f"[Sympla] Falha catastrófica no Regex: {e}")
+            uid = hashlib.md5(url_ev.encode('utf-8')).hexdigest()
+            
+            if uid not in eventos_unicos:
+                eventos_unicos[uid] = EventoSchema(
+                    id_unico=uid,
+                    titulo=titulo[:250],
+                    data_evento=datetime.now(),
+                    cidade=cidade,
+                    local=f"{cidade} (Sympla)",
+                    categoria="Entretenimento",
+                    preco_base=0.0,
+                    url_evento=url_ev,
+                    fonte=self.FONTE,
+                    data_estimada=True
+                )
             
-        return list(eventos_unicos.values())
+        return list(eventos_unicos.values())
\ No newline at end of file
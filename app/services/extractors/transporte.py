@@ -0,0 +1,93 @@
+"""
+Padrão de Qualidade: Instrumentação na camada de transporte HTTP.
+Motivo: Medir latência, bytes no fio e falhas por host em TODAS as requisições dos extratores,
+sem espalhar cronômetros pelo código de cada fonte. É também o ponto único onde as respostas
+são arquivadas (app/services/arquivo.py) e onde a reextração troca a rede pelo arquivo.
+"""
+import asyncio
+import time
+import httpx
+from app.core import metrics
+from app.core.config import settings
+from app.core.logger import log
+from app.services import arquivo
+
+class _StreamMedido(httpx.AsyncByteStream):
+    """Conta os bytes à medida que o corpo é consumido e fecha a medição quando o stream encerra."""
+    def __init__(self, stream: httpx.AsyncByteStream, host: str, status: int, inicio: float, arquivar=None):
+        self._stream = stream
+        self._host = host
+        self._status = str(status)
+        self._inicio = inicio
+        self._bytes = 0
+        self._arquivar = arquivar  # callable(corpo, truncado) ou None
+        self._partes = [] if arquivar else None
+        self._completo = False
+
+    async def __aiter__(self):
+        async for chunk in self._stream:
+            self._bytes += len(chunk)
+            if self._partes is not None:
+                self._partes.append(chunk)
+            yield chunk
+        self._completo = True
+
+    async def aclose(self):
+        await self._stream.aclose()
+        metrics.fetch_bytes.inc(self._bytes, host=self._host)
+        metrics.fetch_duracao.observar(time.perf_counter() - self._inicio, host=self._host, status=self._status)
+        if self._arquivar:
+            # Feed lido até o item conhecido fica "truncado": é exatamente o que o parser viu
+            await self._arquivar(b"".join(self._partes), not self._completo)
+            self._partes = None
+
+class TransporteInstrumentado(httpx.AsyncBaseTransport):
+    def __init__(self, interno: httpx.AsyncBaseTransport, fonte: str | None = None):
+        self._interno = interno
+        self._fonte = fonte
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        host = request.url.host
+        inicio = time.perf_counter()
+        try:
+            resposta = await self._interno.handle_async_request(request)
+        except Exception:
+            metrics.fetch_erros.inc(host=host)
+            raise
+        arquivar = None
+        if settings.ARQUIVO and request.method == "GET" and arquivo.replay_atual.get() is None:
+            arquivar = self._arquivador(str(request.url), resposta, arquivo.execucao_atual.get())
+        return httpx.Response(
+            status_code=resposta.status_code,
+            headers=resposta.headers,
+            stream=_StreamMedido(resposta.stream, host, resposta.status_code, inicio, arquivar),
+            extensions=resposta.extensions,
+        )
+
+    def _arquivador(self, url: str, resposta: httpx.Response, execucao: str | None):
+        async def arquivar(corpo: bytes, truncado: bool):
+            try:
+                await asyncio.to_thread(
+                    arquivo.arquivista().gravar, url, self._fonte, execucao, resposta.status_code,
+                    resposta.headers.multi_items(), corpo, truncado,
+                )
+            except Exception as e:
+                log.error(f"❌ Falha ao arquivar {url}: {e}")
+        return arquivar
+
+    async def aclose(self):
+        await self._interno.aclose()
+
+class TransporteReplay(httpx.AsyncBaseTransport):
+    """Responde do arquivo bruto (reextração): a última captura da URL até `limite`; sem rede."""
+    def __init__(self, limite: str):
+        self._limite = limite
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        achado = None
+        if request.method == "GET":
+            achado = await asyncio.to_thread(arquivo.arquivista().ler, str(request.url), self._limite)
+        if achado is None:
+            return httpx.Response(404, headers={"x-arquivo": "ausente"}, content=b"")
+        status, headers, corpo = achado
+        return httpx.Response(status, headers=headers, content=corpo)
@@ -0,0 +1,168 @@
+"""
+Padrão de Qualidade: Gazetteer de Municípios e Índice Espacial (R*Tree).
+Motivo: `cidade` é texto livre ("Belo Horizonte", "Interior MG", o que o RE_CIDADE pegou do
+diário...), então "eventos perto de mim" era impossível. Agora:
+    - app/data/municipios_mg.csv: os 853 municípios de MG com código IBGE e coordenadas da sede
+      (códigos do IBGE; coordenadas do GeoNames, CC BY 4.0), embarcado: nada de rede
+    - normalizador rápido texto -> código IBGE (sem acento/caixa/sufixo UF, com cache)
+    - `eventos.codigo_ibge` preenchido na persistência; R*Tree `municipios_geo` com o ponto de cada
+      município. A consulta é um range na R*Tree (bounding box do raio) que devolve os municípios
+      candidatos; a distância exata (haversine) é calculada só para eles, e os eventos vêm pelo
+      índice de `codigo_ibge`, do município mais perto ao mais longe, até o limite pedido.
+O R*Tree indexa municípios (id = código IBGE, estável) e não linhas de `eventos`: o rowid de
+`eventos` não é estável sob VACUUM (réplica e arquivo usam VACUUM), e hoje a posição de um evento
+é a sede do município.
+"""
+import csv
+import math
+import re
+import unicodedata
+from functools import lru_cache
+from typing import Optional
+
+from sqlalchemy import text, bindparam
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.logger import log
+
+CSV_MUNICIPIOS = settings.BASE_DIR / "app" / "data" / "municipios_mg.csv"
+RAIO_TERRA_KM = 6371.0
+KM_POR_GRAU = 111.32
+
+# Apelidos e grafias comuns nas fontes (chaves já normalizadas)
+APELIDOS = {"bh": 3106200, "beaga": 3106200, "sjdr": 3162500, "gv": 3127701, "moc": 3143302}
+# Texto que não é município (nível estadual/regional): não vira ponto no mapa
+NAO_MUNICIPIO = {"minas gerais", "mg", "interior mg", "interior", "estado", "online", "a definir"}
+RE_PREFIXOS = re.compile(r"^(prefeitura( municipal)? de|municipio de|camara municipal de|cidade de)\s+")
+RE_SUFIXO_UF = re.compile(r"[\s/,\-(]+mg\)?$")
+
+# Índice espacial: um ponto (caixa degenerada) por município, id = código IBGE
+SQL_CRIAR_GEO = text("CREATE VIRTUAL TABLE IF NOT EXISTS municipios_geo USING rtree(id, min_lat, max_lat, min_lon, max_lon)")
+SQL_SEMEAR = text("INSERT OR REPLACE INTO municipios (codigo_ibge, nome, latitude, longitude) VALUES (:codigo_ibge, :nome, :latitude, :longitude)")
+SQL_SEMEAR_GEO = text("INSERT OR REPLACE INTO municipios_geo VALUES (:codigo_ibge, :latitude, :latitude, :longitude, :longitude)")
+SQL_SEM_CODIGO = text("SELECT DISTINCT cidade FROM eventos WHERE codigo_ibge IS NULL")
+SQL_PREENCHER = text("UPDATE eventos SET codigo_ibge = :codigo WHERE codigo_ibge IS NULL AND cidade = :cidade")
+
+# Range na R*Tree (caixa do raio): no máximo os 853 pontos dos municípios
+SQL_NA_CAIXA = text("""
+    SELECT id, min_lat, min_lon FROM municipios_geo
+    WHERE min_lat >= :lat_min AND max_lat <= :lat_max AND min_lon >= :lon_min AND max_lon <= :lon_max
+""")
+# Eventos dos municípios já ordenados por distância, pelo índice de codigo_ibge
+SQL_EVENTOS_DOS_MUNICIPIOS = text("""
+    SELECT id_unico, titulo, data_evento, cidade, local, categoria, preco_base, url_evento, imagem_url, fonte, codigo_ibge
+    FROM eventos WHERE codigo_ibge IN :codigos ORDER BY data_evento
+""").bindparams(bindparam("codigos", expanding=True))
+LOTE_MUNICIPIOS = 50
+
+def _sem_acento(texto: str) -> str:
+    return unicodedata.normalize("NFKD", texto).encode("ascii", "ignore").decode("ascii")
+
+def chave(texto: str) -> str:
+    """'São João del-Rei / MG' -> 'sao joao del rei'."""
+    texto = _sem_acento(texto).lower().replace("-", " ").replace("'", " ")
+    texto = RE_SUFIXO_UF.sub("", " ".join(texto.split()))
+    return RE_PREFIXOS.sub("", texto).strip()
+
+@lru_cache(maxsize=1)
+def municipios() -> dict[int, dict]:
+    """codigo_ibge -> {nome, latitude, longitude} (lido do CSV uma vez)."""
+    with open(CSV_MUNICIPIOS, encoding="utf-8", newline="") as f:
+        return {
+            int(linha["codigo_ibge"]): {
+                "nome": linha["nome"], "latitude": float(linha["latitude"]), "longitude": float(linha["longitude"])
+            }
+            for linha in csv.DictReader(f)
+        }
+
+@lru_cache(maxsize=1)
+def _por_chave() -> dict[str, int]:
+    indice = {chave(m["nome"]): codigo for codigo, m in municipios().items()}
+    indice.update(APELIDOS)
+    return indice
+
+@lru_cache(maxsize=4096)
+def codigo_da_cidade(texto: Optional[str]) -> Optional[int]:
+    """Texto de cidade extraído -> código IBGE (None se não for um município de MG reconhecível)."""
+    if not texto:
+        return None
+    k = chave(texto)
+    if not k or k in NAO_MUNICIPIO:
+        return None
+    indice = _por_chave()
+    if k in indice:
+        return indice[k]
+    # RE_CIDADE do diário pega até 40 caracteres: "Itabirito Secretaria De Cultura"
+    palavras = k.split()
+    for n in range(min(len(palavras) - 1, 6), 0, -1):
+        codigo = indice.get(" ".join(palavras[:n]))
+        if codigo:
+            return codigo
+    return None
+
+def distancia_km(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    """Haversine."""
+    p1, p2 = math.radians(lat1), math.radians(lat2)
+    dp, dl = p2 - p1, math.radians(lon2 - lon1)
+    a = math.sin(dp / 2) ** 2 + math.cos(p1) * math.cos(p2) * math.sin(dl / 2) ** 2
+    return 2 * RAIO_TERRA_KM * math.asin(math.sqrt(a))
+
+def caixa(lat: float, lon: float, raio_km: float) -> dict:
+    """Bounding box que contém o círculo do raio (margem para a R*Tree guardar float32)."""
+    dlat = raio_km / KM_POR_GRAU + 1e-4
+    dlon = raio_km / (KM_POR_GRAU * max(math.cos(math.radians(lat)), 0.01)) + 1e-4
+    return {"lat_min": lat - dlat, "lat_max": lat + dlat, "lon_min": lon - dlon, "lon_max": lon + dlon}
+
+async def semear(session: AsyncSession):
+    """Carrega o gazetteer nas tabelas `municipios`/`municipios_geo` (se incompleto) e preenche
+    `codigo_ibge` dos eventos antigos. Idempotente; chamado no startup e junto com as migrations."""
+    await session.execute(SQL_CRIAR_GEO)
+    total = (await session.execute(text("SELECT COUNT(*) FROM municipios_geo"))).scalar()
+    if total < len(municipios()):
+        linhas = [{"codigo_ibge": c, **m} for c, m in municipios().items()]
+        await session.execute(SQL_SEMEAR, linhas)
+        await session.execute(SQL_SEMEAR_GEO, linhas)
+        log.info(f"🗺️ Gazetteer: {len(linhas)} municípios de MG carregados no índice espacial.")
+    colunas = {row[1] for row in await session.execute(text("PRAGMA table_info(eventos)"))}
+    cidades = (await session.execute(SQL_SEM_CODIGO)).scalars().all() if "codigo_ibge" in colunas else []
+    pares = [{"cidade": c, "codigo": codigo_da_cidade(c)} for c in cidades]
+    pares = [p for p in pares if p["codigo"]]
+    if pares:
+        await session.execute(SQL_PREENCHER, pares)
+    await session.commit()
+
+async def eventos_no_raio(session: AsyncSession, lat: float, lon: float, raio_km: float,
+                         limite: Optional[int] = None) -> list[dict]:
+    """Eventos a até `raio_km` do ponto, do mais perto ao mais longe (com `distancia_km`).
+    A distância é calculada por município (não por evento); os eventos são buscados em lotes de
+    municípios, do mais perto para o mais longe, até completar `limite`."""
+    res = await session.execute(SQL_NA_CAIXA, caixa(lat, lon, raio_km))
+    perto = []
+    for codigo, mun_lat, mun_lon in res:
+        distancia = distancia_km(lat, lon, mun_lat, mun_lon)
+        if distancia <= raio_km:
+            perto.append((distancia, codigo))
+    perto.sort()
+
+    eventos = []
+    for i in range(0, len(perto), LOTE_MUNICIPIOS):
+        lote = perto[i:i + LOTE_MUNICIPIOS]
+        distancias = {codigo: round(d, 1) for d, codigo in lote}
+        res = await session.execute(SQL_EVENTOS_DOS_MUNICIPIOS, {"codigos": list(distancias)})
+        linhas = [{**row._mapping, "distancia_km": distancias[row.codigo_ibge]} for row in res]
+        linhas.sort(key=lambda ev: ev["distancia_km"])  # estável: dentro do município, por data
+        eventos.extend(linhas)
+        if limite and len(eventos) >= limite:
+            return eventos[:limite]
+    return eventos
+
+async def eventos_mais_proximos(session: AsyncSession, lat: float, lon: float, n: int) -> list[dict]:
+    """Os `n` eventos mais próximos: raio dobrando a partir de RAIO_INICIAL até cobrir o estado.
+    Cada passo é um range na R*Tree; o primeiro raio com `n` eventos já garante os n mais perto."""
+    raio = settings.GEO_RAIO_INICIAL_KM
+    while True:
+        eventos = await eventos_no_raio(session, lat, lon, raio, limite=n)
+        if len(eventos) >= n or raio >= settings.GEO_RAIO_MAXIMO_KM:
+            return eventos[:n]
+        raio = min(raio * 2, settings.GEO_RAIO_MAXIMO_KM)
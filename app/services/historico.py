@@ -0,0 +1,144 @@
+"""
+Padrão de Qualidade: Particionamento Quente/Frio de `eventos`.
+Motivo: A tabela crescia para sempre e toda consulta varria/ordenava eventos que já passaram.
+Eventos mais velhos que o horizonte saem da tabela quente para bancos de arquivo mensais
+(`data/historico/eventos_AAAA_MM.db`, anexados com ATTACH um de cada vez):
+    - data real: arquivado HISTORICO_HORIZONTE_DIAS depois do evento
+    - data estimada (fonte sem data: o valor é o "agora" da primeira captura): só depois de
+      HISTORICO_HORIZONTE_ESTIMADA_DIAS, para não tirar da vitrine o que ainda está em cartaz
+    - cópia e remoção na mesma transação; o espaço liberado volta ao disco por incremental_vacuum
+    - no CDC a remoção aparece como 'A' (arquivado), não 'D': o evento continua existindo
+A tabela quente fica limitada ao horizonte: o custo das rotas não cresce com os anos de histórico.
+O arquivo só é lido quando pedido explicitamente (`incluir_arquivo=true` em /eventos/).
+"""
+import asyncio
+import re
+import sqlite3
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Optional
+
+from app.core.config import settings
+from app.core.logger import log
+from app.services import analiticos
+
+HISTORICO_DIR = settings.DATA_DIR / "historico"
+RE_PARTICAO = re.compile(r"^eventos_(\d{4})_(\d{2})\.db$")
+
+# Candidatos ao arquivo, por mês do evento ('2026_09')
+SQL_CANDIDATOS = """
+    SELECT strftime('%Y_%m', data_evento) AS mes, COUNT(*) AS total FROM main.eventos
+    WHERE (COALESCE(data_estimada, 0) = 0 AND data_evento < :limite)
+       OR (COALESCE(data_estimada, 0) = 1 AND data_evento < :limite_estimada)
+    GROUP BY mes ORDER BY mes
+"""
+FILTRO_MES = """
+    strftime('%Y_%m', data_evento) = :mes AND (
+        (COALESCE(data_estimada, 0) = 0 AND data_evento < :limite)
+        OR (COALESCE(data_estimada, 0) = 1 AND data_evento < :limite_estimada))
+"""
+
+_ultima_execucao = 0.0
+
+def _garantir_tabela(conn: sqlite3.Connection) -> list[str]:
+    """Cria/atualiza `arq.eventos` com as colunas da tabela quente. Devolve a lista de colunas."""
+    ddl = conn.execute("SELECT sql FROM main.sqlite_master WHERE type = 'table' AND name = 'eventos'").fetchone()[0]
+    conn.execute(re.sub(r"^CREATE TABLE\s+\"?eventos\"?", "CREATE TABLE IF NOT EXISTS arq.eventos", ddl))
+    conn.execute("CREATE INDEX IF NOT EXISTS arq.idx_arq_data ON eventos(data_evento)")
+    quentes = conn.execute("PRAGMA main.table_info(eventos)").fetchall()
+    frias = {c[1] for c in conn.execute("PRAGMA arq.table_info(eventos)")}
+    for _, nome, tipo, *_ in quentes:
+        if nome not in frias:  # coluna criada por migration depois que a partição nasceu
+            conn.execute(f"ALTER TABLE arq.eventos ADD COLUMN {nome} {tipo}")
+    return [c[1] for c in quentes]
+
+def _habilitar_incremental(conn: sqlite3.Connection):
+    """auto_vacuum=INCREMENTAL só vale depois de um VACUUM completo (uma única vez por banco)."""
+    if conn.execute("PRAGMA main.auto_vacuum").fetchone()[0] != 2:
+        inicio = time.perf_counter()
+        conn.execute("PRAGMA main.auto_vacuum = INCREMENTAL")
+        conn.execute("VACUUM")
+        log.info(f"🧹 auto_vacuum=INCREMENTAL habilitado no banco primário ({time.perf_counter() - inicio:.1f}s, uma vez só).")
+
+def arquivar_passados(db_path: Optional[Path] = None, agora: Optional[datetime] = None) -> dict:
+    """Move para as partições mensais os eventos além do horizonte. Devolve {mes: total}."""
+    db_path = db_path or settings.DB_PATH
+    agora = agora or datetime.now()
+    params = {
+        "limite": (agora - timedelta(days=settings.HISTORICO_HORIZONTE_DIAS)).isoformat(sep=" "),
+        "limite_estimada": (agora - timedelta(days=settings.HISTORICO_HORIZONTE_ESTIMADA_DIAS)).isoformat(sep=" "),
+    }
+    HISTORICO_DIR.mkdir(parents=True, exist_ok=True)
+    movidos = {}
+    conn = sqlite3.connect(db_path, timeout=30, isolation_level=None)  # transações explícitas abaixo
+    try:
+        _habilitar_incremental(conn)
+        for mes, total in conn.execute(SQL_CANDIDATOS, params).fetchall():
+            conn.execute("ATTACH DATABASE ? AS arq", (str(HISTORICO_DIR / f"eventos_{mes}.db"),))
+            try:
+                conn.execute("BEGIN IMMEDIATE")
+                colunas = ", ".join(_garantir_tabela(conn))
+                filtro = {**params, "mes": mes}
+                if settings.ANALITICOS:  # os agregados continuam contando o que sai da tabela quente
+                    analiticos.marcar_arquivados(conn, FILTRO_MES, filtro)
+                conn.execute(f"INSERT OR REPLACE INTO arq.eventos ({colunas}) SELECT {colunas} FROM main.eventos WHERE {FILTRO_MES}", filtro)
+                antes = conn.execute("SELECT COALESCE(MAX(seq), 0) FROM main.eventos_cdc").fetchone()[0]
+                conn.execute(f"DELETE FROM main.eventos WHERE {FILTRO_MES}", filtro)
+                # O trigger registrou 'D'; o evento só mudou de partição: vira 'A' para o feed não mandar apagar
+                conn.execute("UPDATE main.eventos_cdc SET operacao = 'A' WHERE seq > ? AND operacao = 'D' "
+                             "AND id_unico IN (SELECT id_unico FROM arq.eventos)", (antes,))
+                if conn.execute("SELECT 1 FROM main.eventos_cdc WHERE seq > ? AND operacao = 'D' LIMIT 1",
+                                (antes,)).fetchone():
+                    raise RuntimeError(f"Arquivo {mes}: remoção da tabela quente sem cópia na partição")
+                conn.execute("COMMIT")
+                movidos[mes] = total
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+            finally:
+                conn.execute("DETACH DATABASE arq")
+        if movidos:
+            livres = conn.execute("PRAGMA main.freelist_count").fetchone()[0]
+            # executescript roda o pragma até o fim; execute() daria um passo só (uma página por passo)
+            conn.executescript(f"PRAGMA main.incremental_vacuum({settings.HISTORICO_VACUUM_PAGINAS});")
+            log.info(f"🗃️ Arquivo: {sum(movidos.values())} eventos passados movidos ({movidos}); {livres} páginas livres devolvidas.")
+    finally:
+        conn.close()
+    return movidos
+
+async def arquivar_se_devido() -> dict:
+    """Chamado ao fim de cada ciclo; roda no máximo uma vez a cada HISTORICO_INTERVALO_H."""
+    global _ultima_execucao
+    if not settings.HISTORICO:
+        return {}
+    if _ultima_execucao and time.monotonic() - _ultima_execucao < settings.HISTORICO_INTERVALO_H * 3600:
+        return {}
+    _ultima_execucao = time.monotonic()
+    return await asyncio.to_thread(arquivar_passados)
+
+def particoes() -> list[Path]:
+    """Bancos de arquivo existentes, do mês mais antigo ao mais recente."""
+    if not HISTORICO_DIR.exists():
+        return []
+    return sorted(p for p in HISTORICO_DIR.iterdir() if RE_PARTICAO.match(p.name))
+
+def consultar_historico(cidade: Optional[str] = None, categoria: Optional[str] = None) -> list[dict]:
+    """Eventos arquivados com os mesmos filtros de /eventos/ (leitura direta das partições, só-leitura)."""
+    condicoes, params = [], {}
+    if cidade:
+        condicoes.append("cidade LIKE :cidade")
+        params["cidade"] = f"%{cidade}%"
+    if categoria:
+        condicoes.append("categoria = :categoria")
+        params["categoria"] = categoria
+    where = f"WHERE {' AND '.join(condicoes)}" if condicoes else ""
+    eventos = []
+    for particao in particoes():
+        conn = sqlite3.connect(f"file:{particao}?mode=ro", uri=True)
+        conn.row_factory = sqlite3.Row
+        try:
+            eventos.extend(dict(r) for r in conn.execute(f"SELECT * FROM eventos {where} ORDER BY data_evento", params))
+        finally:
+            conn.close()
+    return eventos
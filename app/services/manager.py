@@ -1,82 +1,383 @@
 import asyncio
+import json
+import time
+from datetime import datetime
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import text
-from app.core.logger import log
+from sqlalchemy import text, bindparam
+from app.core.config import settings
+from app.core.logger import log, amostrar, suprimidas
+from app.core import metrics, profiling
+from app.models import TRIGGERS_CDC
+from app.schemas.evento import EventoSchema
+from app.services.broadcaster import broadcaster
+from app.services.snapshot import publicar_snapshot, ler_manifest
+from app.services import replica, historico, geo, analiticos, colunar
+from app.services.extractors import registro
+from app.services import arquivo
 
-from app.services.extractors.portal_bh_service import PortalBHExtractor
-from app.services.extractors.sympla_service import SymplaExtractor
-from app.services.extractors.palacio_artes_service import PalacioArtesExtractor
-from app.services.extractors.diario_amm_service import DiarioAMMExtractor
+CHANGELOG_DIR = settings.DATA_DIR / "changelog"
+
+# Uma trava por fonte no processo: ciclo completo e jobs agendados nunca rodam a mesma fonte juntos
+_travas_fontes: dict[str, asyncio.Lock] = {}
+
+def trava_fonte(nome: str) -> asyncio.Lock:
+    if nome not in _travas_fontes:
+        _travas_fontes[nome] = asyncio.Lock()
+    return _travas_fontes[nome]
+
+# Réplica, snapshot, export colunar e arquivo escrevem nos mesmos caminhos: um pós-ciclo de cada vez
+_trava_pos_ciclo = asyncio.Lock()
+
+def criar_scrapers() -> list:
+    """Instancia (e só agora importa) os extratores de FONTES_ATIVAS, na ordem do ciclo completo."""
+    return [registro.criar_extrator(nome) for nome in registro.nomes_ativos()]
 
 class EventManager:
+    # Cada migration roda isolada: um ALTER já aplicado não pode bloquear os seguintes.
+    MIGRATIONS = [
+        "CREATE UNIQUE INDEX IF NOT EXISTS idx_eventos_id_unico ON eventos(id_unico)",
+        "ALTER TABLE eventos ADD COLUMN imagem_url VARCHAR(500)",
+        "ALTER TABLE eventos ADD COLUMN descricao TEXT",
+        "ALTER TABLE eventos ADD COLUMN categoria VARCHAR(100)",
+        "ALTER TABLE eventos ADD COLUMN hash_conteudo VARCHAR(40)",
+        "CREATE INDEX IF NOT EXISTS idx_eventos_fonte ON eventos(fonte)",
+        "ALTER TABLE eventos ADD COLUMN data_estimada BOOLEAN DEFAULT 0",
+        "CREATE INDEX IF NOT EXISTS idx_eventos_data ON eventos(data_evento)",
+        "ALTER TABLE eventos ADD COLUMN codigo_ibge INTEGER",
+        "CREATE INDEX IF NOT EXISTS ix_eventos_codigo_ibge ON eventos(codigo_ibge)",
+        "ALTER TABLE sitemap_urls ADD COLUMN sitemap VARCHAR(500)",
+        # CDC: toda escrita em eventos gera uma linha sequencial em eventos_cdc
+        *TRIGGERS_CDC,
+    ]
+
+    # Linhas de antes da coluna data_estimada: a data "agora" da captura (datetime.now(), com fração
+    # de segundo; data lida da página nunca tem) das fontes que não informam data. Roda uma vez por banco.
+    CHAVE_BACKFILL_ESTIMADA = "migracao:data_estimada"
+    SQL_ESTIMADAS_ANTIGAS = text("""
+        SELECT id_unico, titulo, data_evento, cidade, local, descricao, categoria, preco_base,
+               url_evento, imagem_url, fonte
+        FROM eventos
+        WHERE COALESCE(data_estimada, 0) = 0 AND data_evento LIKE '%.%'
+          AND fonte IN ('FCS (Palácio)', 'Sympla (Regex Master)', 'Diário AMM')
+    """)
+    SQL_MARCAR_ESTIMADA = text("UPDATE eventos SET data_estimada = 1, hash_conteudo = :hash_conteudo "
+                               "WHERE id_unico = :id_unico")
+
+    SQL_INSERT = text("""
+        INSERT OR IGNORE INTO eventos
+        (id_unico, titulo, data_evento, cidade, local, descricao, categoria, preco_base, url_evento, imagem_url, fonte, hash_conteudo, data_estimada, codigo_ibge)
+        VALUES
+        (:id_unico, :titulo, :data_evento, :cidade, :local, :descricao, :categoria, :preco_base, :url_evento, :imagem_url, :fonte, :hash_conteudo, :data_estimada, :codigo_ibge)
+    """)
+
+    SQL_UPDATE = text("""
+        UPDATE eventos SET
+            titulo = :titulo, data_evento = :data_evento, cidade = :cidade, local = :local,
+            descricao = :descricao, categoria = :categoria, preco_base = :preco_base,
+            url_evento = :url_evento, imagem_url = :imagem_url, fonte = :fonte, hash_conteudo = :hash_conteudo,
+            data_estimada = :data_estimada, codigo_ibge = :codigo_ibge
+        WHERE id_unico = :id_unico
+    """)
+
+    SQL_HASHES = text("SELECT id_unico, hash_conteudo FROM eventos WHERE fonte IN :fontes").bindparams(
+        bindparam("fontes", expanding=True)
+    )
+
     def __init__(self, session: AsyncSession):
         self.session = session
-        self.scrapers = [
-            PortalBHExtractor(),
-            SymplaExtractor(),
-            PalacioArtesExtractor(),
-            DiarioAMMExtractor()
-        ]
+        self._scrapers = None  # importados sob demanda: run_fonte só carrega a fonte pedida
+        self.changelog = {}
+        self.publicar_snapshot = settings.SNAPSHOT_AUTOMATICO
+
+    @property
+    def scrapers(self) -> list:
+        if self._scrapers is None:
+            self._scrapers = criar_scrapers()
+        return self._scrapers
+
+    @scrapers.setter
+    def scrapers(self, valor: list):
+        self._scrapers = valor
 
     async def _aplicar_migrations(self):
+        for ddl in self.MIGRATIONS:
+            try:
+                await self.session.execute(text(ddl))
+                await self.session.commit()
+            except Exception:
+                await self.session.rollback()
+        try:
+            await self._backfill_data_estimada()
+        except Exception as e:
+            log.error(f"❌ Falha no backfill de data_estimada: {e}")
+            await self.session.rollback()
         try:
-            await self.session.execute(text("CREATE UNIQUE INDEX IF NOT EXISTS idx_eventos_id_unico ON eventos(id_unico)"))
-            await self.session.execute(text("ALTER TABLE eventos ADD COLUMN imagem_url VARCHAR(500)"))
-            await self.session.execute(text("ALTER TABLE eventos ADD COLUMN descricao TEXT"))
-            await self.session.execute(text("ALTER TABLE eventos ADD COLUMN categoria VARCHAR(100)"))
-            await self.session.commit()
-        except Exception:
+            await geo.semear(self.session)
+        except Exception as e:
+            log.error(f"❌ Falha ao carregar o gazetteer de municípios: {e}")
             await self.session.rollback()
 
-    async def run_all_scrapers(self):
-        log.info(f"🚀 Iniciando orquestrador v4.0 com {len(self.scrapers)} fontes...")
-        await self._aplicar_migrations()
-        todos_eventos = []
-        relatorio = {}
+    async def _backfill_data_estimada(self):
+        """Marca data_estimada nas linhas antigas e recalcula o hash sem a data: o hash gravado
+        antes incluía data_evento e faria o próximo ciclo regravar (e mandar ao CDC) cada uma delas."""
+        from app.services.estado import ler_estado, gravar_estado
+        if await ler_estado(self.session, self.CHAVE_BACKFILL_ESTIMADA, False):
+            return
+        marcadas = []
+        for row in await self.session.execute(self.SQL_ESTIMADAS_ANTIGAS):
+            try:
+                hash_novo = EventoSchema(**row._mapping, data_estimada=True).hash_conteudo()
+            except ValueError:
+                hash_novo = None  # linha que o schema não aceita: o próximo ciclo regrava uma vez
+            marcadas.append({"id_unico": row.id_unico, "hash_conteudo": hash_novo})
+        if marcadas:
+            await self.session.execute(self.SQL_MARCAR_ESTIMADA, marcadas)
+        await gravar_estado(self.session, self.CHAVE_BACKFILL_ESTIMADA, True, commit=False)
+        await self.session.commit()
+        if marcadas:
+            log.info(f"🗓️ data_estimada marcada em {len(marcadas)} eventos antigos (hash recalculado sem a data).")
+
+    async def _carregar_hashes(self, fontes: set[str]) -> dict[str, str]:
+        """Hashes já persistidos das fontes informadas: {id_unico: hash_conteudo}."""
+        res = await self.session.execute(self.SQL_HASHES, {"fontes": list(fontes)})
+        return {row.id_unico: row.hash_conteudo for row in res}
+
+    def _salvar_changelog(self, sufixo: str = ""):
+        """Grava o diff do ciclo em formato compacto (um arquivo por execução)."""
+        try:
+            CHANGELOG_DIR.mkdir(parents=True, exist_ok=True)
+            caminho = CHANGELOG_DIR / f"ciclo_{datetime.now():%Y%m%d_%H%M%S}{'_' + sufixo if sufixo else ''}.json"
+            with open(caminho, "w", encoding="utf-8") as f:
+                json.dump(self.changelog, f, ensure_ascii=False, separators=(",", ":"))
+        except Exception as e:
+            log.error(f"❌ Falha ao gravar changelog: {e}")
+
+    async def _enriquecer(self, scraper, eventos: list) -> list:
+        """Página de detalhe dos eventos novos/alterados; falha aqui nunca derruba a listagem."""
+        from app.services.extractors import enriquecimento  # só o processo que extrai carrega httpx
+        try:
+            with metrics.medir_etapa(scraper.__class__.__name__, "enrich"):
+                return await enriquecimento.enriquecer(self.session, scraper, eventos)
+        except Exception as e:
+            log.error(f"❌ Falha no enriquecimento de {scraper.__class__.__name__}: {e}")
+            await self.session.rollback()
+            return eventos
+
+    async def _descobrir(self, scraper, eventos: list) -> tuple[list, set]:
+        """Soma à listagem os eventos novos/modificados do sitemap da fonte. Devolve (eventos, ids do índice)."""
+        from app.services.extractors import sitemap  # idem: só quando a fonte tem SITEMAP
+        nome = scraper.__class__.__name__
+        try:
+            with metrics.medir_etapa(nome, "discover"):
+                descobertos, no_indice = await sitemap.descobrir(self.session, scraper)
+        except Exception as e:
+            log.error(f"❌ Falha na descoberta por sitemap de {nome}: {e}")
+            await self.session.rollback()
+            return eventos, set()
+        # O mesmo id pela listagem e pelo sitemap: a página de detalhe é a versão mais completa
+        por_id = {ev.id_unico: ev for ev in eventos}
+        por_id.update((ev.id_unico, ev) for ev in descobertos)
+        return list(por_id.values()), no_indice
+
+    async def _gravar_estado_fonte(self, scraper, commit: bool = True):
+        """Estado que o extrator deixou pendente (cursor de feed...): só depois de a extração dar certo."""
+        from app.services.estado import gravar_estado
+        for chave, valor in getattr(scraper, "estado_pendente", {}).items():
+            await gravar_estado(self.session, chave, valor, commit=commit)
+        scraper.estado_pendente = {}
+
+    async def _persistir(self, nome: str, eventos: list, scraper=None) -> dict:
+        """Grava só o delta de uma fonte (comparando hashes de conteúdo) e devolve o que mudou.
+        O estado pendente do extrator entra no mesmo commit do lote."""
+        inicio_lote = time.perf_counter()
+        existentes = await self._carregar_hashes({ev.fonte for ev in eventos})
+        inseridos, atualizados = [], []
+        count_erros = 0
+        vistos = set()
+        publicar = []
 
-        sql = text("""
-            INSERT OR IGNORE INTO eventos 
-            (id_unico, titulo, data_evento, cidade, local, descricao, categoria, preco_base, url_evento, imagem_url, fonte)
-            VALUES 
-            (:id_unico, :titulo, :data_evento, :cidade, :local, :descricao, :categoria, :preco_base, :url_evento, :imagem_url, :fonte)
-        """)
+        for ev in eventos:
+            vistos.add(ev.id_unico)
+            hash_atual = ev.hash_conteudo()
+            hash_anterior = existentes.get(ev.id_unico)
+            if hash_anterior == hash_atual:
+                continue
 
-        for scraper in self.scrapers:
-            nome = scraper.__class__.__name__
+            params = {
+                **ev.model_dump(), "hash_conteudo": hash_atual, "data_estimada": ev.data_estimada,
+                "codigo_ibge": geo.codigo_da_cidade(ev.cidade),
+            }
+            try:
+                if ev.id_unico in existentes:
+                    await self.session.execute(self.SQL_UPDATE, params)
+                    atualizados.append(ev.id_unico)
+                    publicar.append(("atualizado", ev))
+                else:
+                    res = await self.session.execute(self.SQL_INSERT, params)
+                    if res.rowcount > 0:
+                        inseridos.append(ev.id_unico)
+                        publicar.append(("inserido", ev))
+            except Exception as e:
+                count_erros += 1
+                # Fonte ruim pode gerar milhares destes: amostrado por fonte, o resto vira contagem
+                if amostrar(f"erro_bd:{nome}"):
+                    log.debug(f"Erro BD ({ev.titulo}): {e}")
+
+        descartadas = suprimidas(f"erro_bd:{nome}")
+        if descartadas:
+            log.warning(f"⚠️ {nome}: {count_erros} erros de BD ({descartadas} linhas de log suprimidas pela amostragem).")
+
+        if scraper is not None:
+            await self._gravar_estado_fonte(scraper, commit=False)
+        await self.session.commit()
+        metrics.db_lote_duracao.observar(time.perf_counter() - inicio_lote, fonte=nome)
+        metrics.eventos_persistidos.inc(len(inseridos), fonte=nome, tipo="inserido")
+        metrics.eventos_persistidos.inc(len(atualizados), fonte=nome, tipo="atualizado")
+        metrics.eventos_falhas.inc(count_erros, fonte=nome)
+
+        # Push SSE só depois do commit: o cliente nunca vê um evento que ainda pode sofrer rollback
+        if broadcaster.total_assinantes:
+            for tipo, ev in publicar:
+                broadcaster.publicar(tipo, ev.model_dump(mode="json"))
+
+        return {
+            "inseridos": inseridos,
+            "atualizados": atualizados,
+            "sumidos": sorted(set(existentes) - vistos),
+            "erros": count_erros,
+        }
+
+    async def _pos_ciclo(self):
+        """Tarefas que dependem do banco já consolidado ao fim do ciclo."""
+        async with _trava_pos_ciclo:
+            houve_mudanca = any(c["inseridos"] or c["atualizados"] for c in self.changelog.values())
+            if settings.ANALITICOS:
+                try:
+                    if await asyncio.to_thread(analiticos.atualizar):
+                        houve_mudanca = True  # a réplica leva os agregados novos junto
+                except Exception as e:
+                    log.error(f"❌ Falha ao atualizar os agregados analíticos: {e}")
+            try:
+                # Antes da réplica e do snapshot: os dois já saem só com a tabela quente
+                if await historico.arquivar_se_devido():
+                    houve_mudanca = True
+            except Exception as e:
+                log.error(f"❌ Falha ao arquivar eventos passados: {e}")
+            try:
+                await colunar.exportar_se_ligado()
+            except Exception as e:
+                log.error(f"❌ Falha no export colunar: {e}")
+            origem = None  # banco lido pelo snapshot estático: a réplica nova, quando houver
+            if settings.LEITURA_REPLICA and (houve_mudanca or replica.caminho_atual() is None):
+                try:
+                    origem = await asyncio.to_thread(replica.publicar_replica)
+                except Exception as e:
+                    log.error(f"❌ Falha ao publicar réplica de leitura: {e}")
+            if self.publicar_snapshot and (houve_mudanca or ler_manifest() is None):
+                try:
+                    await asyncio.to_thread(publicar_snapshot, origem)
+                except Exception as e:
+                    log.error(f"❌ Falha ao publicar snapshot estático: {e}")
+
+    async def _executar_scraper(self, scraper) -> tuple[dict, list]:
+        """Extrai e persiste uma fonte sob a trava dela. Devolve (linha do relatório, eventos)."""
+        nome = scraper.__class__.__name__
+        trava = trava_fonte(nome)
+        if trava.locked():
+            log.warning(f"⏭️ {nome} já está em execução; pulando esta rodada.")
+            return {"capturados": 0, "persistidos": 0, "atualizados": 0, "erros": 0, "pulado": True}, []
+
+        async with trava:
+            execucao = arquivo.nova_execucao(nome)  # agrupa as respostas arquivadas deste ciclo da fonte
             try:
                 log.info(f"📡 Iniciando: {nome}")
-                eventos = await scraper.extract()
-                
+                with metrics.medir_etapa(nome, "extract"):
+                    eventos = await scraper.extract()
+                metrics.eventos_capturados.inc(len(eventos or []), fonte=nome)
+
+                eventos = eventos or []
+                if eventos and settings.ENRIQUECIMENTO and getattr(scraper, "ENRIQUECER", False):
+                    eventos = await self._enriquecer(scraper, eventos)
+                no_indice = set()
+                if settings.DESCOBERTA_SITEMAP and getattr(scraper, "SITEMAP", None):
+                    eventos, no_indice = await self._descobrir(scraper, eventos)
+
+                incremental = getattr(scraper, "INCREMENTAL", False)
                 if not eventos:
-                    relatorio[nome] = {"capturados": 0, "persistidos": 0, "erros": 0}
-                    log.warning(f"⚠️ {nome}: 0 eventos.")
-                    continue
-                
-                count_persistidos = 0
-                count_erros = 0
-                
-                for ev in eventos:
-                    try:
-                        res = await self.session.execute(sql, ev.model_dump())
-                        if res.rowcount > 0:
-                            count_persistidos += 1
-                    except Exception as e:
-                        count_erros += 1
-                        log.debug(f"Erro BD ({ev.titulo}): {e}")
-                
-                await self.session.commit()
-                relatorio[nome] = {"capturados": len(eventos), "persistidos": count_persistidos, "erros": count_erros}
-                
-                log.info(f"[Manager] {nome}: {len(eventos)} capturados | {count_persistidos} novos | {count_erros} erros")
-                todos_eventos.extend(eventos)
-                
+                    await self._gravar_estado_fonte(scraper)
+                    if incremental or no_indice:
+                        log.info(f"💤 {nome}: nada novo desde a última leitura.")
+                    else:
+                        log.warning(f"⚠️ {nome}: 0 eventos.")
+                    return {"capturados": 0, "persistidos": 0, "atualizados": 0, "erros": 0}, []
+
+                with metrics.medir_etapa(nome, "persist"):
+                    delta = await self._persistir(nome, eventos, scraper)
+                inseridos, atualizados, sumidos = delta["inseridos"], delta["atualizados"], delta["sumidos"]
+                if incremental:
+                    sumidos = []  # fonte incremental só entrega o que é novo: ausência não diz nada
+                elif no_indice:
+                    # Evento que segue no sitemap só não veio porque não mudou
+                    sumidos = [uid for uid in sumidos if uid not in no_indice]
+                count_erros = delta["erros"]
+
+                self.changelog[nome] = {"inseridos": inseridos, "atualizados": atualizados, "sumidos": sumidos}
+                log.info(
+                    f"[Manager] {nome}: {len(eventos)} capturados | {len(inseridos)} novos | "
+                    f"{len(atualizados)} alterados | {len(sumidos)} sumidos | {count_erros} erros"
+                )
+                return {
+                    "capturados": len(eventos), "persistidos": len(inseridos),
+                    "atualizados": len(atualizados), "erros": count_erros
+                }, eventos
+
             except Exception as e:
                 log.error(f"❌ Falha no motor {nome}: {e}")
                 await self.session.rollback()
+                return {"capturados": 0, "persistidos": 0, "atualizados": 0, "erros": 1, "falhou": True}, []
+            finally:
+                arquivo.execucao_atual.reset(execucao)
+
+    async def run_all_scrapers(self):
+        log.info(f"🚀 Iniciando orquestrador v4.0 com {len(self.scrapers)} fontes...")
+        await self._aplicar_migrations()
+        perfilando = profiling.iniciar("ciclo")
+        todos_eventos = []
+        relatorio = {}
+        self.changelog = {}
+
+        try:
+            for scraper in self.scrapers:
+                relatorio[scraper.__class__.__name__], eventos = await self._executar_scraper(scraper)
+                todos_eventos.extend(eventos)
 
-        total_cap = sum(r.get("capturados", 0) for r in relatorio.values())
-        total_pers = sum(r.get("persistidos", 0) for r in relatorio.values())
-        log.info(f"✨ CICLO COMPLETO: {total_cap} capturados | {total_pers} novos no banco")
+            total_cap = sum(r.get("capturados", 0) for r in relatorio.values())
+            total_pers = sum(r.get("persistidos", 0) for r in relatorio.values())
+            total_upd = sum(r.get("atualizados", 0) for r in relatorio.values())
+            self._salvar_changelog()
+            await self._pos_ciclo()
+        finally:
+            if perfilando:  # ciclo que falha (ou é cancelado) não deixa o amostrador preso ligado
+                profiling.finalizar()
+        log.info(f"✨ CICLO COMPLETO: {total_cap} capturados | {total_pers} novos | {total_upd} alterados no banco")
         return todos_eventos
 
+    async def run_fonte(self, nome: str) -> dict:
+        """Roda uma única fonte (usado pelos jobs por fonte do agendador). Devolve a linha do relatório."""
+        scraper = next((s for s in self._scrapers or [] if s.__class__.__name__ == nome), None)
+        if scraper is None:
+            scraper = registro.criar_extrator(nome)
+        await self._aplicar_migrations()
+        perfilando = profiling.iniciar(f"fonte_{nome}")
+        self.changelog = {}
+        try:
+            relatorio, _ = await self._executar_scraper(scraper)
+            if self.changelog:
+                self._salvar_changelog(sufixo=nome)
+            await self._pos_ciclo()
+        finally:
+            if perfilando:
+                profiling.finalizar()
+        return relatorio
+
 DataManager = EventManager
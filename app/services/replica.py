@@ -0,0 +1,80 @@
+"""
+Padrão de Qualidade: Réplica Somente-Leitura para a API.
+Motivo: Mesmo em WAL, ingestão e API dividiam o mesmo arquivo; checkpoints e transações longas
+do ciclo travavam leitores. Com LEITURA_REPLICA=1:
+    - a ingestão continua gravando só no banco primário (data/mg_events.db)
+    - ao fim de cada ciclo com mudança, a API de backup online do SQLite copia um snapshot
+      consistente, que é compactado (VACUUM), analisado (ANALYZE/optimize) e marcado só-leitura
+    - o ponteiro `data/leitura/atual` é trocado atomicamente por último; os engines de leitura
+      da API (app/core/database.py) passam a abrir o snapshot novo com immutable=1 e mmap
+    - snapshots antigos são removidos (os N mais recentes ficam para leitores em andamento)
+"""
+import os
+import sqlite3
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Optional
+
+from app.core.config import settings
+from app.core.logger import log
+
+LEITURA_DIR = settings.DATA_DIR / "leitura"
+PONTEIRO = LEITURA_DIR / "atual"
+PREFIXO = "eventos."
+
+def caminho_atual() -> Optional[Path]:
+    """Snapshot apontado agora (None se ainda não houve publicação ou o arquivo sumiu)."""
+    try:
+        nome = PONTEIRO.read_text(encoding="utf-8").strip()
+    except FileNotFoundError:
+        return None
+    caminho = LEITURA_DIR / nome
+    return caminho if nome and caminho.exists() else None
+
+def _limpar_antigos(manter: str):
+    """Mantém os N snapshots mais recentes (o atual sempre). No Linux, conexão aberta num arquivo
+    removido continua lendo normalmente até fechar."""
+    snapshots = sorted(LEITURA_DIR.glob(f"{PREFIXO}*.db"), key=lambda p: p.stat().st_mtime, reverse=True)
+    for antigo in snapshots[settings.LEITURA_MANTIDAS:]:
+        if antigo.name != manter:
+            antigo.unlink(missing_ok=True)
+    for tmp in [*LEITURA_DIR.glob(f".{PREFIXO}*.tmp"), *LEITURA_DIR.glob(".atual.*.tmp")]:
+        if time.time() - tmp.stat().st_mtime > 3600:  # sobra de publicação interrompida
+            tmp.unlink(missing_ok=True)
+
+def publicar_replica(db_path: Optional[Path] = None) -> Path:
+    """Backup online do primário -> snapshot otimizado e só-leitura -> troca do ponteiro."""
+    db_path = db_path or settings.DB_PATH
+    LEITURA_DIR.mkdir(parents=True, exist_ok=True)
+    inicio = time.perf_counter()
+    nome = f"{PREFIXO}{datetime.now():%Y%m%d-%H%M%S-%f}.db"
+    tmp = LEITURA_DIR / f".{nome}.tmp"
+
+    origem = sqlite3.connect(db_path, timeout=30)
+    destino = sqlite3.connect(tmp)
+    try:
+        # Uma passada só (pages=-1): um único snapshot de leitura consistente do primário
+        origem.backup(destino)
+        destino.execute("PRAGMA journal_mode=DELETE")  # a cópia herda o WAL do primário
+        destino.execute("VACUUM")
+        destino.execute("ANALYZE")
+        destino.execute("PRAGMA optimize")
+        destino.commit()
+    finally:
+        destino.close()
+        origem.close()
+
+    os.chmod(tmp, 0o444)
+    os.replace(tmp, LEITURA_DIR / nome)
+    fd, ponteiro_tmp = tempfile.mkstemp(prefix=".atual.", suffix=".tmp", dir=LEITURA_DIR)
+    with os.fdopen(fd, "w", encoding="utf-8") as f:
+        f.write(nome)
+    os.chmod(ponteiro_tmp, 0o644)  # mkstemp cria 0600; a API pode rodar com outro usuário
+    os.replace(ponteiro_tmp, PONTEIRO)  # por último: leitor nunca vê snapshot pela metade
+
+    _limpar_antigos(manter=nome)
+    tamanho = (LEITURA_DIR / nome).stat().st_size
+    log.info(f"📚 Réplica de leitura publicada: {nome} ({tamanho / 1024:.0f} KB em {time.perf_counter() - inicio:.2f}s)")
+    return LEITURA_DIR / nome
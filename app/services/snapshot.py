@@ -0,0 +1,150 @@
+"""
+Padrão de Qualidade: Snapshot Estático Pré-comprimido.
+Motivo: O dashboard baixa um JSON minificado já comprimido (br/gzip), com nome por hash de
+conteúdo e cache imutável; só o manifest (poucos bytes) é revalidado a cada visita.
+Publicação: JSON -> .gz/.br -> manifest.json trocado atomicamente por último.
+"""
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import zlib
+from datetime import datetime
+from pathlib import Path
+from typing import Optional
+
+from app.core.config import settings
+from app.core.logger import log
+from app.services.exportacao import iterar_eventos, gerar_json, gravar_atomico
+
+try:
+    import brotli
+except ImportError:
+    brotli = None  # Sem brotli publicamos só .json e .json.gz
+
+SNAPSHOT_DIR = settings.STATIC_DIR / "snapshots"
+MANIFEST = SNAPSHOT_DIR / "manifest.json"
+PREFIXO = "eventos."
+
+def _comprimir(origem: Path, destino: Path, compressor):
+    """Comprime `origem` em blocos para `destino` via arquivo temporário + os.replace."""
+    fd, tmp = tempfile.mkstemp(prefix=f".{destino.name}.", dir=destino.parent)
+    try:
+        with open(origem, "rb") as entrada, os.fdopen(fd, "wb") as saida:
+            while bloco := entrada.read(1 << 16):
+                saida.write(compressor.process(bloco))
+            saida.write(compressor.finish())
+        os.chmod(tmp, 0o664)
+        os.replace(tmp, destino)
+    except Exception:
+        if os.path.exists(tmp):
+            os.unlink(tmp)
+        raise
+
+class _Gzip:
+    """Adapta o gzip da stdlib à mesma interface process/finish do brotli.Compressor."""
+    def __init__(self):
+        self._obj = zlib.compressobj(9, zlib.DEFLATED, 31)
+
+    def process(self, bloco: bytes) -> bytes:
+        return self._obj.compress(bloco)
+
+    def finish(self) -> bytes:
+        return self._obj.flush()
+
+def _limpar_antigos(manter: str):
+    """Mantém os N snapshots mais recentes (o atual sempre) e remove o resto com suas variantes."""
+    snapshots = sorted(
+        (p for p in SNAPSHOT_DIR.glob(f"{PREFIXO}*.json")),
+        key=lambda p: p.stat().st_mtime,
+        reverse=True,
+    )
+    preservados = {manter} | {p.name for p in snapshots[:settings.SNAPSHOTS_MANTIDOS]}
+    for p in snapshots:
+        if p.name in preservados:
+            continue
+        for variante in (p, p.with_name(p.name + ".gz"), p.with_name(p.name + ".br")):
+            variante.unlink(missing_ok=True)
+
+def _atualizar_legado(arquivo: Path):
+    """`export_eventos.json` continua existindo para consumidores antigos: hard link do snapshot atual."""
+    legado = settings.STATIC_DIR / "export_eventos.json"
+    if legado.exists() and os.path.samefile(legado, arquivo):
+        return  # rename entre dois links do mesmo inode é no-op e deixaria o temporário para trás
+    # Nome único por publicação: os.link não sobrescreve, então só o nome é reservado com mkstemp
+    fd, tmp = tempfile.mkstemp(prefix=f".{legado.name}.", suffix=".link", dir=legado.parent)
+    os.close(fd)
+    os.unlink(tmp)
+    try:
+        os.link(arquivo, tmp)
+    except OSError:
+        shutil.copyfile(arquivo, tmp)
+    os.replace(tmp, legado)
+
+def ler_manifest() -> Optional[dict]:
+    try:
+        return json.loads(MANIFEST.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+
+def publicar_snapshot(db_path: Optional[Path] = None) -> dict:
+    """Gera o snapshot do dashboard. Se o conteúdo não mudou, reaproveita os arquivos já publicados."""
+    SNAPSHOT_DIR.mkdir(parents=True, exist_ok=True)
+    contador = {"total": 0}
+
+    def contar(eventos):
+        for ev in eventos:
+            contador["total"] += 1
+            yield ev
+
+    # 1. JSON minificado em arquivo temporário, calculando o hash enquanto grava
+    sha = hashlib.sha256()
+    fd, tmp = tempfile.mkstemp(prefix=".snapshot.", dir=SNAPSHOT_DIR)
+    try:
+        with os.fdopen(fd, "wb") as f:
+            for bloco in gerar_json(contar(iterar_eventos(db_path))):
+                sha.update(bloco)
+                f.write(bloco)
+        digest = sha.hexdigest()
+        arquivo = SNAPSHOT_DIR / f"{PREFIXO}{digest[:12]}.json"
+        if arquivo.exists():
+            os.unlink(tmp)
+        else:
+            os.chmod(tmp, 0o664)
+            os.replace(tmp, arquivo)
+    except Exception:
+        if os.path.exists(tmp):
+            os.unlink(tmp)
+        raise
+
+    # 2. Variantes pré-comprimidas (nível máximo: custo pago uma vez por ingestão, não por requisição)
+    variantes = {"identity": arquivo.stat().st_size}
+    gz = arquivo.with_name(arquivo.name + ".gz")
+    if not gz.exists():
+        _comprimir(arquivo, gz, _Gzip())
+    variantes["gzip"] = gz.stat().st_size
+    if brotli is not None:
+        br = arquivo.with_name(arquivo.name + ".br")
+        if not br.exists():
+            _comprimir(arquivo, br, brotli.Compressor(quality=11))
+        variantes["br"] = br.stat().st_size
+
+    # 3. Manifest por último: só aponta para arquivos completos
+    manifest = {
+        "arquivo": arquivo.name,
+        "url": f"/snapshots/{arquivo.name}",
+        "sha256": digest,
+        "total": contador["total"],
+        "variantes": variantes,
+        "gerado_em": datetime.now().isoformat(timespec="seconds"),
+    }
+    gravar_atomico(MANIFEST, [json.dumps(manifest, ensure_ascii=False).encode("utf-8")])
+    _atualizar_legado(arquivo)
+    _limpar_antigos(arquivo.name)
+
+    log.info(
+        f"🗜️ Snapshot {arquivo.name}: {contador['total']} eventos | "
+        + " | ".join(f"{k} {v / 1024:.1f} KB" for k, v in variantes.items())
+    )
+    return manifest
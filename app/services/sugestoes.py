@@ -0,0 +1,295 @@
+"""
+Padrão de Qualidade: Índice de Prefixos em Memória para Autocompletar.
+Motivo: `ilike('%...%')` varre a tabela a cada tecla. As sugestões saem de um índice em memória:
+    - termos: títulos, artistas do diário (o nome que o RE_ARTISTA extraiu, no título "Tipo: Nome"),
+      locais e cidades, cada um com popularidade (nº de eventos) e recência (data do evento)
+    - tokens normalizados (sem acento, minúsculos) num array ordenado; o prefixo digitado vira
+      um intervalo por bisect, sem varrer nada fora dele
+    - prefixos comuns ("s", "sh", "show") cobrem intervalos enormes: o top-k de todo prefixo com
+      mais de SUGESTOES_MAX_VARREDURA tokens é pré-calculado na montagem, e a consulta só reordena
+      essa lista curta; os demais intervalos são pequenos e varridos inteiros
+    - atualização incremental pelo CDC (`eventos_cdc`): cada consulta confere o `seq` (no máximo
+      a cada SUGESTOES_CHECAGEM_S) e aplica só o delta; termos novos vão para um array pequeno
+      à parte, fundido numa remontagem completa quando cresce demais
+    - a remontagem roda em segundo plano: as consultas seguem no índice atual (que continua
+      recebendo o delta) até o novo ficar pronto e ser trocado de uma vez
+"""
+import array
+import asyncio
+import bisect
+import heapq
+import math
+import re
+import sys
+import time
+import unicodedata
+from datetime import datetime
+from functools import lru_cache
+from typing import Optional
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.database import sessoes_leitura
+from app.core.logger import log
+from app.services import cdc, geo
+
+SQL_TERMOS = text("SELECT id_unico, titulo, local, cidade, data_evento FROM eventos")
+SQL_SEQ = text(cdc.SQL_SEQ_ATUAL)
+SQL_DELTA = text(cdc.SQL_MUDANCAS)
+
+# Títulos do diário: "Show Musical: Nome Do Artista" (app/services/extractors/diario_oficial_service.py)
+RE_TITULO_ARTISTA = re.compile(r"^(?:Show Musical|Show Carnavalesco|Aniversário de Cidade): (.+)$")
+# Locais genéricos que os extratores usam quando a fonte não informa: não ajudam a buscar
+LOCAIS_GENERICOS = {"ver detalhes na materia", "a definir", "portal bh", "diario oficial"}
+RE_NAO_ALFANUM = re.compile(r"[^a-z0-9]+")
+TOPO_PRE_CALCULADO = 100   # candidatos guardados por prefixo pesado (o k da rota vai até 50)
+
+@lru_cache(maxsize=65536)  # cidades e locais se repetem em milhares de eventos
+def normalizar(texto: str) -> str:
+    """'Chitãozinho & Xororó' -> 'chitaozinho xororo'."""
+    if not texto.isascii():
+        texto = unicodedata.normalize("NFKD", texto).encode("ascii", "ignore").decode("ascii")
+    return RE_NAO_ALFANUM.sub(" ", texto.lower()).strip()
+
+def termos_do_evento(titulo: str, local: Optional[str], cidade: Optional[str]) -> list[tuple[str, str]]:
+    """(tipo, texto) que um evento contribui para o índice."""
+    termos = [("evento", titulo)]
+    m = RE_TITULO_ARTISTA.match(titulo or "")
+    if m:
+        termos.append(("artista", m.group(1)))
+    if local and normalizar(local) not in LOCAIS_GENERICOS and not local.startswith("Município de"):
+        termos.append(("local", local))
+    if cidade and normalizar(cidade) not in geo.NAO_MUNICIPIO:
+        termos.append(("cidade", cidade))
+    return [(tipo, t.strip()) for tipo, t in termos if t and t.strip()]
+
+def _timestamp(data) -> float:
+    if isinstance(data, str):
+        try:
+            data = datetime.fromisoformat(data)
+        except ValueError:
+            return 0.0
+    return data.timestamp() if data else 0.0
+
+class IndicePrefixos:
+    def __init__(self):
+        # Termos em arrays paralelos (memória previsível com milhões de entradas)
+        self.textos: list[str] = []
+        self.normais: list[str] = []     # " " + texto normalizado: " palavra" in normal = palavra com o prefixo
+        self.tipos: list[str] = []
+        self.contagem = array.array("i")
+        self.ultima = array.array("d")   # timestamp da data de evento mais recente do termo
+        self._por_chave: dict[tuple[str, str], int] = {}
+        self._contrib: dict[str, tuple] = {}   # id_unico -> ids de termo (para desfazer no update/delete)
+        # Índice principal (imutável entre remontagens) + delta pequeno mantido ordenado com insort
+        self._tokens: list[str] = []
+        self._ids = array.array("I")
+        self._delta: list[tuple[str, int]] = []
+        self._topo: dict[str, array.array] = {}
+        self.seq = 0
+
+    def __len__(self) -> int:
+        return len(self._tokens) + len(self._delta)
+
+    def _termo(self, tipo: str, texto: str, novos: Optional[list]) -> int:
+        normal = normalizar(texto)
+        tid = self._por_chave.get((tipo, normal))
+        if tid is None:
+            tid = len(self.textos)
+            self._por_chave[(tipo, normal)] = tid
+            self.textos.append(texto)
+            self.normais.append(" " + normal)
+            self.tipos.append(sys.intern(tipo))
+            self.contagem.append(0)
+            self.ultima.append(0.0)
+            if novos is not None:
+                novos.append(tid)
+        return tid
+
+    def _adicionar_evento(self, id_unico: str, titulo, local, cidade, data_evento, novos: Optional[list] = None):
+        quando = _timestamp(data_evento)
+        ids = []
+        for tipo, texto in termos_do_evento(titulo, local, cidade):
+            tid = self._termo(tipo, texto, novos)
+            self.contagem[tid] += 1
+            if quando > self.ultima[tid]:
+                self.ultima[tid] = quando
+            ids.append(tid)
+        self._contrib[id_unico] = tuple(ids)
+
+    def _remover_evento(self, id_unico: str):
+        for tid in self._contrib.pop(id_unico, ()):
+            self.contagem[tid] -= 1  # termo com contagem 0 some das respostas até a remontagem
+
+    def _pontuar(self, tid: int, agora: float) -> float:
+        """Popularidade (log do nº de eventos) + recência (eventos perto de hoje pesam mais)."""
+        dias = abs(self.ultima[tid] - agora) / 86400
+        return math.log1p(self.contagem[tid]) + settings.SUGESTOES_PESO_RECENCIA * math.exp(-dias / 30)
+
+    def montar(self, linhas) -> "IndicePrefixos":
+        """Montagem completa a partir de (id_unico, titulo, local, cidade, data_evento)."""
+        inicio = time.perf_counter()
+        for id_unico, titulo, local, cidade, data_evento in linhas:
+            self._adicionar_evento(id_unico, titulo, local, cidade, data_evento)
+        # token -> termos (vocabulário bem menor que o nº de pares), expandido já em ordem
+        vocabulario: dict[str, list[int]] = {}
+        for tid, normal in enumerate(self.normais):
+            for tok in set(normal.split()):
+                vocabulario.setdefault(tok, []).append(tid)
+        for tok in sorted(vocabulario):
+            ids = vocabulario[tok]
+            self._tokens.extend([tok] * len(ids))
+            self._ids.extend(ids)
+        self._calcular_topo()
+        log.info(
+            f"🔤 Índice de sugestões: {len(self.textos)} termos, {len(self._tokens)} tokens, "
+            f"{len(self._topo)} prefixos pré-calculados em {time.perf_counter() - inicio:.2f}s"
+        )
+        return self
+
+    def _calcular_topo(self):
+        """Top-k pré-calculado de todo prefixo cujo intervalo passa de SUGESTOES_MAX_VARREDURA.
+        Desce do prefixo vazio letra a letra, só pelos intervalos pesados: o resto a consulta varre."""
+        agora = time.time()
+        estatico = array.array("d", (self._pontuar(t, agora) for t in range(len(self.textos))))
+        limite = settings.SUGESTOES_MAX_VARREDURA
+        self._topo = {}
+        pendentes = [("", 0, len(self._tokens))]
+        while pendentes:
+            prefixo, i, fim = pendentes.pop()
+            n = len(prefixo)
+            while i < fim:
+                if len(self._tokens[i]) == n:  # o próprio prefixo como token inteiro
+                    i = bisect.bisect_right(self._tokens, prefixo, i, fim)
+                    continue
+                filho = self._tokens[i][:n + 1]
+                fim_filho = bisect.bisect_left(self._tokens, filho + "\uffff", i, fim)
+                if fim_filho - i > limite:
+                    melhores = heapq.nlargest(2 * TOPO_PRE_CALCULADO, self._ids[i:fim_filho], key=estatico.__getitem__)
+                    self._topo[filho] = array.array("I", list(dict.fromkeys(melhores))[:TOPO_PRE_CALCULADO])
+                    pendentes.append((filho, i, fim_filho))
+                i = fim_filho
+
+    def aplicar(self, mudancas: list[dict]) -> int:
+        """Aplica o delta do CDC. Devolve quantos termos novos entraram no array de delta."""
+        novos = []
+        for m in mudancas:
+            self._remover_evento(m["id_unico"])
+            if m["operacao"] != "D" and m["titulo"] is not None:  # apagado (ou arquivado)
+                self._adicionar_evento(m["id_unico"], m["titulo"], m["local"], m["cidade"], m["data_evento"], novos)
+            self.seq = max(self.seq, m["seq"])
+        for tid in novos:
+            for tok in set(self.normais[tid].split()):
+                bisect.insort(self._delta, (tok, tid))
+        return len(novos)
+
+    def _intervalo(self, prefixo: str) -> tuple[int, int]:
+        ini = bisect.bisect_left(self._tokens, prefixo)
+        return ini, bisect.bisect_left(self._tokens, prefixo + "\uffff", ini)
+
+    def _candidatos(self, prefixo: str, ini: int, fim: int, completo: bool) -> list[int]:
+        """Termos com um token começando por `prefixo`. Intervalo pesado: o top pré-calculado,
+        ou (completo=True) uma varredura limitada a SUGESTOES_MAX_VARREDURA tokens."""
+        if fim - ini <= settings.SUGESTOES_MAX_VARREDURA:
+            ids = list(self._ids[ini:fim])
+        elif completo or prefixo not in self._topo:
+            ids = list(self._ids[ini:ini + settings.SUGESTOES_MAX_VARREDURA])
+        else:
+            ids = list(self._topo[prefixo])
+        d_ini = bisect.bisect_left(self._delta, (prefixo,))
+        d_fim = bisect.bisect_left(self._delta, (prefixo + "\uffff",), d_ini)
+        ids.extend(tid for _, tid in self._delta[d_ini:d_fim])
+        return ids
+
+    def buscar(self, consulta: str, k: int = 10, tipo: Optional[str] = None) -> list[dict]:
+        palavras = list(dict.fromkeys(normalizar(consulta).split()))
+        if not palavras:
+            return []
+        # A palavra de menor intervalo é a mais seletiva: vira os candidatos; as demais só filtram
+        intervalos = {p: self._intervalo(p) for p in palavras}
+        guia = min(palavras, key=lambda p: intervalos[p][1] - intervalos[p][0])
+        outras = [" " + p for p in palavras if p != guia]
+        agora = time.time()
+
+        def aceita(tid: int) -> bool:
+            if self.contagem[tid] <= 0 or (tipo and self.tipos[tid] != tipo):
+                return False
+            normal = self.normais[tid]
+            return all(p in normal for p in outras)
+
+        def melhores(completo: bool) -> list[int]:
+            validos = [tid for tid in set(self._candidatos(guia, *intervalos[guia], completo)) if aceita(tid)]
+            return heapq.nlargest(k, validos, key=lambda t: self._pontuar(t, agora))
+
+        escolhidos = melhores(completo=False)
+        if len(escolhidos) < k and (outras or tipo):
+            # O top pré-calculado do prefixo pode não ter termos com as outras palavras/tipo
+            escolhidos = melhores(completo=True) or escolhidos
+        return [{"texto": self.textos[t], "tipo": self.tipos[t], "eventos": self.contagem[t]} for t in escolhidos]
+
+_indice: Optional[IndicePrefixos] = None
+_checado_em = 0.0
+_trava = asyncio.Lock()
+_remontagem: Optional[asyncio.Task] = None
+
+async def _montar(session: AsyncSession) -> IndicePrefixos:
+    seq = (await session.execute(SQL_SEQ)).scalar_one()
+    linhas = (await session.execute(SQL_TERMOS)).all()
+    novo = await asyncio.to_thread(IndicePrefixos().montar, linhas)
+    novo.seq = seq
+    return novo
+
+async def _remontar():
+    """Monta um índice novo com sessão própria (fora da requisição) e troca pelo atual."""
+    global _indice
+    try:
+        fabrica = await sessoes_leitura()
+        async with fabrica() as session:
+            novo = await _montar(session)
+    except Exception as e:
+        log.error(f"❌ Falha ao montar o índice de sugestões: {e}")
+        return
+    async with _trava:  # nunca no meio de um delta sendo aplicado
+        _indice = novo  # o delta posterior ao seq dele vem na próxima checagem
+
+def _remontar_em_segundo_plano() -> asyncio.Task:
+    """Uma remontagem por vez; pedidos durante uma em curso aproveitam a mesma."""
+    global _remontagem
+    if _remontagem is None or _remontagem.done():
+        _remontagem = asyncio.create_task(_remontar())
+    return _remontagem
+
+async def atualizar(session: AsyncSession) -> IndicePrefixos:
+    """Índice em dia com o banco: monta na primeira chamada, depois aplica o delta do CDC.
+    Remontagens seguintes não bloqueiam: a consulta usa o índice atual enquanto o novo é montado."""
+    global _checado_em
+    if _indice is None:
+        # Sem índice anterior para servir: espera a montagem (shield: cancelar a requisição não a cancela)
+        await asyncio.shield(_remontar_em_segundo_plano())
+        if _indice is None:
+            raise RuntimeError("índice de sugestões indisponível")
+        return _indice
+    if time.monotonic() - _checado_em < settings.SUGESTOES_CHECAGEM_S:
+        return _indice
+    async with _trava:
+        indice = _indice
+        seq = (await session.execute(SQL_SEQ)).scalar_one()
+        if seq < indice.seq:
+            _remontar_em_segundo_plano()  # banco trocado/recriado: o cursor não vale mais
+        elif seq > indice.seq:
+            res = await session.execute(SQL_DELTA, {"desde": indice.seq, "limite": -1})
+            indice.aplicar([dict(r._mapping) for r in res])
+            if len(indice._delta) > max(settings.SUGESTOES_MAX_DELTA, len(indice._tokens) // 20):
+                _remontar_em_segundo_plano()  # funde o delta e descarta termos zerados
+        _checado_em = time.monotonic()
+    return _indice
+
+async def sugerir(session: AsyncSession, consulta: str, k: int = 10, tipo: Optional[str] = None) -> list[dict]:
+    indice = await atualizar(session)
+    return indice.buscar(consulta, k, tipo)
+
+async def aquecer():
+    """Monta o índice em segundo plano no startup: a primeira tecla não paga a montagem."""
+    await _remontar_em_segundo_plano()
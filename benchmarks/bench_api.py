@@ -0,0 +1,187 @@
+"""
+Padrão de Qualidade: Teste de Carga do Caminho de Leitura da API.
+Motivo: Medir vazão e percentis de latência de cada endpoint/forma de consulta com a massa do
+gerar_dataset.py, para provar (antes/depois) que índices e caches realmente ajudam.
+
+Dois modos:
+    --url http://127.0.0.1:8000   -> servidor de verdade (uvicorn), mede rede + app
+    --in-process --db <banco>     -> app ASGI no mesmo processo (httpx.ASGITransport), sem rede
+
+Cada cenário roda por `--duracao` segundos ou até `--requisicoes` respostas (o que vier antes),
+com `--concorrencia` clientes simultâneos. O corpo é lido em streaming e descartado.
+No modo in-process o ASGITransport do httpx entrega o corpo inteiro de uma vez: a coluna
+TTFB só tem significado no modo --url.
+
+Uso:
+    python benchmarks/gerar_dataset.py --linhas 1000000
+    python benchmarks/bench_api.py --in-process --db data/mg_events_bench.db --saida antes.json
+    ... (cria índice / cache) ...
+    python benchmarks/bench_api.py --in-process --db data/mg_events_bench.db --comparar antes.json
+"""
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+from pathlib import Path
+
+import httpx
+
+RAIZ = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(RAIZ))
+
+# nome -> caminho; {seq_recente} é resolvido no início via /eventos/changes
+CENARIOS = {
+    "lista_app": "/eventos",
+    "lista_router": "/eventos/",
+    "cidade_exata": "/eventos/?cidade=Belo Horizonte",
+    "cidade_parcial": "/eventos/?cidade=Ouro",
+    "categoria": "/eventos/?vibe=Show Musical",
+    "cidade_categoria": "/eventos/?cidade=Tiradentes&vibe=Teatro",
+    "changes_inicio": "/eventos/changes?since=0&limite=1000",
+    "changes_cauda": "/eventos/changes?since={seq_recente}&limite=1000",
+    "export_ndjson": "/eventos/export?formato=ndjson",
+    "export_json_gzip": "/eventos/export?formato=json&gzip=true",
+    "snapshot_manifest": "/snapshots/manifest.json",
+    "metrics": "/metrics",
+}
+
+def percentil(ordenados: list[float], p: float) -> float:
+    if not ordenados:
+        return 0.0
+    k = min(len(ordenados) - 1, max(0, round(p / 100 * (len(ordenados) - 1))))
+    return ordenados[k]
+
+async def executar_cenario(client: httpx.AsyncClient, caminho: str, concorrencia: int,
+                           duracao: float, maximo: int) -> dict:
+    latencias, ttfbs, status = [], [], {}
+    bytes_lidos = 0
+    erros = 0
+    prazo = time.perf_counter() + duracao
+    restantes = maximo
+
+    async def cliente():
+        nonlocal bytes_lidos, erros, restantes
+        while restantes > 0 and time.perf_counter() < prazo:
+            restantes -= 1
+            inicio = time.perf_counter()
+            try:
+                async with client.stream("GET", caminho) as resp:
+                    primeiro = None
+                    async for bloco in resp.aiter_raw():
+                        if primeiro is None:
+                            primeiro = time.perf_counter()
+                        bytes_lidos += len(bloco)
+                fim = time.perf_counter()
+                status[resp.status_code] = status.get(resp.status_code, 0) + 1
+                if resp.status_code >= 400:
+                    erros += 1
+                    continue
+                latencias.append(fim - inicio)
+                ttfbs.append((primeiro or fim) - inicio)
+            except httpx.HTTPError:
+                erros += 1
+
+    inicio = time.perf_counter()
+    await asyncio.gather(*(cliente() for _ in range(concorrencia)))
+    total = time.perf_counter() - inicio
+
+    latencias.sort()
+    ttfbs.sort()
+    return {
+        "caminho": caminho,
+        "ok": len(latencias),
+        "erros": erros,
+        "status": status,
+        "req_por_s": len(latencias) / total if total else 0.0,
+        "mb_por_s": bytes_lidos / 1024 / 1024 / total if total else 0.0,
+        "p50_ms": percentil(latencias, 50) * 1000,
+        "p90_ms": percentil(latencias, 90) * 1000,
+        "p99_ms": percentil(latencias, 99) * 1000,
+        "max_ms": (latencias[-1] if latencias else 0.0) * 1000,
+        "ttfb_p50_ms": percentil(ttfbs, 50) * 1000,
+        "bytes_por_req": bytes_lidos / max(len(latencias) + erros, 1),
+    }
+
+async def resolver_seq_recente(client: httpx.AsyncClient) -> int:
+    try:
+        resp = await client.get("/eventos/changes", params={"since": 0, "limite": 1})
+        return max(int(resp.json().get("seq_atual", 0)) - 1000, 0)
+    except Exception:
+        return 0
+
+def criar_cliente(args) -> httpx.AsyncClient:
+    timeout = httpx.Timeout(args.timeout)
+    limites = httpx.Limits(max_connections=args.concorrencia, max_keepalive_connections=args.concorrencia)
+    if not args.in_process:
+        return httpx.AsyncClient(base_url=args.url, timeout=timeout, limits=limites)
+
+    # O settings lê MG_DB_PATH na importação: precisa vir antes de importar o app
+    os.environ["MG_DB_PATH"] = str(Path(args.db).resolve())
+    os.environ["SNAPSHOT_AUTOMATICO"] = "0"
+    from app.core.logger import log
+    from app.main import app
+    log.remove()
+    log.add(sys.stderr, level="WARNING")
+    return httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench", timeout=timeout)
+
+async def executar(args) -> dict:
+    nomes = args.cenarios or list(CENARIOS)
+    resultados = {}
+    async with criar_cliente(args) as client:
+        seq_recente = await resolver_seq_recente(client)
+        print(f"{'cenário':<20}{'ok':>7}{'erros':>7}{'req/s':>9}{'p50 ms':>10}{'p90 ms':>10}"
+              f"{'p99 ms':>10}{'max ms':>10}{'ttfb p50':>10}{'KB/req':>10}")
+        for nome in nomes:
+            caminho = CENARIOS[nome].format(seq_recente=seq_recente)
+            # aquecimento: primeira consulta paga cache frio do SQLite/página do SO
+            try:
+                await client.get(caminho)
+            except httpx.HTTPError:
+                pass
+            r = await executar_cenario(client, caminho, args.concorrencia, args.duracao, args.requisicoes)
+            resultados[nome] = r
+            print(f"{nome:<20}{r['ok']:>7}{r['erros']:>7}{r['req_por_s']:>9.1f}{r['p50_ms']:>10.1f}"
+                  f"{r['p90_ms']:>10.1f}{r['p99_ms']:>10.1f}{r['max_ms']:>10.1f}{r['ttfb_p50_ms']:>10.1f}"
+                  f"{r['bytes_por_req'] / 1024:>10.1f}")
+    return resultados
+
+def comparar(atual: dict, anterior: dict):
+    print(f"\n{'cenário':<20}{'req/s antes':>13}{'req/s agora':>13}{'p50 antes':>11}{'p50 agora':>11}{'ganho p50':>11}")
+    for nome, r in atual.items():
+        ref = anterior.get(nome)
+        if not ref:
+            continue
+        ganho = ref["p50_ms"] / r["p50_ms"] if r["p50_ms"] else 0.0
+        print(f"{nome:<20}{ref['req_por_s']:>13.1f}{r['req_por_s']:>13.1f}{ref['p50_ms']:>11.1f}"
+              f"{r['p50_ms']:>11.1f}{ganho:>10.2f}x")
+
+def main():
+    parser = argparse.ArgumentParser(description="Teste de carga dos endpoints de leitura")
+    parser.add_argument("--url", default="http://127.0.0.1:8000", help="Base da API (modo servidor)")
+    parser.add_argument("--in-process", action="store_true", help="Roda o app ASGI no próprio processo")
+    parser.add_argument("--db", type=Path, default=RAIZ / "data" / "mg_events_bench.db", help="Banco usado no modo in-process")
+    parser.add_argument("--cenarios", nargs="*", choices=list(CENARIOS), help="Cenários a rodar (padrão: todos)")
+    parser.add_argument("--concorrencia", type=int, default=16)
+    parser.add_argument("--duracao", type=float, default=10.0, help="Segundos por cenário")
+    parser.add_argument("--requisicoes", type=int, default=1000, help="Teto de requisições por cenário")
+    parser.add_argument("--timeout", type=float, default=120.0)
+    parser.add_argument("--saida", type=Path, help="Grava os resultados em JSON")
+    parser.add_argument("--comparar", type=Path, help="JSON de uma execução anterior para comparar")
+    args = parser.parse_args()
+
+    if args.in_process and not args.db.exists():
+        raise SystemExit(f"❌ Banco {args.db} não existe. Gere com benchmarks/gerar_dataset.py")
+
+    anterior = json.loads(args.comparar.read_text(encoding="utf-8")) if args.comparar else None
+
+    resultados = asyncio.run(executar(args))
+    if args.saida:
+        args.saida.write_text(json.dumps(resultados, indent=2), encoding="utf-8")
+    if anterior:
+        comparar(resultados, anterior)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
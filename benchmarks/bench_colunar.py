@@ -0,0 +1,88 @@
+"""
+Padrão de Qualidade: Benchmark JSON x Parquet/Arrow para Cargas Analíticas.
+Motivo: O export colunar (app/services/colunar.py) existe para a carga dos analistas ser uma ordem
+de grandeza menor e mais rápida que reinterpretar o JSON. Este script copia um banco gerado pelo
+gerar_dataset.py para um diretório temporário (o data/ de produção não é tocado), gera os dois
+formatos e compara tamanho em disco e tempo de carga: completa, só as colunas de uma análise
+típica (no JSON não há como ler só parte) e de um mês (no Parquet, uma partição).
+
+Uso:
+    python benchmarks/gerar_dataset.py --linhas 1000000
+    python benchmarks/bench_colunar.py                        # usa data/mg_events_bench.db
+    python benchmarks/bench_colunar.py --db /tmp/mg_bench.db
+"""
+import argparse
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+RAIZ = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(RAIZ))
+
+COLUNAS_ANALISE = ["data_evento", "cidade", "categoria", "preco_base", "fonte"]
+
+def tamanho(caminho: Path) -> int:
+    if caminho.is_file():
+        return caminho.stat().st_size
+    return sum(p.stat().st_size for p in caminho.rglob("*.parquet"))
+
+def cronometrar(funcao) -> tuple[float, object]:
+    inicio = time.perf_counter()
+    resultado = funcao()
+    return time.perf_counter() - inicio, resultado
+
+def main():
+    parser = argparse.ArgumentParser(description="Compara a carga analítica em JSON e em Parquet.")
+    parser.add_argument("--db", type=Path, default=RAIZ / "data" / "mg_events_bench.db")
+    args = parser.parse_args()
+    if not args.db.exists():
+        print(f"❌ Banco não encontrado: {args.db} (gere com benchmarks/gerar_dataset.py)")
+        sys.exit(1)
+
+    with tempfile.TemporaryDirectory(prefix="bench_colunar_") as tmp:
+        db = Path(tmp) / "mg_events.db"
+        shutil.copy(args.db, db)
+        os.environ["MG_DB_PATH"] = str(db)  # antes de importar o app: data/colunar vai para o tmp
+        os.environ["ANALITICOS"] = "0"
+        from app.services import colunar
+        from app.services.exportacao import exportar_arquivo
+        import pyarrow.dataset as ds
+
+        json_path = Path(tmp) / "export_eventos.json"
+        t_json_export, _ = cronometrar(lambda: exportar_arquivo(json_path, formato="json", db_path=db))
+        t_parquet_export, _ = cronometrar(lambda: colunar.exportar(db))
+
+        def carregar_json():
+            with open(json_path, "rb") as f:
+                return json.load(f)
+
+        def carregar_parquet():
+            return ds.dataset(colunar.EVENTOS_DIR, format="parquet", partitioning=colunar._particionamento()).to_table()
+
+        t_json, dados = cronometrar(carregar_json)
+        t_parquet, tabela = cronometrar(carregar_parquet)
+        t_parquet_colunas, _ = cronometrar(lambda: ds.dataset(
+            colunar.EVENTOS_DIR, format="parquet", partitioning=colunar._particionamento()
+        ).to_table(columns=COLUNAS_ANALISE))
+        mes = tabela.column("mes")[0].as_py()
+        t_json_mes, _ = cronometrar(lambda: [e for e in carregar_json()["eventos"] if (e.get("data") or "").startswith(mes)])
+        t_parquet_mes, _ = cronometrar(lambda: ds.dataset(
+            colunar.EVENTOS_DIR, format="parquet", partitioning=colunar._particionamento()
+        ).to_table(filter=ds.field("mes") == mes))
+
+        print(f"{tabela.num_rows} eventos ({args.db.name})")
+        print(f"{'':10}{'tamanho':>10}{'export':>9}{'carga':>9}{'5 col.':>9}{'1 mês':>9}")
+        print(f"{'JSON':10}{tamanho(json_path) / 2**20:>8.1f}MB{t_json_export:>8.2f}s{t_json:>8.2f}s"
+              f"{t_json:>8.2f}s{t_json_mes:>8.2f}s")
+        print(f"{'Parquet':10}{tamanho(colunar.EVENTOS_DIR) / 2**20:>8.1f}MB{t_parquet_export:>8.2f}s"
+              f"{t_parquet:>8.2f}s{t_parquet_colunas:>8.2f}s{t_parquet_mes:>8.2f}s")
+        print(f"Parquet: {tamanho(json_path) / tamanho(colunar.EVENTOS_DIR):.1f}x menor | carga {t_json / t_parquet:.1f}x | "
+              f"5 colunas {t_json / t_parquet_colunas:.1f}x | 1 mês {t_json_mes / t_parquet_mes:.1f}x mais rápido")
+        del dados
+
+if __name__ == "__main__":
+    main()
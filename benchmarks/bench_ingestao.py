@@ -0,0 +1,256 @@
+"""
+Padrão de Qualidade: Benchmark de Ingestão Ponta a Ponta (sem internet).
+Motivo: Medir o `EventManager.run_all_scrapers` inteiro (fetch -> parse -> dedup -> persist)
+sem bater em Sympla, Portal BH, FCS e AMM. Um servidor HTTP local imita cada fonte com
+listagens sintéticas e o PDF do diário, com tamanho e latência configuráveis por fonte.
+
+Cada escala roda em um subprocesso próprio (banco temporário novo e pico de RSS isolado):
+    ciclo frio  -> banco vazio, tudo vira INSERT
+    ciclo quente -> mesmo conteúdo, o diff por hash não deve escrever nada
+
+Uso:
+    python benchmarks/bench_ingestao.py                          # escalas 1, 10, 100, 1000
+    python benchmarks/bench_ingestao.py --escalas 1 10 --latencia sympla=300 diario=800
+    python benchmarks/bench_ingestao.py --servidor --escalas 10   # só sobe o mock (Ctrl+C para sair)
+"""
+import argparse
+import json
+import os
+import resource
+import shutil
+import sqlite3
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+RAIZ = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(RAIZ))
+
+from benchmarks import cargas
+
+ESCALAS = (1, 10, 100, 1000)
+CARTOES_POR_ESCALA = 50   # itens por listagem na escala 1
+PAGINAS_POR_ESCALA = 4    # páginas do diário (PDF) na escala 1
+SYMPLA_PAGINAS = 3        # páginas com eventos por cidade do Sympla; a seguinte vem vazia (parada antecipada)
+
+# Latência simulada por fonte (ms), aplicada antes de cada resposta
+LATENCIAS_PADRAO = {"portal_bh": 80, "sympla": 150, "palacio": 60, "amm": 200, "diario": 300}
+
+class ServidorFontes:
+    """Mock HTTP de todas as fontes. Os corpos são gerados uma vez na subida (fora da medição)."""
+
+    def __init__(self, escala: int, latencias: dict):
+        from app.services.extractors.sympla_service import SymplaExtractor
+
+        cartoes = CARTOES_POR_ESCALA * escala
+        pdf = cargas.pdf_diario(cargas.paginas_diario(PAGINAS_POR_ESCALA * escala))
+        # caminho (com query, se houver) -> (fonte, content-type, corpo); o HTML do diário é montado após saber a porta
+        self.rotas = {
+            "/portalbh/eventos": ("portal_bh", "text/html", cargas.portal_bh(cartoes).encode()),
+            "/palacio/programacao/": ("palacio", "text/html", cargas.palacio(cartoes).encode()),
+            "/amm/pesquisar": ("amm", "text/html", cargas.diario_amm(cartoes).encode()),
+            "/amm-mg/diario.pdf": ("diario", "application/pdf", pdf),
+        }
+        # Sympla: cada cidade com SYMPLA_PAGINAS páginas de ids distintos e uma última vazia
+        por_pagina = max(cartoes // 10, 1)
+        vazia = cargas.sympla(0).encode()
+        for n, slug in enumerate(SymplaExtractor.CIDADES):
+            for pagina in range(1, SYMPLA_PAGINAS + 2):
+                caminho = f"/sympla/eventos/{slug}" + (f"?page={pagina}" if pagina > 1 else "")
+                inicio = (n * SYMPLA_PAGINAS + pagina - 1) * por_pagina
+                corpo = vazia if pagina > SYMPLA_PAGINAS else cargas.sympla(por_pagina, inicio=inicio).encode()
+                self.rotas[caminho] = ("sympla", "text/html", corpo)
+        self.latencias = {**LATENCIAS_PADRAO, **latencias}
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), self._handler())
+        self.httpd.daemon_threads = True
+        self.base = f"http://127.0.0.1:{self.httpd.server_address[1]}"
+        capa = f'<html><body><input id="urlPdf" value="{self.base}/amm-mg/diario.pdf"></body></html>'
+        self.rotas["/amm-mg/"] = ("diario", "text/html", capa.encode())
+
+    @property
+    def bytes_servidos(self) -> dict:
+        return {caminho: len(corpo) for caminho, (_, _, corpo) in self.rotas.items()}
+
+    def _handler(self):
+        servidor = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self):
+                rota = servidor.rotas.get(self.path) or servidor.rotas.get(self.path.split("?", 1)[0])
+                if rota is None:
+                    self.send_error(404)
+                    return
+                fonte, tipo, corpo = rota
+                time.sleep(servidor.latencias.get(fonte, 0) / 1000)
+                self.send_response(200)
+                self.send_header("Content-Type", f"{tipo}; charset=utf-8" if tipo.startswith("text") else tipo)
+                self.send_header("Content-Length", str(len(corpo)))
+                self.end_headers()
+                self.wfile.write(corpo)
+
+            def log_message(self, *args):
+                pass
+
+        return Handler
+
+    def iniciar(self):
+        threading.Thread(target=self.httpd.serve_forever, name="mock-fontes", daemon=True).start()
+        return self
+
+    def parar(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+def _pico_rss_mb() -> float:
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024  # Linux: KB
+
+def executar_escala(escala: int, latencias: dict) -> dict:
+    """Roda no subprocesso: banco temporário, mock no ar e dois ciclos completos do manager."""
+    pasta = Path(tempfile.mkdtemp(prefix="mg_bench_ingestao_"))
+    os.environ["MG_DB_PATH"] = str(pasta / "mg_events.db")
+    os.environ["SNAPSHOT_AUTOMATICO"] = "0"
+    os.environ["ENRIQUECIMENTO"] = "0"  # as URLs de detalhe das cargas apontam para os sites reais
+    os.environ["DESCOBERTA_SITEMAP"] = "0"  # idem para os sitemaps
+    os.environ["ARQUIVO"] = "0"  # mede a ingestão, não a escrita do arquivo bruto
+    os.environ["NO_PROXY"] = "127.0.0.1,localhost"
+
+    import asyncio
+    from app.core.logger import log
+    from app.core.database import AsyncSessionLocal, init_db
+    from app.services.manager import EventManager
+    from app.services.extractors.portal_bh_service import PortalBHExtractor
+    from app.services.extractors.sympla_service import SymplaExtractor
+    from app.services.extractors.palacio_artes_service import PalacioArtesExtractor
+    from app.services.extractors.diario_amm_service import DiarioAMMExtractor
+    from app.services.extractors.diario_oficial_service import DiarioOficialExtractor
+
+    # Só avisos no stderr: o log de debug por linha iria para logs/app.log do repositório
+    log.remove()
+    log.add(sys.stderr, level="WARNING")
+
+    servidor = ServidorFontes(escala, latencias).iniciar()
+    base = servidor.base
+
+    portal = PortalBHExtractor()
+    portal.BASE_URL = f"{base}/portalbh"
+    sympla = SymplaExtractor()
+    sympla.URL_ALVO = f"{base}/sympla/eventos/belo-horizonte-mg"
+    sympla.URL_LISTAGEM = f"{base}/sympla/eventos/{{cidade}}"
+    palacio = PalacioArtesExtractor()
+    palacio.URL_ALVO = f"{base}/palacio/programacao/"
+    amm = DiarioAMMExtractor()
+    amm.BUSCA_URL = f"{base}/amm/pesquisar"
+    amm.PAUSA_ENTRE_BUSCAS = 0  # a pausa é cortesia com o servidor real; aqui só distorceria o tempo
+    diario = DiarioOficialExtractor()
+    diario.BASE_URL = f"{base}/amm-mg/"
+
+    def contar_linhas() -> int:
+        with sqlite3.connect(os.environ["MG_DB_PATH"]) as conn:
+            return conn.execute("SELECT COUNT(*) FROM eventos").fetchone()[0]
+
+    async def ciclos():
+        await init_db()
+        resultado = {}
+        async with AsyncSessionLocal() as session:
+            manager = EventManager(session)
+            manager.scrapers = [portal, sympla, palacio, amm, diario]
+            manager.publicar_snapshot = False
+            for nome in ("frio", "quente"):
+                inicio = time.perf_counter()
+                capturados = await manager.run_all_scrapers()
+                duracao = time.perf_counter() - inicio
+                gravadas = sum(len(c["inseridos"]) + len(c["atualizados"]) for c in manager.changelog.values())
+                resultado[nome] = {
+                    "tempo_s": duracao,
+                    "capturados": len(capturados),
+                    "linhas_gravadas": gravadas,
+                    "linhas_tabela": contar_linhas(),
+                    "linhas_por_s": gravadas / duracao if duracao else 0.0,
+                    "eventos_por_s": len(capturados) / duracao if duracao else 0.0,
+                }
+        return resultado
+
+    rss_preparo = _pico_rss_mb()
+    try:
+        resultado = asyncio.run(ciclos())
+        banco_mb = os.path.getsize(os.environ["MG_DB_PATH"]) / 1024 / 1024
+    finally:
+        servidor.parar()
+        shutil.rmtree(pasta, ignore_errors=True)
+    return {
+        "escala": escala,
+        "bytes_servidos": sum(servidor.bytes_servidos.values()),
+        "rss_pico_mb": _pico_rss_mb(),
+        "rss_preparo_mb": rss_preparo,
+        "banco_mb": banco_mb,
+        **resultado,
+    }
+
+def _ler_latencias(pares: list[str]) -> dict:
+    latencias = {}
+    for par in pares or []:
+        fonte, _, ms = par.partition("=")
+        if fonte not in LATENCIAS_PADRAO:
+            raise SystemExit(f"Fonte desconhecida em --latencia: {fonte} (use {', '.join(LATENCIAS_PADRAO)})")
+        latencias[fonte] = float(ms)
+    return latencias
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de ingestão ponta a ponta contra um mock local das fontes")
+    parser.add_argument("--escalas", nargs="*", type=int, default=list(ESCALAS), help="Multiplicadores do tamanho das fontes")
+    parser.add_argument("--latencia", nargs="*", metavar="FONTE=MS",
+                        help=f"Latência por fonte em ms (padrão: {LATENCIAS_PADRAO})")
+    parser.add_argument("--servidor", action="store_true", help="Só sobe o mock na primeira escala e espera")
+    parser.add_argument("--saida", type=Path, help="Grava os resultados em JSON")
+    parser.add_argument("--_escala", type=int, help=argparse.SUPPRESS)  # uso interno (subprocesso)
+    args = parser.parse_args()
+    latencias = _ler_latencias(args.latencia)
+
+    if args._escala is not None:
+        print("RESULTADO " + json.dumps(executar_escala(args._escala, latencias)))
+        return 0
+
+    if args.servidor:
+        servidor = ServidorFontes(args.escalas[0], latencias).iniciar()
+        print(f"🧪 Mock das fontes em {servidor.base} (escala {args.escalas[0]}):")
+        for caminho, tamanho in servidor.bytes_servidos.items():
+            print(f"   {servidor.base}{caminho}  ({tamanho / 1024:.1f} KB)")
+        try:
+            threading.Event().wait()
+        except KeyboardInterrupt:
+            servidor.parar()
+        return 0
+
+    print(f"{'escala':>7}{'servido MB':>12}{'ciclo frio s':>14}{'linhas/s':>10}{'ciclo quente s':>16}"
+          f"{'eventos/s':>11}{'linhas':>9}{'RSS pico MB':>13}")
+    resultados = []
+    for escala in args.escalas:
+        cmd = [sys.executable, __file__, "--_escala", str(escala)]
+        if args.latencia:
+            cmd += ["--latencia", *args.latencia]
+        proc = subprocess.run(cmd, capture_output=True, text=True, cwd=RAIZ)
+        linha = next((l for l in proc.stdout.splitlines() if l.startswith("RESULTADO ")), None)
+        if proc.returncode != 0 or linha is None:
+            print(f"❌ Escala {escala} falhou (código {proc.returncode}):\n{proc.stderr[-2000:]}")
+            return 1
+        r = json.loads(linha[len("RESULTADO "):])
+        resultados.append(r)
+        frio, quente = r["frio"], r["quente"]
+        print(f"{escala:>7}{r['bytes_servidos'] / 1024 / 1024:>12.2f}{frio['tempo_s']:>14.2f}"
+              f"{frio['linhas_por_s']:>10.0f}{quente['tempo_s']:>16.2f}{quente['eventos_por_s']:>11.0f}"
+              f"{frio['linhas_tabela']:>9}{r['rss_pico_mb']:>13.1f}")
+        if quente["linhas_gravadas"]:
+            print(f"   ⚠️ ciclo quente gravou {quente['linhas_gravadas']} linhas: o diff por hash deveria zerar isso")
+
+    if args.saida:
+        args.saida.write_text(json.dumps(resultados, indent=2), encoding="utf-8")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,201 @@
+"""
+Padrão de Qualidade: Micro-benchmark dos Parsers (sem rede).
+Motivo: Os dumps reais em data/debug/ viram carga de teste: cada extrator roda seu `parsear()`
+sobre o payload original e sobre versões escaladas/replicadas, e o resultado é comparado com
+um baseline versionado. Se uma mudança deixar o parsing mais lento, o script sai com código 1.
+
+Uso:
+    python benchmarks/bench_parsers.py                    # compara com benchmarks/baseline_parsers.json
+    python benchmarks/bench_parsers.py --gravar-baseline  # grava/atualiza o baseline nesta máquina
+    python benchmarks/bench_parsers.py --caso sympla --escalas 1 50
+"""
+import argparse
+import gc
+import json
+import statistics
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from benchmarks import cargas
+
+from app.core.logger import log
+from app.services.extractors.sympla_service import SymplaExtractor, extrair_slug
+from app.services.extractors.palacio_artes_service import PalacioArtesExtractor, extrair_slug_da_url
+from app.services.extractors.portal_bh_service import PortalBHExtractor
+from app.services.extractors.diario_amm_service import DiarioAMMExtractor
+from app.services.extractors.diario_oficial_service import fatiar_paginas
+from app.services.extractors.feed_service import FeedExtractor
+
+BASELINE = Path(__file__).with_name("baseline_parsers.json")
+ESCALAS = (1, 10, 50)
+
+# Escala N: dump real replicado N vezes + 20N cartões sintéticos (40N páginas no diário, 1000N URLs)
+def carga_sympla(escala: int) -> str:
+    return cargas.sympla(20 * escala, escala)
+
+def carga_sympla_estruturado(escala: int) -> str:
+    return cargas.sympla_estruturado(20 * escala, escala)
+
+def carga_feed(escala: int) -> list[bytes]:
+    # Em blocos de 16 KB, como chegam do aiter_bytes
+    corpo = cargas.feed_rss(100 * escala)
+    return [corpo[i:i + 16384] for i in range(0, len(corpo), 16384)]
+
+def parsear_feed(blocos: list[bytes]) -> int:
+    import xml.etree.ElementTree as ET
+    feed, itens = FeedExtractor(), []
+    feed.MAX_ITENS = 10 ** 9
+    parser = ET.XMLPullParser(events=("end",))
+    for bloco in blocos:
+        feed._consumir(parser, bloco, {}, itens)
+    return sum(1 for item in itens if feed.para_evento(item))
+
+def carga_palacio(escala: int) -> str:
+    return cargas.palacio(20 * escala, escala)
+
+def carga_portal_bh(escala: int) -> str:
+    return cargas.portal_bh(20 * escala, escala)
+
+def carga_diario_amm(escala: int) -> str:
+    return cargas.diario_amm(20 * escala, escala)
+
+def carga_diario_oficial(escala: int) -> list[str]:
+    return cargas.paginas_diario(40 * escala)
+
+def carga_urls(escala: int) -> list[str]:
+    return cargas.urls_sympla(1000 * escala)
+
+# nome -> (gerador de carga, função medida que devolve a quantidade de itens produzidos)
+CASOS = {
+    "sympla": (carga_sympla, lambda c: len(SymplaExtractor().parsear(c))),
+    "sympla_estruturado": (carga_sympla_estruturado, lambda c: len(SymplaExtractor().parsear(c))),
+    "feed_rss": (carga_feed, parsear_feed),
+    "palacio": (carga_palacio, lambda c: len(PalacioArtesExtractor().parsear(c))),
+    "portal_bh": (carga_portal_bh, lambda c: len(PortalBHExtractor().parsear(c))),
+    "diario_amm": (carga_diario_amm, lambda c: len(DiarioAMMExtractor().parsear(c))),
+    "diario_oficial": (carga_diario_oficial, lambda c: len(fatiar_paginas(c, "https://exemplo/diario.pdf"))),
+    "extrair_slug": (carga_urls, lambda c: sum(1 for u in c if extrair_slug(u))),
+    "extrair_slug_da_url": (carga_urls, lambda c: sum(1 for u in c if extrair_slug_da_url(u))),
+}
+
+def calibrar(repeticoes: int = 10) -> float:
+    """Carga fixa em Python puro, medida ao lado de cada caso: o gate compara tempo/calibração,
+    o que normaliza máquinas diferentes e a oscilação de CPU em VMs compartilhadas."""
+    tempos = []
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        total = 0
+        for i in range(100_000):
+            total += len(str(i).replace("1", "-").split("-"))
+        tempos.append(time.perf_counter() - inicio)
+    return min(tempos)
+
+def medir_relativo(funcao, carga, voltas: int, rodadas: int) -> tuple[float, float, list[float], int]:
+    """Min-of-N: cada rodada mede o caso e, colada nele, uma amostra da calibração. O melhor tempo
+    do caso sobre o melhor da calibração (mesma janela de CPU) não oscila com um ruído isolado."""
+    tempos, calibracoes = [], []
+    for _ in range(rodadas):
+        gc.collect()
+        inicio = time.perf_counter()
+        for _ in range(voltas):
+            itens = funcao(carga)
+        tempos.append((time.perf_counter() - inicio) / voltas)
+        calibracoes.append(calibrar(1))
+    return min(tempos) / min(calibracoes), min(tempos), tempos, itens
+
+REMEDICOES = 2           # medições extras de um caso acima do limite antes de acusar regressão
+AMOSTRA_MINIMA_S = 0.05  # casos de ~1 ms rodam em voltas até cada amostra durar isso (como o timeit)
+
+def medir(funcao, carga, repeticoes: int) -> dict:
+    inicio = time.perf_counter()
+    funcao(carga)  # aquecimento (compila regex, importa lazy, etc.)
+    voltas = max(1, int(AMOSTRA_MINIMA_S / max(time.perf_counter() - inicio, 1e-6)))
+    relativo, melhor, tempos, itens = medir_relativo(funcao, carga, voltas, repeticoes)
+
+    # Alocações medidas numa execução separada: o tracemalloc distorce o tempo
+    gc.collect()
+    tracemalloc.start()
+    funcao(carga)
+    _, pico = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    mediana = statistics.median(tempos)
+    return {
+        "itens": itens,
+        "mediana_s": mediana,
+        "min_s": melhor,
+        "relativo": relativo,
+        "itens_por_s": itens / mediana if mediana else 0.0,
+        "pico_kb": pico / 1024,  # alocação de pico de uma execução
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark dos parsers sobre os dumps de data/debug")
+    parser.add_argument("--caso", nargs="*", choices=sorted(CASOS), help="Casos a rodar (padrão: todos)")
+    parser.add_argument("--escalas", nargs="*", type=int, default=list(ESCALAS), help="Multiplicadores da carga")
+    parser.add_argument("--repeticoes", type=int, default=9, help="Rodadas por caso (vale a melhor)")
+    parser.add_argument("--tolerancia", type=float, default=0.30, help="Regressão aceita sobre o baseline (0.30 = 30%%)")
+    parser.add_argument("--gravar-baseline", action="store_true", help="Grava os resultados como novo baseline")
+    parser.add_argument("--saida", type=Path, help="Grava os resultados brutos em JSON")
+    args = parser.parse_args()
+
+    log.disable("app")  # o Sympla loga em debug a cada chamada; não queremos medir I/O de log
+    resultados = {}
+
+    print(f"{'caso':<22}{'escala':>7}{'itens':>8}{'mediana ms':>12}{'itens/s':>12}{'pico KB':>10}")
+    for nome in args.caso or CASOS:
+        gerar, funcao = CASOS[nome]
+        for escala in args.escalas:
+            r = medir(funcao, gerar(escala), args.repeticoes)
+            resultados[f"{nome}@{escala}"] = r
+            print(f"{nome:<22}{escala:>7}{r['itens']:>8}{r['mediana_s'] * 1000:>12.2f}"
+                  f"{r['itens_por_s']:>12.0f}{r['pico_kb']:>10.0f}")
+
+    if args.saida:
+        args.saida.write_text(json.dumps(resultados, indent=2), encoding="utf-8")
+
+    if args.gravar_baseline:
+        anterior = json.loads(BASELINE.read_text(encoding="utf-8")) if BASELINE.exists() else {"casos": {}}
+        anterior["casos"].update({k: {"relativo": v["relativo"], "itens": v["itens"]} for k, v in resultados.items()})
+        BASELINE.write_text(json.dumps(anterior, indent=2, sort_keys=True) + "\n", encoding="utf-8")
+        print(f"\n💾 Baseline gravado em {BASELINE}")
+        return 0
+
+    if not BASELINE.exists():
+        print("\n⚠️ Sem baseline: rode com --gravar-baseline para criar um.")
+        return 0
+
+    baseline = json.loads(BASELINE.read_text(encoding="utf-8"))
+    regressoes = []
+    for chave, r in resultados.items():
+        ref = baseline["casos"].get(chave)
+        if not ref:
+            continue
+        # Compara o melhor tempo relativo à calibração. Antes de acusar, mais rodadas: vale o melhor
+        # de todas as medições (min-of-N), então uma rajada de ruído na VM não vira regressão
+        limite = ref["relativo"] * (1 + args.tolerancia)
+        for _ in range(REMEDICOES):
+            if r["relativo"] <= limite:
+                break
+            nome, escala = chave.rsplit("@", 1)
+            gerar, funcao = CASOS[nome]
+            r = min(r, medir(funcao, gerar(int(escala)), args.repeticoes * 2), key=lambda m: m["relativo"])
+        if r["relativo"] > limite:
+            regressoes.append(f"{chave}: {r['relativo']:.3f} > limite {limite:.3f} (tempo/calibração)")
+        if r["itens"] != ref["itens"]:
+            regressoes.append(f"{chave}: {r['itens']} itens (baseline: {ref['itens']})")
+
+    if regressoes:
+        print("\n❌ Regressões detectadas:")
+        for linha in regressoes:
+            print(f"   - {linha}")
+        return 1
+    print("\n✅ Nenhuma regressão sobre o baseline.")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,110 @@
+"""
+Padrão de Qualidade: Orçamento de Boot da API.
+Motivo: O processo da API só agenda fontes; extrator (httpx, selectolax, pypdf, tqdm) só deve ser
+importado quando o job dele roda. Este script importa `app.main` em subprocessos limpos, mede
+tempo de importação e RSS e falha (código 1) se estourar o orçamento ou se algum módulo de
+extrator vazar para o boot — assim registrar uma fonte nova não muda o custo de subir a API.
+
+Uso:
+    python benchmarks/bench_startup.py
+    python benchmarks/bench_startup.py --rodadas 10 --orcamento-ms 800 --orcamento-rss-mb 90
+    python benchmarks/bench_startup.py --importtime 15   # os 15 módulos mais caros (-X importtime)
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+RAIZ = Path(__file__).resolve().parents[1]
+
+# Prefixos que não podem estar em sys.modules depois de `import app.main`
+PROIBIDOS = ("httpx", "selectolax", "pypdf", "tqdm", "app.services.extractors.")
+PERMITIDOS = ("app.services.extractors.registro",)
+
+SONDA = """
+import json, resource, sys, time
+inicio = time.perf_counter()
+import app.main
+tempo = time.perf_counter() - inicio
+proibidos = sorted(
+    m for m in sys.modules
+    if m.startswith({proibidos!r}) and m not in {permitidos!r}
+)
+print("RESULTADO " + json.dumps({{
+    "tempo_s": tempo,
+    "rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+    "modulos": len(sys.modules),
+    "proibidos": proibidos,
+}}))
+""".format(proibidos=PROIBIDOS, permitidos=PERMITIDOS)
+
+def _ambiente(pasta: str) -> dict:
+    # Banco temporário: importar o app não deve depender (nem mexer) no banco de produção
+    return {**os.environ, "MG_DB_PATH": str(Path(pasta) / "mg_events.db"), "SNAPSHOT_AUTOMATICO": "0"}
+
+def medir_boot(pasta: str) -> dict:
+    proc = subprocess.run([sys.executable, "-c", SONDA], capture_output=True, text=True,
+                          cwd=RAIZ, env=_ambiente(pasta))
+    linha = next((l for l in proc.stdout.splitlines() if l.startswith("RESULTADO ")), None)
+    if proc.returncode != 0 or linha is None:
+        raise SystemExit(f"❌ `import app.main` falhou (código {proc.returncode}):\n{proc.stderr[-2000:]}")
+    return json.loads(linha[len("RESULTADO "):])
+
+def mais_caros(pasta: str, quantos: int) -> list[tuple[int, str]]:
+    """Módulos com maior tempo cumulativo segundo -X importtime (microssegundos)."""
+    proc = subprocess.run([sys.executable, "-X", "importtime", "-c", "import app.main"],
+                          capture_output=True, text=True, cwd=RAIZ, env=_ambiente(pasta))
+    linhas = []
+    for linha in proc.stderr.splitlines():
+        if not linha.startswith("import time:") or "|" not in linha:
+            continue
+        _, cumulativo, nome = (p.strip() for p in linha[len("import time:"):].split("|"))
+        if cumulativo.isdigit():
+            linhas.append((int(cumulativo), nome))
+    return sorted(linhas, reverse=True)[:quantos]
+
+def main():
+    parser = argparse.ArgumentParser(description="Tempo e memória de boot da API (import app.main)")
+    parser.add_argument("--rodadas", type=int, default=5, help="Subprocessos medidos (a primeira aquece o cache do SO)")
+    parser.add_argument("--orcamento-ms", type=float, default=1500.0, help="Mediana máxima do tempo de importação")
+    parser.add_argument("--orcamento-rss-mb", type=float, default=100.0, help="Pico máximo de RSS após o import")
+    parser.add_argument("--importtime", type=int, default=0, metavar="N", help="Lista os N módulos mais caros")
+    parser.add_argument("--saida", type=Path, help="Grava os resultados em JSON")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(prefix="mg_bench_startup_") as pasta:
+        medir_boot(pasta)  # aquecimento: .pyc e page cache
+        rodadas = [medir_boot(pasta) for _ in range(max(args.rodadas, 1))]
+        caros = mais_caros(pasta, args.importtime) if args.importtime else []
+
+    tempo_ms = statistics.median(r["tempo_s"] for r in rodadas) * 1000
+    rss_mb = max(r["rss_mb"] for r in rodadas)
+    proibidos = sorted({m for r in rodadas for m in r["proibidos"]})
+    print(f"🚀 import app.main: mediana {tempo_ms:.0f} ms (mín {min(r['tempo_s'] for r in rodadas) * 1000:.0f}) | "
+          f"RSS {rss_mb:.1f} MB | {rodadas[-1]['modulos']} módulos")
+    for cumulativo, nome in caros:
+        print(f"   {cumulativo / 1000:>8.1f} ms  {nome}")
+
+    falhas = []
+    if tempo_ms > args.orcamento_ms:
+        falhas.append(f"tempo {tempo_ms:.0f} ms > orçamento {args.orcamento_ms:.0f} ms")
+    if rss_mb > args.orcamento_rss_mb:
+        falhas.append(f"RSS {rss_mb:.1f} MB > orçamento {args.orcamento_rss_mb:.0f} MB")
+    if proibidos:
+        falhas.append(f"módulos de extrator carregados no boot: {', '.join(proibidos)}")
+
+    if args.saida:
+        args.saida.write_text(json.dumps({"tempo_ms": tempo_ms, "rss_mb": rss_mb, "proibidos": proibidos,
+                                          "rodadas": rodadas}, indent=2), encoding="utf-8")
+    for falha in falhas:
+        print(f"❌ {falha}")
+    if not falhas:
+        print("✅ Dentro do orçamento.")
+    return 1 if falhas else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
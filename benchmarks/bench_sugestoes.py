@@ -0,0 +1,70 @@
+"""
+Padrão de Qualidade: Orçamento por Tecla do Autocompletar.
+Motivo: /eventos/sugestoes responde a cada tecla; o índice de prefixos tem de caber no orçamento
+com milhões de eventos. Este script monta o índice em memória a partir das linhas sintéticas do
+gerar_dataset.py (sem banco), digita consultas letra a letra e mede p50/p99 por tecla, o custo
+de um delta do CDC e o RSS. Sai com código 1 se o p99 estourar o orçamento.
+
+Uso:
+    python benchmarks/bench_sugestoes.py                      # 1.000.000 eventos
+    python benchmarks/bench_sugestoes.py --linhas 3000000 --orcamento-ms 5
+"""
+import argparse
+import resource
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from benchmarks.gerar_dataset import gerar_linhas
+from app.services.sugestoes import IndicePrefixos
+
+CONSULTAS = ["belo horizonte", "show rock ao vivo", "samba na praca", "festival jazz", "ouro preto",
+             "palacio das artes", "sao joao del rei", "forro", "tributo a blues 2026", "viola caipira"]
+
+def digitar(indice: IndicePrefixos, consulta: str) -> list[float]:
+    """Uma consulta por tecla ('b', 'be', 'bel', ...), como o front-end faz."""
+    tempos = []
+    for i in range(1, len(consulta) + 1):
+        inicio = time.perf_counter()
+        indice.buscar(consulta[:i], k=10)
+        tempos.append((time.perf_counter() - inicio) * 1000)
+    return tempos
+
+def main():
+    parser = argparse.ArgumentParser(description="Latência por tecla do índice de sugestões.")
+    parser.add_argument("--linhas", type=int, default=1_000_000)
+    parser.add_argument("--semente", type=int, default=42)
+    parser.add_argument("--orcamento-ms", type=float, default=10.0, help="p99 máximo por tecla")
+    args = parser.parse_args()
+
+    linhas = [(r[0], r[1], r[4], r[3], r[2]) for r in gerar_linhas(args.linhas, args.semente)]
+    inicio = time.perf_counter()
+    indice = IndicePrefixos().montar(linhas)
+    montagem = time.perf_counter() - inicio
+
+    tempos = [t for c in CONSULTAS for t in digitar(indice, c)]
+    tempos.sort()
+    p50 = statistics.median(tempos)
+    p99 = tempos[int(len(tempos) * 0.99) - 1]
+
+    # Delta típico de um ciclo: 1000 eventos novos (termos inéditos vão para o array de delta)
+    delta = [{"seq": i, "id_unico": r[0], "operacao": "I", "titulo": r[1], "local": r[4], "cidade": r[3],
+              "data_evento": r[2]} for i, r in enumerate(gerar_linhas(1000, args.semente + 1), start=1)]
+    inicio = time.perf_counter()
+    indice.aplicar(delta)
+    aplicar_ms = (time.perf_counter() - inicio) * 1000
+
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    print(f"{args.linhas} eventos | {len(indice.textos)} termos | {len(indice)} tokens | montagem {montagem:.1f}s | RSS {rss:.0f} MB")
+    print(f"Por tecla ({len(tempos)} consultas): p50 {p50:.3f} ms | p99 {p99:.3f} ms | máx {tempos[-1]:.3f} ms")
+    print(f"Delta de 1000 eventos: {aplicar_ms:.1f} ms | exemplo 'bel': {indice.buscar('bel', k=3)}")
+    if p99 > args.orcamento_ms:
+        print(f"❌ p99 {p99:.2f} ms acima do orçamento de {args.orcamento_ms} ms")
+        sys.exit(1)
+    print("✅ Dentro do orçamento por tecla.")
+
+if __name__ == "__main__":
+    main()
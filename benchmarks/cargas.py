@@ -0,0 +1,135 @@
+"""
+Padrão de Qualidade: Cargas Sintéticas Compartilhadas dos Benchmarks.
+Motivo: Os mesmos payloads alimentam o micro-benchmark dos parsers (bench_parsers.py) e o
+servidor falso do benchmark de ingestão (bench_ingestao.py). Cada gerador devolve o dump real
+de data/debug/ (replicado `copias` vezes) com `cartoes` itens no formato que o parser procura.
+Os dumps atuais de Sympla/Portal BH são páginas de erro; sem os cartões mediríamos só a varredura.
+"""
+from pathlib import Path
+
+RAIZ = Path(__file__).resolve().parents[1]
+DUMP_DIR = RAIZ / "data" / "debug"
+
+def ler_dump(nome: str) -> str:
+    """Corpo HTTP de um dump do scanner (tudo depois da linha `BODY:`)."""
+    texto = (DUMP_DIR / f"dump_{nome}.txt").read_text(encoding="utf-8", errors="replace")
+    return texto.split("BODY:\n", 1)[-1]
+
+def _injetar(html: str, cartoes: str) -> str:
+    pos = html.rfind("</body>")
+    return html + cartoes if pos < 0 else html[:pos] + cartoes + html[pos:]
+
+def sympla(cartoes: int, copias: int = 1, inicio: int = 0) -> str:
+    """Dois links por cartão: um absoluto em <a> e um relativo escondido em JSON (as duas regex).
+    `inicio` desloca os ids, para páginas/cidades diferentes não repetirem eventos."""
+    itens = "".join(
+        f'<a href="https://www.sympla.com.br/evento/show-de-rock-na-praca-{i}/{2000000 + i}">x</a>'
+        f'<script>{{"url":"/evento/festival-gastronomico-edicao-{i}/{3000000 + i}"}}</script>'
+        for i in range(inicio, inicio + cartoes)
+    )
+    return _injetar(ler_dump("symplaextractor") * copias, itens)
+
+def sympla_estruturado(cartoes: int, copias: int = 1) -> str:
+    """Mesma listagem publicada como JSON-LD (um ItemList de MusicEvent), como no schema.org."""
+    import json
+    itens = [
+        {"@type": "ListItem", "position": i + 1, "item": {
+            "@type": "MusicEvent", "name": f"Show de Rock na Praça {i}",
+            "startDate": f"2026-{1 + i % 12:02d}-{1 + i % 28:02d}T21:00:00-03:00",
+            "url": f"https://www.sympla.com.br/evento/show-de-rock-na-praca-{i}/{2000000 + i}",
+            "location": {"@type": "Place", "name": "Praça da Estação",
+                         "address": {"@type": "PostalAddress", "addressLocality": "Belo Horizonte"}},
+            "offers": {"@type": "Offer", "price": 40 + i % 60, "priceCurrency": "BRL"},
+        }}
+        for i in range(cartoes)
+    ]
+    bloco = json.dumps({"@context": "https://schema.org", "@type": "ItemList", "itemListElement": itens})
+    return _injetar(ler_dump("symplaextractor") * copias, f'<script type="application/ld+json">{bloco}</script>')
+
+def feed_rss(itens: int) -> bytes:
+    """Feed RSS 2.0 em ordem decrescente de publicação (como os portais publicam)."""
+    from datetime import datetime, timedelta, timezone
+    from email.utils import format_datetime
+    base = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    corpo = "".join(
+        f"<item><title>Festival de Inverno {i} confirma atrações</title><link>https://g1.globo.com/mg/noticia/{i}.ghtml</link>"
+        f"<guid>https://g1.globo.com/mg/noticia/{i}.ghtml</guid><pubDate>{format_datetime(base + timedelta(hours=i))}</pubDate>"
+        f"<description><![CDATA[<p>Programação completa do festival {i} em Minas.</p>]]></description></item>"
+        for i in range(itens - 1, -1, -1)
+    )
+    return f'<?xml version="1.0" encoding="UTF-8"?><rss version="2.0"><channel><title>G1 MG</title>{corpo}</channel></rss>'.encode()
+
+def palacio(cartoes: int, copias: int = 1) -> str:
+    itens = "".join(
+        f'<article class="evento"><a href="https://fcs.mg.gov.br/evento/concerto-sinfonico-{i}/">Concerto</a></article>'
+        for i in range(cartoes)
+    )
+    return _injetar(ler_dump("palacioartesextractor") * copias, itens)
+
+def portal_bh(cartoes: int, copias: int = 1) -> str:
+    itens = "".join(
+        f'<div class="views-row"><a href="/eventos/feira-hippie-{i}">Feira Hippie {i}</a>'
+        f'<span class="data">{1 + i % 28:02d}/{1 + i % 12:02d}</span></div>'
+        for i in range(cartoes)
+    )
+    # O dump do Portal BH é um JSON de erro (406): vai como comentário para manter o peso original
+    return f"<html><body><!-- {ler_dump('portalbhextractor') * copias} -->{itens}</body></html>"
+
+def diario_amm(cartoes: int, copias: int = 1) -> str:
+    artigos = "".join(
+        f"<article><h3>Inexigibilidade: contratação de show musical {i}</h3><p>Prefeitura Municipal</p></article>"
+        for i in range(cartoes)
+    )
+    return _injetar(ler_dump("diarioammextractor") * copias, f'<div class="box-resultados">{artigos}</div>')
+
+PAGINA_DIARIO = (
+    "PREFEITURA MUNICIPAL DE {cidade}\n"
+    "EXTRATO DE INEXIGIBILIDADE Nº {i}/2026. Objeto: contratação da banda {artista} CNPJ "
+    "12.345.678/0001-90 para a festa de aniversário da cidade, "
+    "VALOR R$ {valor},00 em {dia:02d}/07/2026.\nPublicado por: Fulano de Tal\n"
+    "EXTRATO DE CONTRATO. Objeto: pavimentação asfáltica da Rua {i}. R$ 1.200.000,00\n"
+    "Publicado por: Ciclano\n"
+)
+CIDADES = ("ABAETÉ", "AIURUOCA", "ALPERCATA", "ARAXÁ", "BAEPENDI", "CAXAMBU", "DIAMANTINA", "OURO PRETO")
+
+def paginas_diario(paginas: int) -> list[str]:
+    """Texto de cada página no formato que o pypdf devolve para o diário da AMM (um show por página)."""
+    return [
+        PAGINA_DIARIO.format(cidade=CIDADES[i % len(CIDADES)], i=i, artista=f"OS MINEIROS {i}",
+                             valor=f"{10 + i % 90}.000", dia=1 + i % 28)
+        for i in range(paginas)
+    ]
+
+def pdf_diario(paginas: list[str]) -> bytes:
+    """PDF mínimo (Helvetica/WinAnsi, uma linha de texto por linha da página) legível pelo pypdf."""
+    def escapar(linha: str) -> bytes:
+        return linha.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)").encode("cp1252", "replace")
+
+    objetos = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        None,  # /Pages: preenchido quando os filhos forem conhecidos
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica /Encoding /WinAnsiEncoding >>",
+    ]
+    filhos = []
+    for texto in paginas:
+        linhas = b" T* ".join(b"(" + escapar(l) + b") Tj" for l in texto.splitlines())
+        conteudo = b"BT /F1 8 Tf 10 TL 20 820 Td " + linhas + b" ET"
+        objetos.append(b"<< /Length %d >>\nstream\n" % len(conteudo) + conteudo + b"\nendstream")
+        objetos.append(b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 595 842] "
+                       b"/Resources << /Font << /F1 3 0 R >> >> /Contents %d 0 R >>" % (len(objetos)))
+        filhos.append(len(objetos))
+    objetos[1] = b"<< /Type /Pages /Count %d /Kids [%s] >>" % (len(filhos), b" ".join(b"%d 0 R" % n for n in filhos))
+
+    saida = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for n, corpo in enumerate(objetos, start=1):
+        offsets.append(len(saida))
+        saida += b"%d 0 obj\n" % n + corpo + b"\nendobj\n"
+    xref = len(saida)
+    saida += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objetos) + 1)
+    saida += b"".join(b"%010d 00000 n \n" % o for o in offsets)
+    saida += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objetos) + 1, xref)
+    return bytes(saida)
+
+def urls_sympla(quantidade: int) -> list[str]:
+    return [f"https://www.sympla.com.br/evento/sarau-de-poesia-mineira-{i}/{2500000 + i}" for i in range(quantidade)]
@@ -0,0 +1,154 @@
+"""
+Padrão de Qualidade: Gerador de Massa de Dados Sintética.
+Motivo: O banco de produção tem poucas dezenas de linhas; índices e caches só aparecem em
+milhões. Este script enche `eventos` com linhas realistas (cidades mineiras com peso de
+população, fontes reais, categorias, datas e preços) num banco SEPARADO do de produção.
+
+O schema vem do próprio app (create_all + migrations do EventManager), então índices e
+triggers de CDC são exatamente os de produção. Inserção em lotes com executemany.
+
+Uso:
+    python benchmarks/gerar_dataset.py --linhas 1000000
+    python benchmarks/gerar_dataset.py --linhas 5000000 --db /tmp/mg_bench.db --semente 7
+"""
+import argparse
+import asyncio
+import hashlib
+import os
+import random
+import sqlite3
+import sys
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+RAIZ = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(RAIZ))
+
+from app.schemas.evento import CAMPOS_CONTEUDO, _normalizar  # não depende do settings/MG_DB_PATH
+
+DB_PADRAO = RAIZ / "data" / "mg_events_bench.db"
+LOTE = 10_000
+
+# (cidade, peso) — peso aproximado pela população, BH domina como na base real
+CIDADES = [
+    ("Belo Horizonte", 40), ("Contagem", 6), ("Uberlândia", 6), ("Juiz de Fora", 5), ("Betim", 4),
+    ("Montes Claros", 3), ("Ribeirão das Neves", 3), ("Uberaba", 3), ("Governador Valadares", 2),
+    ("Ipatinga", 2), ("Sete Lagoas", 2), ("Divinópolis", 2), ("Santa Luzia", 2), ("Poços de Caldas", 2),
+    ("Ouro Preto", 2), ("Tiradentes", 1), ("São João del-Rei", 1), ("Diamantina", 1), ("Mariana", 1),
+    ("Araxá", 1), ("Lavras", 1), ("Varginha", 1), ("Pouso Alegre", 1), ("Teófilo Otoni", 1),
+    ("Caxambu", 1), ("Itabira", 1), ("Patos de Minas", 1), ("Barbacena", 1), ("Conselheiro Lafaiete", 1),
+    ("Nova Lima", 1), ("Brumadinho", 1), ("Capitólio", 1), ("Monte Verde", 1), ("Sabará", 1),
+]
+# (fonte, peso, local padrão, categorias)
+FONTES = [
+    ("Sympla (Regex Master)", 45, "{cidade} (Sympla)", ["Entretenimento", "Show", "Teatro", "Stand-up", "Festa"]),
+    ("Portal BH", 20, "Portal BH", ["Cultura Institucional", "Feira", "Exposição"]),
+    ("FCS (Palácio)", 10, "Palácio das Artes", ["Cultura", "Concerto", "Dança", "Ópera"]),
+    ("Diário AMM", 10, "Diário Oficial", ["Licitação Show"]),
+    ("AMM-MG (v11.7.0)", 15, "Município de {cidade}", ["Show Musical", "Show Carnavalesco", "Aniversário de Cidade"]),
+]
+PREFIXOS = ["Show", "Festival", "Noite de", "Tributo a", "Encontro de", "Feira de", "Sarau de", "Baile de", "Concerto de"]
+TEMAS = ["Rock", "Samba", "Sertanejo", "Jazz", "MPB", "Forró", "Pagode", "Choro", "Blues", "Reggae", "Música Mineira",
+         "Viola Caipira", "Gastronomia", "Cerveja Artesanal", "Queijos", "Literatura", "Dança de Salão", "Orquestra"]
+COMPLEMENTOS = ["", " ao Vivo", " na Praça", " Edição Especial", " de Verão", " de Inverno", " Beneficente", " 2026"]
+
+def gerar_linhas(total: int, semente: int):
+    """Gera tuplas prontas para o INSERT, determinísticas pela semente."""
+    rnd = random.Random(semente)
+    cidades, pesos_cidade = zip(*CIDADES)
+    fontes = FONTES
+    pesos_fonte = [f[1] for f in FONTES]
+    hoje = datetime.now().replace(second=0, microsecond=0)
+    agora = hoje.isoformat(sep=" ")
+
+    for i in range(total):
+        cidade = rnd.choices(cidades, pesos_cidade)[0]
+        fonte, _, local, categorias = rnd.choices(fontes, pesos_fonte)[0]
+        categoria = rnd.choice(categorias)
+        titulo = f"{rnd.choice(PREFIXOS)} {rnd.choice(TEMAS)}{rnd.choice(COMPLEMENTOS)} #{i}"
+        # Datas de um ano atrás até um ano à frente, quase sempre à noite
+        data = hoje + timedelta(days=rnd.randint(-365, 365))
+        data = data.replace(hour=rnd.choice((14, 19, 20, 21, 22)), minute=rnd.choice((0, 30)))
+        # 40% gratuitos; o resto com cauda longa (ingresso de 10 a ~800 reais)
+        preco = 0.0 if rnd.random() < 0.4 else round(min(10 + rnd.lognormvariate(3.8, 0.8), 850.0), 2)
+        id_unico = hashlib.md5(f"bench-{semente}-{i}".encode()).hexdigest()
+        url = f"https://exemplo.mg/{fonte.split()[0].lower()}/evento/{id_unico[:12]}"
+        valores = {
+            "titulo": titulo, "data_evento": data, "cidade": cidade, "local": local.format(cidade=cidade),
+            "descricao": "", "categoria": categoria, "preco_base": preco, "url_evento": url, "imagem_url": "",
+        }
+        yield (
+            id_unico, titulo, data.isoformat(sep=" "), cidade, valores["local"], "", categoria, preco,
+            url, "", fonte, agora, hash_conteudo(valores),
+        )
+
+def hash_conteudo(valores: dict) -> str:
+    """Mesmo hash do EventoSchema.hash_conteudo, sem o custo de validar um modelo por linha."""
+    partes = [_normalizar(valores[campo]) for campo in CAMPOS_CONTEUDO]
+    return hashlib.sha1("\x1f".join(partes).encode("utf-8")).hexdigest()
+
+async def preparar_schema():
+    """Tabelas, índices e triggers de produção (o MG_DB_PATH já aponta para o banco de benchmark)."""
+    from app.core.database import AsyncSessionLocal, init_db, engine
+    from app.services.manager import EventManager
+    await init_db()
+    async with AsyncSessionLocal() as session:
+        await EventManager(session)._aplicar_migrations()
+    await engine.dispose()
+
+def main():
+    parser = argparse.ArgumentParser(description="Enche `eventos` com linhas sintéticas realistas")
+    parser.add_argument("--linhas", type=int, default=1_000_000)
+    parser.add_argument("--db", type=Path, default=DB_PADRAO, help=f"Banco de destino (padrão: {DB_PADRAO})")
+    parser.add_argument("--semente", type=int, default=42)
+    parser.add_argument("--anexar", action="store_true", help="Não apaga o banco antes de gerar")
+    args = parser.parse_args()
+
+    if args.db.resolve() == (RAIZ / "data" / "mg_events.db").resolve():
+        raise SystemExit("❌ Recusado: este é o banco de produção. Use outro --db.")
+    if args.db.exists() and not args.anexar:
+        args.db.unlink()
+    os.environ["MG_DB_PATH"] = str(args.db.resolve())
+
+    from app.core.logger import log
+    asyncio.run(preparar_schema())
+
+    conn = sqlite3.connect(args.db)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=OFF")  # massa descartável: durabilidade não importa aqui
+    sql = """INSERT OR IGNORE INTO eventos
+             (id_unico, titulo, data_evento, cidade, local, descricao, categoria, preco_base,
+              url_evento, imagem_url, fonte, detectado_em, hash_conteudo)
+             VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)"""
+
+    inicio = time.perf_counter()
+    lote, gravadas = [], 0
+    for linha in gerar_linhas(args.linhas, args.semente):
+        lote.append(linha)
+        if len(lote) >= LOTE:
+            with conn:
+                conn.executemany(sql, lote)
+            gravadas += len(lote)
+            lote = []
+            if gravadas % (LOTE * 10) == 0:
+                decorrido = time.perf_counter() - inicio
+                print(f"   {gravadas:>10,} linhas | {gravadas / decorrido:,.0f} linhas/s", flush=True)
+    if lote:
+        with conn:
+            conn.executemany(sql, lote)
+        gravadas += len(lote)
+
+    conn.execute("ANALYZE")
+    total = conn.execute("SELECT COUNT(*) FROM eventos").fetchone()[0]
+    conn.close()
+    decorrido = time.perf_counter() - inicio
+    log.info(
+        f"🧪 Massa gerada em {args.db}: {gravadas:,} linhas em {decorrido:.1f}s "
+        f"({gravadas / decorrido:,.0f} linhas/s) | total na tabela: {total:,} | "
+        f"{args.db.stat().st_size / 1024 / 1024:.0f} MB"
+    )
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
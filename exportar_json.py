@@ -1,38 +1,51 @@
-import sqlite3, json, os
-from datetime import datetime
+"""
+Exportador JSON v2.0 (Streaming)
+Justificativa: Ler o banco em lotes e gravar com troca atômica, em vez de carregar
+tudo com fetchall() e reescrever o arquivo no lugar. A lógica vive em app/services/exportacao.py.
+Uso:
+  python exportar_json.py                      -> publica o snapshot do dashboard (app/static/snapshots)
+  python exportar_json.py --formato ndjson --gzip --saida eventos.ndjson.gz
+  python exportar_json.py --formato parquet [--completo]  -> dataset Parquet em data/colunar/ (incremental)
+"""
+import argparse
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from app.core.config import settings
+from app.services.exportacao import exportar_arquivo
+from app.services.snapshot import publicar_snapshot
+from app.services import colunar
 
 def exportar():
-    # Caminho absoluto para evitar erros de diretório
-    BASE_DIR = "/home/felicruel/apps/mg_event_hub"
-    DB_PATH = os.path.join(BASE_DIR, "data/mg_events.db")
-    # Colocando na pasta static dentro de app
-    STATIC_DIR = os.path.join(BASE_DIR, "app/static")
-    
-    os.makedirs(STATIC_DIR, exist_ok=True)
-    OUT_PATH = os.path.join(STATIC_DIR, "export_eventos.json")
+    parser = argparse.ArgumentParser(description="Exporta a tabela eventos em streaming.")
+    parser.add_argument("--formato", choices=["json", "ndjson", "parquet"], default="json")
+    parser.add_argument("--gzip", action="store_true", help="Comprimir a saída com gzip")
+    parser.add_argument("--ordem", choices=["data", "fonte"], default="data")
+    parser.add_argument("--saida", help="Arquivo de destino (padrão: snapshot pré-comprimido do dashboard)")
+    parser.add_argument("--completo", action="store_true", help="Parquet: reescreve todas as partições")
+    args = parser.parse_args()
 
-    try:
-        if not os.path.exists(DB_PATH):
-            print(f"❌ Banco não encontrado em: {DB_PATH}")
-            return
+    if not settings.DB_PATH.exists():
+        print(f"❌ Banco não encontrado em: {settings.DB_PATH}")
+        return
 
-        conn = sqlite3.connect(DB_PATH)
-        conn.row_factory = sqlite3.Row
-        cursor = conn.cursor()
-        cursor.execute("SELECT fonte, titulo, local, categoria, url_evento, datetime(data_evento) as data FROM eventos ORDER BY data_evento ASC")
-        eventos = [dict(row) for row in cursor.fetchall()]
-        
-        payload = {"total": len(eventos), "eventos": eventos}
-        with open(OUT_PATH, "w", encoding="utf-8") as f:
-            json.dump(payload, f, ensure_ascii=False, indent=2)
-            
-        # Permissões totais para o grupo do servidor (www-data)
-        os.chmod(OUT_PATH, 0o664)
-        print(f"✅ JSON gravado com sucesso em: {OUT_PATH}")
+    try:
+        if args.formato == "parquet":
+            if not colunar.disponivel():
+                print("❌ pyarrow não instalado: pip install pyarrow")
+                return
+            total = colunar.exportar(completo=args.completo)
+            destino = f"{colunar.EVENTOS_DIR} ({total['particoes']} partições reescritas)"
+        elif args.saida:
+            exportar_arquivo(args.saida, formato=args.formato, gzip=args.gzip, ordem=args.ordem)
+            destino = args.saida
+        else:
+            destino = publicar_snapshot()["url"]
+        print(f"✅ Export gravado com sucesso em: {destino}")
     except Exception as e:
         print(f"❌ Erro: {e}")
-    finally:
-        conn.close()
 
 if __name__ == "__main__":
     exportar()
@@ -0,0 +1,34 @@
+"""
+Exportador Incremental (CDC) v1.0
+Justificativa: Gerar apenas o delta de eventos desde o último `seq` sincronizado,
+em vez de reescrever o export_eventos.json inteiro a cada execução.
+Uso: python exportar_mudancas.py --desde 120 --saida mudancas.json
+"""
+import argparse
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from app.services.cdc import exportar_mudancas
+
+def main():
+    parser = argparse.ArgumentParser(description="Exporta o delta do CDC de eventos.")
+    parser.add_argument("--desde", type=int, default=0, help="Último seq já sincronizado (padrão: 0 = tudo)")
+    parser.add_argument("--saida", default="export_mudancas.json", help="Arquivo JSON de destino")
+    parser.add_argument("--db", default="./data/mg_events.db", help="Caminho do banco SQLite")
+    args = parser.parse_args()
+
+    if not os.path.exists(args.db):
+        print(f"❌ Banco não encontrado em: {args.db}")
+        return
+
+    try:
+        pagina = exportar_mudancas(args.db, args.desde, args.saida)
+        print(f"✅ {len(pagina['mudancas'])} mudanças (seq {pagina['desde']} → {pagina['ate']}) gravadas em: {args.saida}")
+        print(f"👉 Próxima sincronização: --desde {pagina['ate']}")
+    except Exception as e:
+        print(f"❌ Erro: {e}")
+
+if __name__ == "__main__":
+    main()
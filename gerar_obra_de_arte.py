@@ -1,51 +1,53 @@
-import sqlite3
-import json
+"""
+Gerador da "Obra de Arte" v2.0
+Justificativa: Mesmo export do exportar_json.py (ordenado por fonte e título, com metadados
+do projeto), agora delegando ao pipeline de streaming em app/services/exportacao.py.
+As chaves da v1 (total_eventos, ultima_atualizacao) seguem no arquivo via metadados; o JSON
+agora sai minificado e com a lista de eventos antes das chaves de resumo.
+"""
 import os
+import sqlite3
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from app.core.config import settings
+from app.services.exportacao import exportar_arquivo
+
+# Chaves da v1: o total entra antes do streaming (o "total" do pipeline só sai no fim) e a
+# "última atualização" é, como antes, a captura do primeiro evento na ordem fonte/título
+SQL_RESUMO_V1 = """
+    SELECT (SELECT COUNT(*) FROM eventos),
+           (SELECT datetime(detectado_em, 'localtime') FROM eventos ORDER BY fonte ASC, titulo ASC LIMIT 1)
+"""
+
+def resumo_v1() -> dict:
+    conn = sqlite3.connect(f"file:{settings.DB_PATH}?mode=ro", uri=True)
+    try:
+        total, primeira_captura = conn.execute(SQL_RESUMO_V1).fetchone()
+    finally:
+        conn.close()
+    return {"total_eventos": total, "ultima_atualizacao": primeira_captura or "N/A"}
 
 def exportar_para_json():
-    db_path = './data/mg_events.db'
     output_path = 'export_eventos.json'
-    
-    if not os.path.exists(db_path):
+
+    if not settings.DB_PATH.exists():
         print("❌ Banco de dados não encontrado!")
         return
 
     try:
-        conn = sqlite3.connect(db_path)
-        conn.row_factory = sqlite3.Row  # Permite acessar colunas pelo nome
-        cursor = conn.cursor()
-        
         print("🔍 Lendo eventos do banco...")
-        cursor.execute("""
-            SELECT fonte, titulo, local, categoria, url_evento, 
-                   datetime(data_evento) as data, 
-                   datetime(detectado_em, 'localtime') as capturado_em
-            FROM eventos 
-            ORDER BY fonte ASC, titulo ASC
-        """)
-        
-        rows = cursor.fetchall()
-        eventos = [dict(row) for row in rows]
-        
-        # Estrutura o JSON com metadados
-        resultado_final = {
-            "projeto": "MG-Event-Hub",
-            "autor": "Felipe Moreira Franco",
-            "total_eventos": len(eventos),
-            "ultima_atualizacao": eventos[0]['capturado_em'] if eventos else "N/A",
-            "eventos": eventos
-        }
-        
-        with open(output_path, 'w', encoding='utf-8') as f:
-            json.dump(resultado_final, f, ensure_ascii=False, indent=4)
-            
+        bytes_gravados = exportar_arquivo(
+            output_path,
+            formato="json",
+            ordem="fonte",
+            metadados={"projeto": "MG-Event-Hub", "autor": "Felipe Moreira Franco", **resumo_v1()},
+        )
         print(f"✅ OBRA DE ARTE CONCLUÍDA: {output_path}")
-        print(f"📊 Total de eventos exportados: {len(eventos)}")
-        
+        print(f"📊 Tamanho do export: {bytes_gravados / 1024:.1f} KB")
     except Exception as e:
         print(f"❌ Erro na exportação: {e}")
-    finally:
-        conn.close()
 
 if __name__ == "__main__":
     exportar_para_json()
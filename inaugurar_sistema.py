@@ -9,6 +9,7 @@ sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 from app.core.database import AsyncSessionLocal, init_db
 from app.services.manager import EventManager
 from app.core.logger import log
+from app.core.config import settings
 
 async def executar_carga(modo="completa"):
     """
@@ -47,6 +48,11 @@ def mostrar_menu():
     return input("\nEscolha uma opção: ")
 
 async def main():
+    # --profile: grava perfis por etapa de cada extrator em data/debug/profiles/
+    if "--profile" in sys.argv:
+        settings.PROFILE = True
+        sys.argv.remove("--profile")
+
     # Verifica se foi passado argumento via linha de comando (para o Cron)
     if len(sys.argv) > 1:
         arg = sys.argv[1]
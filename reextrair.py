@@ -0,0 +1,38 @@
+"""
+Reextração Offline v1.0
+Justificativa: Depois de corrigir um parser, reaplicá-lo ao histórico a partir do arquivo bruto
+(data/arquivo/), sem nenhuma requisição de rede.
+Uso: python reextrair.py --de 2026-09-01 --ate 2026-10-19 [--fonte SymplaExtractor ...]
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+from datetime import date, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from app.services.arquivo import reextrair
+
+def main():
+    parser = argparse.ArgumentParser(description="Repete as execuções arquivadas pelos extratores atuais (sem rede).")
+    parser.add_argument("--de", required=True, type=date.fromisoformat, help="Primeiro dia (AAAA-MM-DD, UTC)")
+    parser.add_argument("--ate", type=date.fromisoformat, default=date.today(), help="Último dia, inclusive (padrão: hoje)")
+    parser.add_argument("--fonte", action="append", help="Restringe a uma fonte (pode repetir)")
+    args = parser.parse_args()
+
+    inicio = time.perf_counter()
+    try:
+        total = asyncio.run(reextrair(args.de.isoformat(), (args.ate + timedelta(days=1)).isoformat(), args.fonte))
+        print(
+            f"✅ {total['execucoes']} execuções reextraídas em {time.perf_counter() - inicio:.1f}s: "
+            f"{total['capturados']} eventos | {total['persistidos']} novos | "
+            f"{total['atualizados']} alterados | {total['erros']} erros"
+        )
+    except Exception as e:
+        print(f"❌ Erro na reextração: {e}")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()